@@ -9,7 +9,7 @@ echo.
 echo This script will allow the Ollama Voice Assistant web server
 echo to accept connections from other devices on your local network.
 echo.
-echo Port: 5000 (default)
+echo Ports: 5000 (web server) and 5001 (live streaming), defaults
 echo.
 echo ======================================================================
 echo.
@@ -25,14 +25,14 @@ if errorlevel 1 (
     exit /b 1
 )
 
-echo [INFO] Adding firewall rule for port 5000...
+echo [INFO] Adding firewall rule for ports 5000 and 5001...
 echo.
 
 REM Remove existing rule if it exists
 netsh advfirewall firewall delete rule name="Ollama Voice Assistant Web Server" >nul 2>&1
 
 REM Add new inbound rule
-netsh advfirewall firewall add rule name="Ollama Voice Assistant Web Server" dir=in action=allow protocol=TCP localport=5000
+netsh advfirewall firewall add rule name="Ollama Voice Assistant Web Server" dir=in action=allow protocol=TCP localport=5000,5001
 
 if errorlevel 1 (
     echo [ERROR] Failed to add firewall rule
@@ -47,7 +47,7 @@ echo ======================================================================
 echo.
 echo Firewall rule added successfully!
 echo.
-echo The web server (port 5000) can now accept connections from other
+echo The web server (ports 5000 and 5001) can now accept connections from other
 echo devices on your local network.
 echo.
 echo To remove this rule later, run: remove_firewall.bat
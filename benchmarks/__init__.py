@@ -0,0 +1,3 @@
+"""
+Ollama Voice Assistant - Benchmarks
+"""
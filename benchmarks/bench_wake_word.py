@@ -0,0 +1,129 @@
+"""
+Wake Word Benchmark - CPU cost of always-on wake word spotting
+
+Feeds the same audio through the wake word detector in grammar mode (with and
+without the VAD gate) and in full vocabulary mode, as fast as possible, and
+reports CPU seconds spent per hour of audio.
+
+Usage:
+    python -m benchmarks.bench_wake_word
+    python -m benchmarks.bench_wake_word --wav recording.wav --model models/vosk-model-small-en-us-0.15
+"""
+
+import sys
+import os
+import argparse
+import time
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.speech_to_text import SpeechToText
+from src.wake_word_detector import WakeWordDetector
+from src import config
+from benchmarks.fixtures import load_wav, synthetic_audio
+
+# Set UTF-8 encoding for Windows console
+if sys.platform == 'win32':
+    try:
+        sys.stdout.reconfigure(encoding='utf-8')
+    except:
+        pass
+
+
+def measure_mode(detector: WakeWordDetector, audio, chunk_duration: float = 0.5) -> dict:
+    """
+    Run audio through one detector configuration
+
+    Args:
+        detector: WakeWordDetector to measure
+        audio: int16 audio at config.SAMPLE_RATE
+        chunk_duration: Chunk size used by listen_for_wake_word
+
+    Returns:
+        Dictionary with CPU/wall time, CPU seconds per audio hour and hit count
+    """
+    recognizer = detector.create_recognizer()
+    chunk_size = int(chunk_duration * config.SAMPLE_RATE)
+    audio_seconds = len(audio) / config.SAMPLE_RATE
+    hits = 0
+
+    cpu_start = time.process_time()
+    wall_start = time.perf_counter()
+    for start in range(0, len(audio) - chunk_size + 1, chunk_size):
+        if detector.process_audio(recognizer, audio[start:start + chunk_size]) is not None:
+            hits += 1
+            recognizer = detector.create_recognizer()
+    cpu_time = time.process_time() - cpu_start
+    wall_time = time.perf_counter() - wall_start
+
+    return {
+        'audio_seconds': audio_seconds,
+        'cpu_seconds': cpu_time,
+        'wall_seconds': wall_time,
+        'cpu_seconds_per_audio_hour': cpu_time / audio_seconds * 3600,
+        'realtime_factor': wall_time / audio_seconds,
+        'hits': hits
+    }
+
+
+def run(stt: SpeechToText, audio, wake_word: str = None) -> dict:
+    """
+    Measure each wake word mode on the same audio
+
+    Returns:
+        Dictionary of results keyed by mode name
+    """
+    modes = (
+        ('grammar+vad', True, True),
+        ('grammar', True, False),
+        ('full', False, False),
+    )
+
+    results = {}
+    for mode, use_grammar, use_vad in modes:
+        detector = WakeWordDetector(wake_word=wake_word, stt=stt, use_grammar=use_grammar, use_vad=use_vad)
+        results[mode] = measure_mode(detector, audio)
+        if detector.vad:
+            results[mode]['vad_duty_cycle'] = detector.vad.duty_cycle
+    return results
+
+
+def main():
+    """Run the wake word benchmark"""
+    parser = argparse.ArgumentParser(description="Wake word CPU benchmark")
+    parser.add_argument('--wav', help="16-bit WAV file to use instead of synthetic audio")
+    parser.add_argument('--duration', type=float, default=60.0, help="Synthetic audio length in seconds")
+    parser.add_argument('--model', default=config.VOSK_MODEL_PATH, help="Vosk model directory")
+    parser.add_argument('--wake-word', default=config.WAKE_WORD, help="Wake word to spot")
+    args = parser.parse_args()
+
+    print("=" * 70)
+    print("⏱  WAKE WORD BENCHMARK")
+    print("=" * 70)
+
+    if args.wav:
+        audio = load_wav(args.wav, config.SAMPLE_RATE)
+        print(f"\n📂 Audio: {args.wav}")
+    else:
+        audio = synthetic_audio(args.duration, config.SAMPLE_RATE)
+        print(f"\n🔧 Audio: {args.duration:.0f}s synthetic")
+
+    stt = SpeechToText(model_path=args.model)
+    results = run(stt, audio, args.wake_word)
+
+    print("\n" + "-" * 70)
+    print(f"  {'Mode':<12} {'CPU s/audio-hour':>18} {'RT factor':>10} {'Hits':>6}")
+    for mode, result in results.items():
+        print(f"  {mode:<12} {result['cpu_seconds_per_audio_hour']:>18.1f} "
+              f"{result['realtime_factor']:>10.4f} {result['hits']:>6}")
+
+    full = results['full']['cpu_seconds_per_audio_hour']
+    grammar = results['grammar']['cpu_seconds_per_audio_hour']
+    if grammar > 0:
+        print(f"\n  Grammar mode uses {full / grammar:.1f}x less CPU than full vocabulary")
+    print("=" * 70)
+
+
+if __name__ == "__main__":
+    main()
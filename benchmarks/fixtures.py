@@ -0,0 +1,75 @@
+"""
+Benchmark Fixtures - Audio inputs for headless benchmarks
+"""
+
+import wave
+import numpy as np
+from src.audio_backends import load_wav_mono
+from src.resampler import resample, to_int16
+
+
+def load_wav(path: str, sample_rate: int) -> np.ndarray:
+    """
+    Load a 16-bit WAV file as mono int16 at the requested sample rate
+
+    Args:
+        path: Path to WAV file
+        sample_rate: Target sample rate
+
+    Returns:
+        1D int16 array
+    """
+    audio, source_rate = load_wav_mono(path)
+
+    if source_rate != sample_rate:
+        audio = to_int16(resample(audio, source_rate, sample_rate))
+
+    return audio
+
+
+def save_wav(path: str, audio: np.ndarray, sample_rate: int):
+    """
+    Write int16 mono audio as a 16-bit WAV file
+
+    Args:
+        path: Path to WAV file
+        audio: 1D int16 array
+        sample_rate: Sample rate
+    """
+    with wave.open(path, 'wb') as wav_file:
+        wav_file.setnchannels(1)
+        wav_file.setsampwidth(2)
+        wav_file.setframerate(sample_rate)
+        wav_file.writeframes(audio.astype(np.int16).tobytes())
+
+
+def synthetic_audio(duration: float, sample_rate: int, seed: int = 0) -> np.ndarray:
+    """
+    Generate speech-like test audio: quiet room noise with louder voiced bursts
+
+    Recognizers produce no meaningful text from it, but the mix of silence and
+    activity gives stable, repeatable CPU measurements. Use a real recording
+    (--wav) for accuracy checks.
+
+    Args:
+        duration: Length in seconds
+        sample_rate: Sample rate
+        seed: Random seed for repeatable output
+
+    Returns:
+        1D int16 array
+    """
+    rng = np.random.default_rng(seed)
+    num_samples = int(duration * sample_rate)
+    audio = rng.normal(0, 100, num_samples).astype(np.float32)
+
+    # Roughly one second of "speech" every three seconds
+    t = np.arange(sample_rate, dtype=np.float32) / sample_rate
+    for start in range(sample_rate, num_samples - sample_rate, 3 * sample_rate):
+        pitch = rng.uniform(100, 220)
+        burst = sum(np.sin(2 * np.pi * pitch * k * t) / k for k in range(1, 8))
+        burst *= 4000 * np.hanning(sample_rate)
+        audio[start:start + sample_rate] += burst + rng.normal(0, 800, sample_rate)
+
+    return np.clip(audio, -32768, 32767).astype(np.int16)
+
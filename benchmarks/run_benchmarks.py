@@ -0,0 +1,461 @@
+"""
+Benchmark Suite - Timings of the speech pipeline hot paths with regression gates
+
+Runs headless on synthetic audio (or a WAV file), writes the results as
+JSON and compares them with a stored baseline. A metric that got worse
+than the baseline by more than the threshold fails the run (exit code 1),
+so the suite can gate changes in CI. With --check, a missing baseline (or
+one sharing no metrics with the run) fails too, so a gate can't pass by
+comparing nothing.
+
+Benchmarks needing something that isn't available (the Vosk model for
+speech recognition, a TTS engine) are skipped with a note.
+
+Usage:
+    python -m benchmarks.run_benchmarks
+    python -m benchmarks.run_benchmarks --output results.json
+    python -m benchmarks.run_benchmarks --save-baseline
+    python -m benchmarks.run_benchmarks --check
+    python -m benchmarks.run_benchmarks --only resample,ollama --threshold 0.3
+"""
+
+import sys
+import os
+import argparse
+import contextlib
+import io
+import json
+import platform
+import tempfile
+import time
+import wave
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+from src import config
+from src.resampler import PolyphaseResampler, resample
+from src.fake_ollama import FakeOllamaServer
+from benchmarks.fixtures import load_wav, save_wav, synthetic_audio
+
+# Set UTF-8 encoding for Windows console
+if sys.platform == 'win32':
+    try:
+        sys.stdout.reconfigure(encoding='utf-8')
+    except:
+        pass
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baseline.json')
+DEFAULT_THRESHOLD = 0.25  # Allowed slowdown relative to the baseline (25%)
+
+
+class SkipBenchmark(Exception):
+    """Raised by a benchmark whose requirements are missing"""
+
+
+def metric(value: float, unit: str, lower_is_better: bool = True) -> dict:
+    """One measured value as stored in the results file"""
+    return {'value': value, 'unit': unit, 'lower_is_better': lower_is_better}
+
+
+def timed(function: Callable[[], object], repeat: int = 5) -> float:
+    """
+    Fastest wall time of several runs (after one warm-up run)
+
+    The minimum is the least disturbed by other load on the machine,
+    which keeps the regression gate from tripping on noise.
+
+    Args:
+        function: Code to time
+        repeat: Number of timed runs
+
+    Returns:
+        Seconds of the fastest run
+    """
+    function()
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+@contextlib.contextmanager
+def quiet():
+    """Silence the components' progress output while they are being timed"""
+    with contextlib.redirect_stdout(io.StringIO()):
+        yield
+
+
+@contextlib.contextmanager
+def config_overrides(**settings):
+    """Temporarily change config values read by the components under test"""
+    previous = {name: getattr(config, name) for name in settings}
+    for name, value in settings.items():
+        setattr(config, name, value)
+    try:
+        yield
+    finally:
+        for name, value in previous.items():
+            setattr(config, name, value)
+
+
+# ============================================================================
+# Benchmarks (each returns a dictionary of metrics keyed by metric name)
+# ============================================================================
+
+def bench_resample(audio: np.ndarray, options) -> Dict[str, dict]:
+    """Cost of resampling browser and microphone rates to 16 kHz"""
+    results = {}
+    seconds = len(audio) / config.SAMPLE_RATE
+    for source_rate in (48000, 44100):
+        source = resample(audio, config.SAMPLE_RATE, source_rate)
+
+        whole = timed(lambda: resample(source, source_rate, config.SAMPLE_RATE))
+        results[f'{source_rate}_whole_ms_per_audio_second'] = metric(whole / seconds * 1000, 'ms/s')
+
+        # 20 ms blocks, as delivered by a capture callback or a WebSocket
+        block = source_rate // 50
+
+        def stream():
+            resampler = PolyphaseResampler(source_rate, config.SAMPLE_RATE)
+            for start in range(0, len(source), block):
+                resampler.process(source[start:start + block])
+            resampler.flush()
+
+        results[f'{source_rate}_stream_ms_per_audio_second'] = metric(timed(stream) / seconds * 1000, 'ms/s')
+    return results
+
+
+def bench_wake_word_match(audio: np.ndarray, options) -> Dict[str, dict]:
+    """Throughput of the fuzzy wake word text matcher"""
+    from src.wake_word_detector import WakeWordDetector
+
+    with quiet():
+        detector = WakeWordDetector(wake_word=options.wake_word, stt=object(), use_vad=False)
+
+    # Hits, near misses and ordinary speech, like the partial results it sees
+    texts = [
+        detector.wake_word,
+        f"well {detector.wake_word} are you there",
+        detector.wake_word.replace('a', 'o'),
+        "what is the weather like today",
+        "can you tell me a joke about computers please",
+        "the quick brown fox jumps over the lazy dog " * 3,
+        "hello",
+        "",
+    ]
+    rounds = 2000
+
+    def run():
+        for _ in range(rounds):
+            for text in texts:
+                detector._matches_wake_word(text)
+
+    seconds = timed(run)
+    return {'matches_per_second': metric(rounds * len(texts) / seconds, 'calls/s', lower_is_better=False)}
+
+
+def _load_stt(options):
+    """Speech recognizer for the STT benchmarks (skips them without a model)"""
+    if not os.path.isdir(options.model):
+        raise SkipBenchmark(f"Vosk model not found at {options.model}")
+    from src.speech_to_text import SpeechToText
+    with quiet():
+        return SpeechToText(model_path=options.model)
+
+
+def bench_stt(audio: np.ndarray, options) -> Dict[str, dict]:
+    """Real-time factor of whole-utterance and streaming recognition"""
+    stt = _load_stt(options)
+    seconds = len(audio) / config.SAMPLE_RATE
+
+    with quiet():
+        utterance = timed(lambda: stt.transcribe_audio(audio, source_sample_rate=config.SAMPLE_RATE), repeat=3)
+
+    chunk = int(config.STT_CHUNK_DURATION * config.SAMPLE_RATE)
+
+    def stream():
+        recognizer = stt.create_recognizer()
+        for start in range(0, len(audio), chunk):
+            stt.transcribe_stream(audio[start:start + chunk], recognizer)
+        recognizer.FinalResult()
+
+    return {
+        'utterance_real_time_factor': metric(utterance / seconds, 'x'),
+        'stream_real_time_factor': metric(timed(stream, repeat=3) / seconds, 'x')
+    }
+
+
+def bench_wake_word(audio: np.ndarray, options) -> Dict[str, dict]:
+    """CPU spent spotting the wake word per hour of audio"""
+    from benchmarks.bench_wake_word import run
+    stt = _load_stt(options)
+    with quiet():
+        modes = run(stt, audio, options.wake_word)
+    return {
+        f'{mode}_cpu_seconds_per_audio_hour': metric(result['cpu_seconds_per_audio_hour'], 's/h')
+        for mode, result in modes.items()
+    }
+
+
+def bench_ollama(audio: np.ndarray, options) -> Dict[str, dict]:
+    """Client-side overhead per request against a local fake server that answers instantly"""
+    from src.ollama_client import OllamaClient
+
+    with FakeOllamaServer() as server:
+        with quiet():
+            client = OllamaClient(base_url=server.base_url, model='benchmark')
+        rounds = 200
+
+        def chat():
+            for _ in range(rounds):
+                client.chat("Hello there", maintain_context=False)
+
+        def chat_stream():
+            for _ in range(rounds):
+                for _ in client.chat_stream("Hello there", maintain_context=False):
+                    pass
+
+        with quiet():
+            results = {
+                'chat_ms_per_request': metric(timed(chat) / rounds * 1000, 'ms'),
+                'stream_ms_per_request': metric(timed(chat_stream) / rounds * 1000, 'ms')
+            }
+        client.close()
+    return results
+
+
+def bench_tts(audio: np.ndarray, options) -> Dict[str, dict]:
+    """Time to synthesize a typical answer sentence into memory"""
+    try:
+        with quiet():
+            from src.text_to_speech import TextToSpeech
+            tts = TextToSpeech()
+    except Exception as e:
+        raise SkipBenchmark(f"no TTS engine ({e})")
+
+    sentence = "The weather today is mostly sunny with a light breeze and a high of twenty degrees."
+    synthesis = timed(lambda: tts.synthesize(sentence), repeat=3)
+
+    with wave.open(io.BytesIO(tts.synthesize(sentence)), 'rb') as wav_file:
+        spoken = wav_file.getnframes() / wav_file.getframerate()
+
+    return {
+        'sentence_seconds': metric(synthesis, 's'),
+        'real_time_factor': metric(synthesis / spoken if spoken else 0.0, 'x')
+    }
+
+
+def bench_end_to_end(audio: np.ndarray, options) -> Dict[str, dict]:
+    """
+    The whole assistant (wake word, STT, LLM, TTS) on replayed audio
+
+    The audio is replayed as microphone input as fast as recognition takes it,
+    the LLM is the fake server and speech goes to a null sink, so the result is
+    the pipeline's own throughput. Use --wav with a recording that says the wake
+    word and a question to measure turns; synthetic audio only exercises spotting.
+    """
+    if not os.path.isdir(options.model):
+        raise SkipBenchmark(f"Vosk model not found at {options.model}")
+    from src.audio_backends import WavReplayBackend
+    from src.voice_assistant import VoiceAssistant
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'replay.wav')
+        save_wav(path, audio, config.SAMPLE_RATE)
+        backend = WavReplayBackend([path], speed=0, gap=config.AUDIO_REPLAY_GAP)
+
+        with FakeOllamaServer() as server, config_overrides(
+                OLLAMA_URL=server.base_url, VOSK_MODEL_PATH=options.model, WAKE_WORD=options.wake_word,
+                OLLAMA_WARM_UP=False, TTS_CACHE_ENABLED=False, TRACING_ENABLED=True, TRACE_FILE=None):
+            with quiet():
+                try:
+                    assistant = VoiceAssistant(model='benchmark', audio_backend=backend)
+                except SystemExit:
+                    raise SkipBenchmark("assistant could not start (no TTS engine?)")
+                start = time.perf_counter()
+                assistant.run()
+                elapsed = time.perf_counter() - start
+
+    results = {'audio_seconds_per_second': metric(backend.replayed_seconds / elapsed, 'x', lower_is_better=False)}
+    totals = assistant.tracer.percentiles().get('total')
+    if totals:
+        results['turn_p50_seconds'] = metric(totals['p50'], 's')
+    return results
+
+
+BENCHMARKS = {
+    'resample': bench_resample,
+    'wake_word_match': bench_wake_word_match,
+    'stt': bench_stt,
+    'wake_word': bench_wake_word,
+    'ollama': bench_ollama,
+    'tts': bench_tts,
+    'end_to_end': bench_end_to_end,
+}
+
+
+# ============================================================================
+# Results and baseline comparison
+# ============================================================================
+
+def run_benchmarks(audio: np.ndarray, options, names: List[str]) -> Dict[str, dict]:
+    """
+    Run the selected benchmarks
+
+    Returns:
+        Metrics keyed by "<benchmark>.<metric>"
+    """
+    results = {}
+    for name in names:
+        print(f"\n▶ {name}...")
+        try:
+            metrics = BENCHMARKS[name](audio, options)
+        except SkipBenchmark as e:
+            print(f"  ⏭ Skipped: {e}")
+            continue
+        for metric_name, value in metrics.items():
+            results[f'{name}.{metric_name}'] = value
+            print(f"  {metric_name}: {value['value']:.4g} {value['unit']}")
+    return results
+
+
+def compare(results: Dict[str, dict], baseline: Dict[str, dict], threshold: float) -> List[dict]:
+    """
+    Compare results with a baseline
+
+    Args:
+        results: Current metrics
+        baseline: Metrics from the baseline file
+        threshold: Allowed relative change in the worse direction (0.25 = 25%)
+
+    Returns:
+        One entry per metric found in both, with the relative change
+        (positive means worse) and whether it exceeds the threshold
+    """
+    comparison = []
+    for name, current in sorted(results.items()):
+        previous = baseline.get(name)
+        if previous is None or not previous['value']:
+            continue
+
+        change = (current['value'] - previous['value']) / previous['value']
+        if not current.get('lower_is_better', True):
+            change = -change
+        comparison.append({
+            'metric': name,
+            'baseline': previous['value'],
+            'current': current['value'],
+            'change': change,
+            'regressed': change > threshold
+        })
+    return comparison
+
+
+def load_results(path: str) -> Optional[Dict[str, dict]]:
+    """Read the metrics of a results or baseline file (None if it doesn't exist)"""
+    if not os.path.exists(path):
+        return None
+    with open(path, encoding='utf-8') as results_file:
+        return json.load(results_file)['results']
+
+
+def save_results(path: str, results: Dict[str, dict], audio_source: str):
+    """Write metrics with enough context to tell runs apart"""
+    document = {
+        'created_at': datetime.now().isoformat(timespec='seconds'),
+        'audio': audio_source,
+        'platform': {
+            'python': platform.python_version(),
+            'machine': platform.machine(),
+            'processor': platform.processor(),
+            'system': platform.system()
+        },
+        'results': results
+    }
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as results_file:
+        json.dump(document, results_file, indent=2)
+
+
+def main() -> int:
+    """Run the benchmark suite"""
+    parser = argparse.ArgumentParser(description="Speech pipeline benchmarks with regression gates")
+    parser.add_argument('--wav', help="16-bit WAV file to use instead of synthetic audio")
+    parser.add_argument('--duration', type=float, default=30.0, help="Synthetic audio length in seconds")
+    parser.add_argument('--model', default=config.VOSK_MODEL_PATH, help="Vosk model directory")
+    parser.add_argument('--wake-word', default=config.WAKE_WORD, help="Wake word to spot")
+    parser.add_argument('--only', help=f"Comma-separated benchmarks to run ({', '.join(BENCHMARKS)})")
+    parser.add_argument('--output', help="Write results to this JSON file")
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE, help="Baseline JSON file to compare with")
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help="Allowed slowdown before a metric fails (0.25 = 25%%)")
+    parser.add_argument('--save-baseline', action='store_true', help="Store these results as the new baseline")
+    parser.add_argument('--check', action='store_true',
+                        help="Fail if there is no baseline to compare with (for CI gates)")
+    args = parser.parse_args()
+
+    names = args.only.split(',') if args.only else list(BENCHMARKS)
+    unknown = [name for name in names if name not in BENCHMARKS]
+    if unknown:
+        parser.error(f"unknown benchmarks: {', '.join(unknown)}")
+
+    print("=" * 70)
+    print("⏱  SPEECH PIPELINE BENCHMARKS")
+    print("=" * 70)
+
+    if args.wav:
+        audio = load_wav(args.wav, config.SAMPLE_RATE)
+        audio_source = args.wav
+    else:
+        audio = synthetic_audio(args.duration, config.SAMPLE_RATE)
+        audio_source = f"synthetic {args.duration:.0f}s"
+    print(f"\n🔧 Audio: {audio_source}")
+
+    results = run_benchmarks(audio, args, names)
+
+    if args.output:
+        save_results(args.output, results, audio_source)
+        print(f"\n💾 Results saved to {args.output}")
+
+    if args.save_baseline:
+        save_results(args.baseline, results, audio_source)
+        print(f"💾 Baseline saved to {args.baseline}")
+        print("=" * 70)
+        return 0
+
+    baseline = load_results(args.baseline)
+    if baseline is None:
+        flag = "❌" if args.check else "ℹ"
+        print(f"\n{flag} No baseline at {args.baseline} (create one with --save-baseline)")
+        print("=" * 70)
+        return 1 if args.check else 0
+
+    comparison = compare(results, baseline, args.threshold)
+    if not comparison and args.check:
+        print(f"\n❌ No metric of this run is in the baseline at {args.baseline}")
+        print("=" * 70)
+        return 1
+
+    print("\n" + "-" * 70)
+    print(f"  {'Metric':<48} {'Baseline':>9} {'Current':>9} {'Change':>8}")
+    for entry in comparison:
+        flag = "❌" if entry['regressed'] else "  "
+        print(f"{flag}{entry['metric']:<48} {entry['baseline']:>9.4g} {entry['current']:>9.4g} "
+              f"{entry['change']:>+7.0%}")
+
+    regressions = [entry for entry in comparison if entry['regressed']]
+    print(f"\n  {len(regressions)} of {len(comparison)} metrics regressed by more than {args.threshold:.0%}")
+    print("=" * 70)
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
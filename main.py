@@ -324,8 +324,11 @@ def main():
         selected_model = None
         test_devices = False
 
+        # Device prompts only apply to real microphones and speakers
+        hardware_audio = config.AUDIO_BACKEND == "sounddevice"
+
         # Ask user if they want to select audio devices (if enabled in config)
-        if config.PROMPT_DEVICE_SELECTION:
+        if config.PROMPT_DEVICE_SELECTION and hardware_audio:
             print("\n" + "=" * 70)
             print("🎧 Audio Device Setup")
             print("=" * 70)
@@ -345,7 +348,7 @@ def main():
                     sys.exit(0)
 
         # Ask user if they want to test audio devices (if enabled in config)
-        if config.PROMPT_DEVICE_TEST:
+        if config.PROMPT_DEVICE_TEST and hardware_audio:
             print("\n" + "=" * 70)
             print("🎧 Audio Device Test")
             print("=" * 70)
@@ -0,0 +1,356 @@
+"""
+Audio Backends - Where AudioManager gets microphone audio from and plays sound to
+
+- SoundDeviceBackend: microphone and speakers through PortAudio (sounddevice)
+- WavReplayBackend: WAV files replayed as microphone input, at real time or faster
+- NullBackend: silence as input; played audio is discarded (or kept for inspection)
+
+The replay and null backends need no audio hardware, so the whole
+pipeline can run in CI and benchmarks.
+"""
+
+import threading
+import time
+import wave
+from abc import ABC, abstractmethod
+from typing import Callable, List, Optional, Sequence, Tuple
+import numpy as np
+from .resampler import resample, to_int16
+from . import config
+
+# Called with each captured block: (int16 mono samples, input overflow, any status flag)
+InputCallback = Callable[[np.ndarray, bool, bool], None]
+
+
+class AudioBackend(ABC):
+    """Base class for audio input/output backends"""
+
+    name = "base"
+    hardware = False  # True if input comes from a real-time device (callbacks must never block)
+
+    def query_devices(self) -> list:
+        """Devices as sounddevice describes them (name, max_input_channels, ...)"""
+        return []
+
+    def default_devices(self) -> Tuple[Optional[int], Optional[int]]:
+        """Indexes of the default input and output device"""
+        return None, None
+
+    def input_rate(self, sample_rate: int, channels: int, device=None) -> int:
+        """
+        Get the rate input will be delivered at
+
+        Args:
+            sample_rate: Preferred sample rate
+            channels: Number of channels
+            device: Input device
+
+        Returns:
+            sample_rate if supported, otherwise the rate the backend will use
+        """
+        return sample_rate
+
+    @abstractmethod
+    def start_input(self, callback: InputCallback, sample_rate: int, channels: int,
+                    block_duration: float, device=None):
+        """
+        Start delivering input blocks to callback (on another thread)
+
+        Args:
+            callback: Receives each block (see InputCallback)
+            sample_rate: Rate from input_rate()
+            channels: Number of channels
+            block_duration: Seconds per block
+            device: Input device
+        """
+
+    @abstractmethod
+    def stop_input(self):
+        """Stop delivering input"""
+
+    @property
+    @abstractmethod
+    def input_active(self) -> bool:
+        """True while input is being delivered"""
+
+    @abstractmethod
+    def play(self, audio: np.ndarray, sample_rate: int, device=None):
+        """
+        Play audio and wait until it has finished
+
+        Args:
+            audio: Samples, shape (frames,) or (frames, channels)
+            sample_rate: Sample rate
+            device: Output device
+        """
+
+    @abstractmethod
+    def record(self, frames: int, sample_rate: int, channels: int, device=None,
+               dtype: str = 'int16') -> np.ndarray:
+        """
+        Record a fixed number of frames (outside the persistent capture stream)
+
+        Returns:
+            Array of shape (frames, channels)
+        """
+
+
+class SoundDeviceBackend(AudioBackend):
+    """Microphone and speakers through PortAudio"""
+
+    name = "sounddevice"
+    hardware = True
+
+    def __init__(self):
+        import sounddevice  # Needs the PortAudio library, so only imported when used
+        self.sd = sounddevice
+        self._stream = None
+
+    def query_devices(self) -> list:
+        return self.sd.query_devices()
+
+    def default_devices(self) -> Tuple[Optional[int], Optional[int]]:
+        return self.sd.default.device[0], self.sd.default.device[1]
+
+    def input_rate(self, sample_rate: int, channels: int, device=None) -> int:
+        try:
+            self.sd.check_input_settings(device=device, channels=channels, samplerate=sample_rate, dtype='int16')
+            return sample_rate
+        except Exception:
+            # Device can't capture at this rate: use its own and let the caller resample
+            return int(self.sd.query_devices(device, 'input')['default_samplerate'])
+
+    def start_input(self, callback: InputCallback, sample_rate: int, channels: int,
+                    block_duration: float, device=None):
+        def on_audio(indata, frames, time_info, status):
+            # Runs on the real-time audio thread
+            callback(indata[:, 0], bool(status.input_overflow), bool(status))
+
+        # Wait 100ms for Bluetooth device latency before starting stream
+        time.sleep(0.1)
+        self._stream = self.sd.InputStream(
+            callback=on_audio,
+            channels=channels,
+            samplerate=sample_rate,
+            device=device,
+            blocksize=int(block_duration * sample_rate),
+            dtype='int16'
+        )
+        self._stream.start()
+
+    def stop_input(self):
+        if self._stream is None:
+            return
+        try:
+            self._stream.stop()
+            self._stream.close()
+        finally:
+            self._stream = None
+
+    @property
+    def input_active(self) -> bool:
+        return self._stream is not None and self._stream.active
+
+    def play(self, audio: np.ndarray, sample_rate: int, device=None):
+        # Wait 100ms for Bluetooth device latency
+        time.sleep(0.1)
+        self.sd.play(audio, sample_rate, device=device)
+        self.sd.wait()
+
+    def record(self, frames: int, sample_rate: int, channels: int, device=None,
+               dtype: str = 'int16') -> np.ndarray:
+        # Wait 100ms for Bluetooth device latency
+        time.sleep(0.1)
+        audio = self.sd.rec(frames, samplerate=sample_rate, channels=channels, device=device, dtype=dtype)
+        self.sd.wait()
+        return audio
+
+
+class NullBackend(AudioBackend):
+    """
+    No audio hardware: silence as input, played audio is discarded
+
+    Input is generated on a background thread at speed times real time
+    (0 = as fast as the consumer takes it). Played audio is counted, and
+    kept in self.played if keep_output is set, so tests can inspect what
+    the assistant said.
+    """
+
+    name = "null"
+
+    def __init__(self, speed: float = 1.0, keep_output: bool = False, play_speed: float = 0.0):
+        """
+        Initialize backend
+
+        Args:
+            speed: Input pace relative to real time (0 = unpaced)
+            keep_output: Keep every played clip in self.played as (audio, sample_rate)
+            play_speed: Playback pace relative to real time (0 = returns immediately)
+        """
+        self.speed = speed
+        self.keep_output = keep_output
+        self.play_speed = play_speed
+        self.played: List[Tuple[np.ndarray, int]] = []
+        self.played_seconds = 0.0
+        self.finished = threading.Event()  # Set when the input has run out
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _blocks(self, block_size: int):
+        """Input blocks to deliver (silence, forever)"""
+        silence = np.zeros(block_size, dtype=np.int16)
+        while True:
+            yield silence
+
+    def start_input(self, callback: InputCallback, sample_rate: int, channels: int,
+                    block_duration: float, device=None):
+        if self.input_active:
+            return
+        block_size = max(1, int(block_duration * sample_rate))
+        self._stop.clear()
+        self.finished.clear()
+        self._thread = threading.Thread(target=self._run_input, args=(callback, sample_rate, block_size),
+                                        name=f"{self.name}-input", daemon=True)
+        self._thread.start()
+
+    def _run_input(self, callback: InputCallback, sample_rate: int, block_size: int):
+        """Deliver blocks at the configured pace until stopped or out of input"""
+        try:
+            started = time.perf_counter()
+            delivered = 0
+            for block in self._blocks(block_size):
+                if self._stop.is_set():
+                    break
+                if self.speed:
+                    delay = started + delivered / (sample_rate * self.speed) - time.perf_counter()
+                    if delay > 0:
+                        time.sleep(delay)
+                callback(block, False, False)
+                delivered += len(block)
+        finally:
+            self.finished.set()
+
+    def stop_input(self):
+        self._stop.set()
+        thread = self._thread
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(1.0)
+        self._thread = None
+
+    @property
+    def input_active(self) -> bool:
+        return self._thread is not None and self._thread.is_alive() and not self._stop.is_set()
+
+    def play(self, audio: np.ndarray, sample_rate: int, device=None):
+        duration = len(audio) / sample_rate
+        self.played_seconds += duration
+        if self.keep_output:
+            self.played.append((np.array(audio), sample_rate))
+        if self.play_speed:
+            time.sleep(duration / self.play_speed)
+
+    def record(self, frames: int, sample_rate: int, channels: int, device=None,
+               dtype: str = 'int16') -> np.ndarray:
+        return np.zeros((frames, channels), dtype=dtype)
+
+
+def load_wav_mono(path: str) -> Tuple[np.ndarray, int]:
+    """
+    Read a 16-bit WAV file as mono
+
+    Returns:
+        Tuple of (int16 samples, sample rate)
+    """
+    with wave.open(path, 'rb') as wav_file:
+        if wav_file.getsampwidth() != 2:
+            raise ValueError(f"{path}: only 16-bit WAV files are supported")
+        channels = wav_file.getnchannels()
+        sample_rate = wav_file.getframerate()
+        audio = np.frombuffer(wav_file.readframes(wav_file.getnframes()), dtype=np.int16)
+
+    if channels > 1:
+        audio = audio.reshape(-1, channels).mean(axis=1).astype(np.int16)
+    return audio, sample_rate
+
+
+class WavReplayBackend(NullBackend):
+    """
+    WAV files replayed as microphone input; played audio is discarded
+
+    Each file is followed by gap seconds of silence, so the endpointer sees
+    the speaker stop. Input ends after the last file (unless loop is set),
+    which ends the assistant's listening loop. Files are delivered at the
+    first file's sample rate (others are resampled to it).
+    """
+
+    name = "replay"
+
+    def __init__(self, paths: Sequence[str], speed: float = 1.0, gap: float = 1.0, loop: bool = False,
+                 keep_output: bool = False, play_speed: float = 0.0):
+        """
+        Initialize backend
+
+        Args:
+            paths: WAV files to replay, in order
+            speed: Input pace relative to real time (0 = as fast as the consumer takes it)
+            gap: Seconds of silence after each file
+            loop: Start again from the first file after the last one
+            keep_output: Keep every played clip in self.played as (audio, sample_rate)
+            play_speed: Playback pace relative to real time (0 = returns immediately)
+        """
+        super().__init__(speed=speed, keep_output=keep_output, play_speed=play_speed)
+        if not paths:
+            raise ValueError("WavReplayBackend needs at least one WAV file")
+
+        self.paths = list(paths)
+        self.gap = gap
+        self.loop = loop
+
+        self.clips = []
+        self.source_rate = None
+        for path in self.paths:
+            audio, sample_rate = load_wav_mono(path)
+            if self.source_rate is None:
+                self.source_rate = sample_rate
+            elif sample_rate != self.source_rate:
+                audio = to_int16(resample(audio, sample_rate, self.source_rate))
+            self.clips.append(audio)
+
+        self.replayed_seconds = 0.0
+
+    def input_rate(self, sample_rate: int, channels: int, device=None) -> int:
+        return self.source_rate
+
+    def _blocks(self, block_size: int):
+        """Each file in blocks, then its gap of silence"""
+        silence = np.zeros(int(self.gap * self.source_rate), dtype=np.int16)
+        while True:
+            for clip in self.clips:
+                padded = np.concatenate((clip, silence))
+                for start in range(0, len(padded), block_size):
+                    block = padded[start:start + block_size]
+                    self.replayed_seconds += len(block) / self.source_rate
+                    yield block
+            if not self.loop:
+                return
+
+
+def create_audio_backend(name: str = None) -> AudioBackend:
+    """
+    Create the configured audio backend
+
+    Args:
+        name: "sounddevice", "replay" or "null" (uses config if not provided)
+
+    Returns:
+        AudioBackend instance
+    """
+    name = name or config.AUDIO_BACKEND
+    if name == "sounddevice":
+        return SoundDeviceBackend()
+    if name == "replay":
+        return WavReplayBackend(config.AUDIO_REPLAY_FILES, speed=config.AUDIO_REPLAY_SPEED,
+                                gap=config.AUDIO_REPLAY_GAP)
+    if name == "null":
+        return NullBackend()
+    raise ValueError(f"Unknown audio backend: {name}")
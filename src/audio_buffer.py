@@ -0,0 +1,275 @@
+"""
+Audio Ring Buffer - Shared capture buffer with independent read cursors
+"""
+
+import threading
+import numpy as np
+from typing import Optional
+
+# What a reader does when its consumer falls behind real time
+POLICY_DROP_OLDEST = "drop_oldest"  # Skip the oldest pending audio
+POLICY_COALESCE = "coalesce"  # Hand all pending blocks over in one larger chunk
+
+
+class AudioRingBuffer:
+    """
+    Preallocated int16 ring buffer written by a single capture stream
+
+    Positions are absolute sample counts since capture started, so a consumer
+    can remember a position (e.g. a wake word hit) and seek back to it later
+    as long as the audio has not been overwritten yet.
+    """
+
+    def __init__(self, capacity: int):
+        """
+        Initialize ring buffer
+
+        Args:
+            capacity: Number of samples kept in memory
+        """
+        self.capacity = capacity
+        self._buffer = np.zeros(capacity, dtype=np.int16)
+        self._write_position = 0
+        self._overwrite_position = 0  # End of the write in progress (runs ahead of _write_position during a write)
+        self._condition = threading.Condition()
+
+    @property
+    def write_position(self) -> int:
+        """Absolute position of the next sample to be written"""
+        return self._write_position
+
+    @property
+    def oldest_position(self) -> int:
+        """
+        Absolute position of the oldest sample still in the buffer
+
+        During a write this already excludes the samples being overwritten.
+        """
+        return max(0, self._overwrite_position - self.capacity)
+
+    def headroom(self, position: int) -> int:
+        """Number of samples that can still be written before `position` is overwritten"""
+        return position + self.capacity - self._overwrite_position
+
+    def write(self, samples: np.ndarray):
+        """
+        Append samples to the buffer, overwriting the oldest audio
+
+        Args:
+            samples: 1D int16 audio samples
+        """
+        count = len(samples)
+        if count == 0:
+            return
+
+        # Only the newest `capacity` samples can ever be read back
+        if count > self.capacity:
+            samples = samples[-self.capacity:]
+
+        # Announce the overwrite before storing, so readers never trust samples being replaced
+        self._overwrite_position = self._write_position + count
+
+        start = (self._write_position + count - len(samples)) % self.capacity
+        first = min(len(samples), self.capacity - start)
+        self._buffer[start:start + first] = samples[:first]
+        if first < len(samples):
+            self._buffer[:len(samples) - first] = samples[first:]
+
+        with self._condition:
+            self._write_position += count
+            self._condition.notify_all()
+
+    def create_reader(self, name: str = "reader", position: Optional[int] = None) -> 'RingBufferReader':
+        """
+        Create a new read cursor
+
+        Args:
+            name: Consumer name (used in diagnostics)
+            position: Absolute start position (defaults to the newest sample)
+
+        Returns:
+            RingBufferReader instance
+        """
+        return RingBufferReader(self, name, self._write_position if position is None else position)
+
+    def wait_for(self, position: int, timeout: Optional[float] = None) -> bool:
+        """
+        Block until the write position reaches `position`
+
+        Args:
+            position: Absolute position to wait for
+            timeout: Maximum wait in seconds (None waits forever)
+
+        Returns:
+            True if the position was reached
+        """
+        with self._condition:
+            return self._condition.wait_for(lambda: self._write_position >= position, timeout)
+
+    def copy_range(self, start: int, out: np.ndarray):
+        """
+        Copy samples [start, start + len(out)) into `out`
+
+        Args:
+            start: Absolute start position (must still be in the buffer)
+            out: Destination array
+        """
+        count = len(out)
+        offset = start % self.capacity
+        first = min(count, self.capacity - offset)
+        out[:first] = self._buffer[offset:offset + first]
+        if first < count:
+            out[first:] = self._buffer[:count - first]
+
+    def view_range(self, start: int, count: int) -> Optional[np.ndarray]:
+        """
+        Get a zero-copy view of samples [start, start + count)
+
+        Args:
+            start: Absolute start position (must still be in the buffer)
+            count: Number of samples
+
+        Returns:
+            View into the buffer, or None if the range wraps around
+        """
+        offset = start % self.capacity
+        if offset + count > self.capacity:
+            return None
+        return self._buffer[offset:offset + count]
+
+
+def to_float32(samples: np.ndarray) -> np.ndarray:
+    """
+    Convert int16 samples to float32 in [-1.0, 1.0)
+
+    Capture stays int16 end to end; call this only where a consumer
+    actually needs floating point audio.
+    """
+    return samples.astype(np.float32) * (1.0 / 32768.0)
+
+
+class RingBufferReader:
+    """Independent read cursor into an AudioRingBuffer"""
+
+    def __init__(self, ring: AudioRingBuffer, name: str, position: int):
+        self.ring = ring
+        self.name = name
+        self.position = 0
+        self.overruns = 0  # Times this reader fell behind and lost audio
+        self.dropped_samples = 0  # Samples skipped by the backlog policy
+        self.coalesced_blocks = 0  # Blocks merged into a larger read by the backlog policy
+        self.torn_blocks = 0  # Zero-copy blocks overwritten while the consumer was still using them
+        self._scratch = np.empty(0, dtype=np.int16)  # Reused for reads that wrap around
+        self._view_start: Optional[int] = None  # Position of the last block handed out as a ring view
+        self.seek(position)
+
+    def seek(self, position: int):
+        """Move the cursor, clamped to the audio still held in the buffer"""
+        self.position = min(max(position, self.ring.oldest_position), self.ring.write_position)
+
+    def seek_latest(self):
+        """Skip all pending audio"""
+        self.position = self.ring.write_position
+
+    def rewind(self, num_samples: int):
+        """Move the cursor back by `num_samples` (e.g. for pre-roll)"""
+        self.seek(self.position - num_samples)
+
+    def available(self) -> int:
+        """Number of samples ready to be read"""
+        return self.ring.write_position - self.position
+
+    def read(self, num_samples: int, timeout: Optional[float] = None,
+             copy: bool = True) -> Optional[np.ndarray]:
+        """
+        Read the next block of samples, waiting for them if needed
+
+        Args:
+            num_samples: Block size in samples
+            timeout: Maximum wait in seconds (None waits forever)
+            copy: If False, return a read-only view instead of a new array.
+                  The view points into the ring buffer (or this reader's
+                  scratch buffer when the block wraps around, or when the
+                  reader is within one block of being overrun), so it is
+                  only valid until the next read. Call block_intact() when
+                  done with it to find out whether the writer overwrote it.
+
+        Returns:
+            int16 array of `num_samples` samples, or None on timeout
+        """
+        if not self.ring.wait_for(self.position + num_samples, timeout):
+            return None
+
+        # Reader fell so far behind that its audio was overwritten
+        if self.position < self.ring.oldest_position:
+            self.overruns += 1
+            self.seek(self.ring.write_position - num_samples)
+
+        self._view_start = None
+        if copy:
+            block = np.empty(num_samples, dtype=np.int16)
+            self.ring.copy_range(self.position, block)
+        else:
+            # Close to being overrun, the writer could reach the view while it is in use
+            near_overrun = self.ring.headroom(self.position) < num_samples
+            block = None if near_overrun else self.ring.view_range(self.position, num_samples)
+            if block is not None:
+                self._view_start = self.position
+            else:
+                if len(self._scratch) < num_samples:
+                    self._scratch = np.empty(num_samples, dtype=np.int16)
+                block = self._scratch[:num_samples]
+                self.ring.copy_range(self.position, block)
+            block = block.view()
+            block.flags.writeable = False
+
+        self.position += num_samples
+        return block
+
+    def block_intact(self) -> bool:
+        """
+        Check that the last block read with copy=False wasn't overwritten while in use
+
+        Returns:
+            False (and counts a torn block) if the writer has reached it since
+        """
+        if self._view_start is not None and self._view_start < self.ring.oldest_position:
+            self._view_start = None
+            self.torn_blocks += 1
+            return False
+        return True
+
+    def read_pending(self, num_samples: int, max_backlog: int, policy: str = POLICY_DROP_OLDEST,
+                     timeout: Optional[float] = None, copy: bool = True) -> Optional[np.ndarray]:
+        """
+        Read the next block while keeping the backlog bounded
+
+        Args:
+            num_samples: Block size in samples
+            max_backlog: Maximum pending samples before old audio is dropped
+            policy: POLICY_DROP_OLDEST or POLICY_COALESCE
+            timeout: Maximum wait in seconds (None waits forever)
+            copy: If False, return a read-only view (see read())
+
+        Returns:
+            int16 array of one block (or several coalesced blocks), or None on timeout
+        """
+        if not self.ring.wait_for(self.position + num_samples, timeout):
+            return None
+
+        # Consumer is behind real time: drop whole blocks of the oldest audio
+        backlog = self.available()
+        if backlog > max_backlog:
+            dropped = backlog - max_backlog
+            dropped += -dropped % num_samples
+            dropped = min(dropped, backlog - num_samples)
+            self.dropped_samples += dropped
+            self.position += dropped
+
+        count = num_samples
+        if policy == POLICY_COALESCE:
+            blocks = self.available() // num_samples
+            self.coalesced_blocks += blocks - 1
+            count = blocks * num_samples
+
+        return self.read(count, timeout=0, copy=copy)
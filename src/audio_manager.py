@@ -2,30 +2,111 @@
 Audio Manager - Handles audio input/output and optional Bluetooth connections
 """
 
-import sounddevice as sd
 import numpy as np
-import time
+import io
+import queue
+import threading
+import wave
 from typing import Optional, Callable
+from scipy import signal
+from .audio_buffer import AudioRingBuffer, RingBufferReader
+from .audio_backends import AudioBackend, create_audio_backend
+from .resampler import PolyphaseResampler, to_int16
 from . import config
 
 
+class _BeepNotch:
+    """
+    Filters the beep tone out of audio captured while the beep played
+
+    Applied by readers of the capture stream, so the capture callback only
+    copies. Audio outside the beep interval passes through untouched.
+    """
+
+    def __init__(self, start: int, end: int, sample_rate: int):
+        """
+        Args:
+            start: Ring buffer position the beep started at
+            end: Ring buffer position its echo ended at
+            sample_rate: Sample rate of the capture stream
+        """
+        self.start = start
+        self.end = end
+        self.b, self.a = signal.iirnotch(config.BEEP_FREQUENCY, config.BEEP_NOTCH_Q, fs=sample_rate)
+        self.state = np.zeros(len(self.a) - 1)
+
+    def process(self, chunk: np.ndarray, position: int) -> np.ndarray:
+        """
+        Filter the part of a chunk that falls inside the beep interval
+
+        Args:
+            chunk: int16 samples (may be a read-only view)
+            position: Ring buffer position of the chunk's first sample
+
+        Returns:
+            The chunk itself if it doesn't overlap the beep, otherwise a filtered copy
+        """
+        first = max(self.start, position) - position
+        last = min(self.end, position + len(chunk)) - position
+        if first >= last:
+            return chunk
+
+        filtered = chunk.copy()
+        notched, self.state = signal.lfilter(self.b, self.a, filtered[first:last], zi=self.state)
+        filtered[first:last] = to_int16(notched)
+        return filtered
+
+
 class AudioManager:
     """Manages audio input/output for the voice assistant"""
 
-    def __init__(self, interactive_setup: bool = False):
+    def __init__(self, interactive_setup: bool = False, backend: AudioBackend = None):
         """
         Initialize audio manager
 
         Args:
             interactive_setup: If True, prompt user to select devices
+            backend: Where audio comes from and goes to (uses config.AUDIO_BACKEND if not provided)
         """
+        self.backend = backend or create_audio_backend()
         self.sample_rate = config.SAMPLE_RATE
         self.channels = config.CHANNELS
         self.chunk_size = config.CHUNK_SIZE
         self.input_device = None
         self.output_device = None
 
-        if interactive_setup:
+        # Persistent capture stream shared by wake word, STT and diagnostics
+        self.ring_buffer = AudioRingBuffer(int(config.AUDIO_BUFFER_DURATION * self.sample_rate))
+        self.pre_roll = config.PRE_ROLL_DURATION
+        self.wake_word_position = None  # Ring buffer position of the last wake word hit
+        self.beep_end_position = None  # Ring buffer position where the last beep (and its echo) ended
+        self.beep_interval = None  # Ring buffer (start, end) of a beep the microphone may have picked up
+        # Set when the input device can't capture at SAMPLE_RATE: the callback queues
+        # native-rate blocks and a capture-processing thread resamples them into the ring
+        self._capture_queue: Optional[queue.SimpleQueue] = None
+        self._capture_thread: Optional[threading.Thread] = None
+        self._queued_blocks = 0  # Only changed by the capture callback
+        self._processed_blocks = 0  # Only changed by the capture-processing thread
+
+        # Recognition backlog handling and capture health counters
+        self.max_backlog = int(config.AUDIO_MAX_BACKLOG * self.sample_rate)
+        self.backlog_policy = config.AUDIO_BACKLOG_POLICY
+        self.captured_blocks = 0
+        self.input_overflows = 0
+        self.status_events = 0
+        self.dropped_samples = 0
+        self.coalesced_blocks = 0
+        self.torn_blocks = 0
+        self._reported_overflows = 0
+
+        # Active record_stream readers and their chunk sizes. Non-hardware backends
+        # (replay) wait on this so input only flows as fast as recognition takes it.
+        self._listeners = {}
+        self._listeners_changed = threading.Condition()
+
+        if not self.backend.hardware:
+            print(f"✓ Using '{self.backend.name}' audio backend (no audio hardware)")
+        elif interactive_setup:
             self._interactive_device_selection()
         else:
             self._setup_devices()
@@ -33,12 +114,11 @@ class AudioManager:
     def _interactive_device_selection(self):
         """Interactive device selection - prompt user to choose devices"""
         try:
-            devices = sd.query_devices()
+            devices = self.backend.query_devices()
 
             # Get default devices
             try:
-                default_input = sd.default.device[0]
-                default_output = sd.default.device[1]
+                default_input, default_output = self.backend.default_devices()
                 default_input_name = devices[default_input]['name'] if isinstance(default_input, int) else "System Default"
                 default_output_name = devices[default_output]['name'] if isinstance(default_output, int) else "System Default"
             except:
@@ -145,7 +225,7 @@ class AudioManager:
     def _setup_devices(self):
         """Setup audio devices (with optional Bluetooth)"""
         try:
-            devices = sd.query_devices()
+            devices = self.backend.query_devices()
             print("\nAvailable audio devices:")
             for idx, device in enumerate(devices):
                 print(f"  [{idx}] {device['name']} (In: {device['max_input_channels']}, Out: {device['max_output_channels']})")
@@ -168,8 +248,7 @@ class AudioManager:
 
             # Get default device names
             try:
-                default_input = sd.default.device[0]
-                default_output = sd.default.device[1]
+                default_input, default_output = self.backend.default_devices()
                 default_input_name = devices[default_input]['name'] if isinstance(default_input, int) else "System Default"
                 default_output_name = devices[default_output]['name'] if isinstance(default_output, int) else "System Default"
             except:
@@ -202,58 +281,286 @@ class AudioManager:
             numpy array of audio samples
         """
         print(f"🎤 Recording for {duration} seconds...")
-        # Wait 100ms for Bluetooth device latency
-        time.sleep(0.1)
-        audio = sd.rec(
-            int(duration * self.sample_rate),
-            samplerate=self.sample_rate,
-            channels=self.channels,
-            device=self.input_device,
-            dtype='int16'
-        )
-        sd.wait()
-        return audio
-
-    def record_stream(self, callback: Callable[[np.ndarray], bool], chunk_duration: float = 0.25):
+
+        # Share the persistent stream if it is already running and can hold the clip
+        if self.capture_active and duration * self.sample_rate <= self.ring_buffer.capacity:
+            reader = self.create_reader("diagnostics")
+            audio = reader.read(int(duration * self.sample_rate), timeout=duration + 1.0)
+            if audio is not None:
+                return audio.reshape(-1, 1)
+
+        return self.backend.record(int(duration * self.sample_rate), self.sample_rate,
+                                   self.channels, self.input_device)
+
+    def start_capture(self):
         """
-        Record audio stream and call callback for each chunk
+        Start the persistent input stream that feeds the ring buffer
+
+        The stream stays open until stop_capture() is called, so consumers
+        never pay stream-open latency and no audio is lost between them.
+        """
+        if self.backend.input_active:
+            return
+
+        self._stop_capture_processing()
+
+        # Capture at 16 kHz if the device supports it, otherwise at its own rate and resample
+        capture_rate = self.backend.input_rate(self.sample_rate, self.channels, self.input_device)
+        if capture_rate != self.sample_rate:
+            print(f"⚠ Audio input doesn't provide {self.sample_rate} Hz, "
+                  f"capturing at {capture_rate} Hz and resampling")
+            self._capture_queue = queue.SimpleQueue()
+            self._capture_thread = threading.Thread(
+                target=self._process_captured,
+                args=(self._capture_queue, PolyphaseResampler(capture_rate, self.sample_rate)),
+                name="capture-resampler", daemon=True)
+            self._capture_thread.start()
+
+        self.backend.start_input(self._capture_callback, capture_rate, self.channels,
+                                 config.CAPTURE_BLOCK_DURATION, self.input_device)
+
+    def stop_capture(self):
+        """Stop the persistent input stream"""
+        self.backend.stop_input()
+        self._stop_capture_processing()
+        with self._listeners_changed:
+            self._listeners_changed.notify_all()
+
+    def _stop_capture_processing(self):
+        """Resample the blocks still queued, then end the capture-processing thread"""
+        if self._capture_queue is None:
+            return
+        self._capture_queue.put(None)
+        self._capture_thread.join(1.0)
+        self._capture_queue = None
+        self._capture_thread = None
+        self._processed_blocks = self._queued_blocks  # Nothing is pending any more
+
+    def _process_captured(self, blocks: queue.SimpleQueue, resampler: PolyphaseResampler):
+        """Capture-processing thread: resample queued native-rate blocks into the ring buffer"""
+        while True:
+            samples = blocks.get()
+            if samples is None:
+                return
+            # One small filter pass per block (filter taps are precomputed)
+            self.ring_buffer.write(to_int16(resampler.process(samples)))
+            self._processed_blocks += 1
+
+    @property
+    def capture_active(self) -> bool:
+        """True while the persistent input stream is running (or captured audio is still being resampled)"""
+        return self.backend.input_active or self._queued_blocks != self._processed_blocks
+
+    def _capture_callback(self, samples: np.ndarray, overflow: bool = False, status: bool = False):
+        """
+        Backend input callback - copy the block into the ring buffer
+
+        With a hardware backend this runs on the real-time audio thread, so it
+        only copies and counts. Recognition happens on the consumer's worker thread.
+
+        Args:
+            samples: int16 mono samples
+            overflow: The device dropped input before this block
+            status: The device reported any status flag
+        """
+        self.captured_blocks += 1
+        if status:
+            self.status_events += 1
+            if overflow:
+                self.input_overflows += 1
+
+        if not self.backend.hardware:
+            self._wait_for_listeners()
+
+        blocks = self._capture_queue
+        if blocks is not None:
+            # Resampled on the capture-processing thread; the backend reuses its buffer
+            blocks.put(samples.copy())
+            self._queued_blocks += 1
+            return
+
+        # The device's int16 block is copied in with no conversion
+        self.ring_buffer.write(samples)
+
+    def _wait_for_listeners(self):
+        """
+        Hold back non-hardware input until a consumer is listening and caught up
+
+        Replayed audio then only advances while the assistant listens, and never
+        faster than recognition runs, so nothing is dropped at any replay speed.
+        Called on the backend's input thread, never a real-time audio thread.
+        """
+        def ready():
+            if not self.backend.input_active:
+                return True
+            if not self._listeners:
+                return False
+            return all(reader.available() < 2 * block_size for reader, block_size in self._listeners.items())
+
+        with self._listeners_changed:
+            while not ready():
+                self._listeners_changed.wait(0.1)
+
+    def _report_capture_status(self):
+        """Print new input overflows (called from consumer threads, never the callback)"""
+        if self.input_overflows != self._reported_overflows:
+            self._reported_overflows = self.input_overflows
+            print(f"\n⚠ Audio input overflow ({self.input_overflows} total)")
+
+    def get_capture_stats(self) -> dict:
+        """
+        Get capture and recognition backlog counters
+
+        Returns:
+            Dictionary of counters since the AudioManager was created
+        """
+        return {
+            'captured_blocks': self.captured_blocks,
+            'input_overflows': self.input_overflows,
+            'status_events': self.status_events,
+            'dropped_seconds': self.dropped_samples / self.sample_rate,
+            'coalesced_blocks': self.coalesced_blocks,
+            'torn_blocks': self.torn_blocks,
+            'backlog_policy': self.backlog_policy
+        }
+
+    def create_reader(self, name: str = "reader", position: Optional[int] = None) -> RingBufferReader:
+        """
+        Create a read cursor on the capture ring buffer
 
         Args:
-            callback: Function called with each audio chunk. Return False to stop recording.
+            name: Consumer name (e.g. "wake_word", "stt")
+            position: Absolute start position (defaults to the newest sample)
+
+        Returns:
+            RingBufferReader instance
+        """
+        return self.ring_buffer.create_reader(name, position)
+
+    def mark_wake_word(self, position: int):
+        """
+        Remember where the wake word was heard
+
+        Args:
+            position: Ring buffer position right after the wake word
+        """
+        self.wake_word_position = position
+
+    def pre_roll_position(self) -> Optional[int]:
+        """
+        Get the position the next utterance should start from
+
+        STT starts after the wake word, so it never decodes the wake word
+        again. If a beep was played since, only the pre-roll before the
+        end of the beep is replayed, which catches speech that started
+        during the beep (the beep tone itself is notched out on capture).
+
+        Returns:
+            Ring buffer position, or None if no wake word is pending
+        """
+        if self.wake_word_position is None:
+            return None
+
+        position = self.wake_word_position
+        if self.beep_end_position is not None and self.beep_end_position > position:
+            position = max(position, self.beep_end_position - int(self.pre_roll * self.sample_rate))
+            position = min(position, self.ring_buffer.write_position)
+
+        self.wake_word_position = None
+        self.beep_end_position = None
+        return position
+
+    def record_stream(self, callback: Callable[[np.ndarray], bool], chunk_duration: float = 0.25,
+                      start_position: Optional[int] = None, name: str = "stream") -> int:
+        """
+        Read the capture stream and call callback for each chunk
+
+        Args:
+            callback: Function called with each int16 audio chunk. Return False to stop recording.
+                      The chunk is a read-only view that is only valid during the call.
             chunk_duration: Duration of each chunk in seconds
+            start_position: Ring buffer position to start reading from (defaults to now)
+            name: Consumer name for the read cursor
+
+        Returns:
+            Ring buffer position right after the last chunk passed to callback
         """
-        # Flag to control the stream loop
-        stream_active = [True]  # Using list to allow modification in nested function
+        self.start_capture()
+
+        reader = self.create_reader(name, start_position)
+        block_size = int(chunk_duration * self.sample_rate)
+
+        # Speech overlapping the beep is kept, the beep tone itself is filtered out
+        beep_notch = None
+        if self.beep_interval is not None and self.beep_interval[1] > reader.position:
+            beep_notch = _BeepNotch(*self.beep_interval, self.sample_rate)
+        pace_input = not self.backend.hardware
+        stop_event = threading.Event()
+        errors = []
 
-        def audio_callback(indata, frames, time_info, status):
-            if status:
-                print(f"Audio status: {status}")
+        def recognition_worker():
+            """Drain the capture buffer and run the callback off the audio thread"""
+            try:
+                while not stop_event.is_set():
+                    audio_chunk = reader.read_pending(block_size, self.max_backlog,
+                                                      self.backlog_policy, timeout=0.5, copy=False)
+                    self._report_capture_status()
+
+                    if audio_chunk is None:
+                        if not self.capture_active:
+                            if self.backend.hardware:
+                                print("\n❌ Audio capture stream stopped")
+                            else:
+                                print(f"\n✓ End of '{self.backend.name}' audio input")
+                            break
+                        continue
+
+                    if beep_notch is not None:
+                        audio_chunk = beep_notch.process(audio_chunk, reader.position - len(audio_chunk))
+
+                    # If callback returns False, stop reading
+                    keep_reading = callback(audio_chunk)
+                    if not reader.block_intact():
+                        print("\n⚠ Recognition fell a whole buffer behind; a chunk was overwritten while in use")
+                    if not keep_reading:
+                        break
 
-            # Convert to int16 and call the callback
-            audio_chunk = (indata.copy() * 32767).astype(np.int16)
+                    if pace_input:
+                        # Let held-back input continue now that this chunk is consumed
+                        with self._listeners_changed:
+                            self._listeners_changed.notify_all()
+            except Exception as e:
+                errors.append(e)
+            finally:
+                stop_event.set()
 
-            # If callback returns False, stop the stream
-            if not callback(audio_chunk):
-                stream_active[0] = False  # Signal to stop
-                raise sd.CallbackAbort
+        with self._listeners_changed:
+            self._listeners[reader] = block_size
+            self._listeners_changed.notify_all()
+
+        worker = threading.Thread(target=recognition_worker, name=f"{name}-recognizer", daemon=True)
+        worker.start()
 
         try:
-            # Wait 100ms for Bluetooth device latency before starting stream
-            time.sleep(0.1)
-            with sd.InputStream(
-                callback=audio_callback,
-                channels=self.channels,
-                samplerate=self.sample_rate,
-                device=self.input_device,
-                blocksize=int(chunk_duration * self.sample_rate)
-            ):
-                # Keep stream open until callback signals to stop
-                while stream_active[0]:
-                    sd.sleep(100)
-        except sd.CallbackAbort:
-            pass
+            while worker.is_alive():
+                worker.join(0.1)
         except KeyboardInterrupt:
+            stop_event.set()
+            worker.join(1.0)
             print("\n\nStream interrupted by user")
+        finally:
+            with self._listeners_changed:
+                self._listeners.pop(reader, None)
+                self._listeners_changed.notify_all()
+
+        self.dropped_samples += reader.dropped_samples
+        self.coalesced_blocks += reader.coalesced_blocks
+        self.torn_blocks += reader.torn_blocks
+
+        if errors:
+            raise errors[0]
+
+        return reader.position
 
     def play_beep(self):
         """Play a beep sound to indicate wake word detected"""
@@ -264,15 +571,38 @@ class AudioManager:
         t = np.linspace(0, duration, int(self.sample_rate * duration))
         beep = np.sin(2 * np.pi * frequency * t) * 0.3  # 30% volume
 
-        # Wait 100ms for Bluetooth device latency
-        time.sleep(0.1)
+        # Only a real microphone picks up the speaker
+        echo_tail = config.BEEP_ECHO_TAIL if self.backend.hardware else 0.0
+        start_position = self.ring_buffer.write_position
+
         # Play beep
-        sd.play(beep, self.sample_rate, device=self.output_device)
-        sd.wait()
+        try:
+            self.backend.play(beep, self.sample_rate, self.output_device)
+        finally:
+            self.beep_end_position = self.ring_buffer.write_position + int(echo_tail * self.sample_rate)
+            if echo_tail:
+                self.beep_interval = (start_position, self.beep_end_position)
+
+    def play_wav(self, wav_bytes: bytes):
+        """
+        Play 16-bit WAV audio (e.g. cached speech) on the output device
+
+        Args:
+            wav_bytes: WAV file contents
+        """
+        with io.BytesIO(wav_bytes) as wav_io:
+            with wave.open(wav_io, 'rb') as wav_file:
+                if wav_file.getsampwidth() != 2:
+                    raise ValueError(f"Unsupported sample width: {wav_file.getsampwidth()}")
+                sample_rate = wav_file.getframerate()
+                channels = wav_file.getnchannels()
+                audio = np.frombuffer(wav_file.readframes(wav_file.getnframes()), dtype=np.int16)
+
+        self.backend.play(audio.reshape(-1, channels), sample_rate, self.output_device)
 
     def list_devices(self):
         """List all available audio devices"""
-        return sd.query_devices()
+        return self.backend.query_devices()
 
     def test_devices(self):
         """
@@ -323,16 +653,8 @@ class AudioManager:
             print(f"\n🔴 Recording for {duration} seconds...")
             print("   Speak now: Say something like 'Testing, one, two, three'")
 
-            # Wait 100ms for Bluetooth device latency
-            time.sleep(0.1)
-            audio = sd.rec(
-                int(duration * self.sample_rate),
-                samplerate=self.sample_rate,
-                channels=self.channels,
-                device=self.input_device,
-                dtype='float32'
-            )
-            sd.wait()
+            audio = self.backend.record(int(duration * self.sample_rate), self.sample_rate,
+                                        self.channels, self.input_device, dtype='float32')
 
             print("✓ Recording complete")
 
@@ -348,10 +670,7 @@ class AudioManager:
                 response = input("\nPlay back recording? [y/n]: ").strip().lower()
                 if response in ['y', 'yes']:
                     print("\n🔊 Playing back your recording...")
-                    # Wait 100ms for Bluetooth device latency
-                    time.sleep(0.1)
-                    sd.play(audio, self.sample_rate, device=self.output_device)
-                    sd.wait()
+                    self.backend.play(audio, self.sample_rate, self.output_device)
                     print("✓ Playback complete")
 
             print("\n✓ Microphone test complete")
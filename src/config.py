@@ -5,6 +5,16 @@ OLLAMA_URL = "http://localhost:11434"  # Default to local Ollama instance
 OLLAMA_MODEL = "gemma3:4b"  # Change to your preferred model (e.g., llama3, mistral, etc.)
 PROMPT_OLLAMA_URL_SELECTION = True  # Prompt user to configure Ollama URL on startup
 PROMPT_MODEL_SELECTION = True  # Prompt user to select Ollama model on startup
+OLLAMA_POOL_SIZE = 4  # Keep-alive connections kept open to the Ollama server
+OLLAMA_CONNECT_TIMEOUT = 5  # Seconds to establish a connection
+OLLAMA_READ_TIMEOUT = 60  # Seconds to wait for data from Ollama (per read, not per response)
+OLLAMA_MAX_RETRIES = 3  # Connection attempts retried before giving up
+OLLAMA_RETRY_BACKOFF = 0.5  # Backoff factor between connection retries (0.5s, 1s, 2s, ...)
+OLLAMA_KEEP_ALIVE = "30m"  # How long Ollama keeps the model loaded after a request ("5m", "1h", -1 = forever)
+OLLAMA_WARM_UP = True  # Load the model into Ollama's memory at startup, while Vosk loads
+OLLAMA_COLD_LOAD_THRESHOLD = 1.0  # Seconds of model load time reported as a cold start
+OLLAMA_SYSTEM_PROMPT = None  # Fixed system prompt sent first with every request (None for the model's default)
+OLLAMA_NUM_CTX = 4096  # Context window requested from Ollama in tokens (None = server default); sizes the history budget
 
 # Audio Configuration
 SAMPLE_RATE = 16000  # Vosk works best with 16kHz
@@ -12,6 +22,15 @@ CHANNELS = 1  # Mono audio
 CHUNK_SIZE = 4000  # Audio chunk size for processing
 PROMPT_DEVICE_SELECTION = True  # Prompt user to select audio devices on startup
 PROMPT_DEVICE_TEST = True  # Prompt user to test audio devices after selection
+AUDIO_BUFFER_DURATION = 10.0  # Seconds of captured audio kept in the shared ring buffer
+CAPTURE_BLOCK_DURATION = 0.05  # Seconds per block delivered by the capture stream
+PRE_ROLL_DURATION = 0.3  # Seconds before the end of the listening beep replayed into STT (never reaches into the wake word)
+AUDIO_MAX_BACKLOG = 2.0  # Seconds of audio recognition may fall behind before old audio is dropped
+AUDIO_BACKLOG_POLICY = "coalesce"  # "coalesce" (merge pending blocks) or "drop_oldest"
+AUDIO_BACKEND = "sounddevice"  # "sounddevice" (microphone/speakers), "replay" (WAV files as input) or "null" (silence)
+AUDIO_REPLAY_FILES = []  # WAV files the "replay" backend feeds in as microphone input, in order
+AUDIO_REPLAY_SPEED = 1.0  # Replay pace relative to real time (e.g. 10 = ten times faster, 0 = as fast as possible)
+AUDIO_REPLAY_GAP = 1.5  # Seconds of silence replayed after each file so the endpointer sees the speaker stop
 
 # Wake Word Configuration
 WAKE_WORD = "computer"  # Simple, single word that's easy to recognize
@@ -22,6 +41,28 @@ WAKE_WORD = "computer"  # Simple, single word that's easy to recognize
 # - "hello" (may trigger more easily)
 # Avoid: Made-up words like "lamma" are harder for Vosk to recognize
 WAKE_WORD_THRESHOLD = 0.7  # Confidence threshold for wake word detection (not used with current matching)
+WAKE_WORD_USE_GRAMMAR = True  # Decode wake word audio against a tiny grammar instead of the full vocabulary
+# Note: grammar mode needs a model with a dynamic graph (the small Vosk models) and a wake word
+# made of words in the model's vocabulary; otherwise set this to False
+
+# Voice Activity Detection (skips silence before it reaches Vosk)
+VAD_ENABLED = True  # Only decode audio that contains speech while waiting for the wake word
+VAD_FRAME_DURATION = 0.02  # Seconds per analysis frame
+VAD_ENERGY_RATIO = 3.0  # Speech must be this many times louder than the background noise floor
+VAD_MIN_ENERGY = 300  # Minimum RMS level (16-bit scale) ever treated as speech
+VAD_HANGOVER = 0.5  # Seconds of audio still decoded after speech stops
+VAD_RESET_SILENCE = 5.0  # Seconds of silence after which the recognizer is reset
+
+# Endpointing (deciding when the user has finished speaking)
+STT_CHUNK_DURATION = 0.1  # Seconds per chunk while listening to a request (endpoint resolution)
+ENDPOINT_MODE = "command"  # "command" for short requests, "dictation" for long speech with pauses
+ENDPOINT_THRESHOLDS = {
+    # trailing_silence: seconds without speech (VAD) before the turn ends
+    # stable_partials: chunks with an unchanged partial result before the turn ends
+    # final_silence: seconds of silence after a Vosk final result (None = ignore final results)
+    "command": {"trailing_silence": 0.7, "stable_partials": 3, "final_silence": 0.2},
+    "dictation": {"trailing_silence": 1.5, "stable_partials": 8, "final_silence": None},
+}
 
 # Vosk Model Path (download required)
 # Download small model from: https://alphacephei.com/vosk/models
@@ -36,11 +77,17 @@ BLUETOOTH_MAC_ADDRESS = None  # e.g., "XX:XX:XX:XX:XX:XX" or None
 
 # Session Configuration
 SESSION_TIMEOUT = 300  # Seconds of inactivity before ending session (5 minutes)
-MAX_CONTEXT_MESSAGES = 10  # Maximum conversation history to maintain
+CONTEXT_RESPONSE_RESERVE = 512  # Tokens of the context window kept free for the answer (the rest holds history)
+CONTEXT_EVICTION_TARGET = 0.6  # Once over budget, history is cut to this fraction of it (big, rare evictions keep Ollama's prompt cache valid)
+CONTEXT_SUMMARY_ENABLED = False  # Fold exchanges trimmed from the history into a rolling summary (extra background request)
+CONTEXT_SUMMARY_MAX_TOKENS = 200  # Longest summary kept
+MAX_WEB_SESSIONS = 100  # Web mode: most concurrent browser sessions kept (least recently used is dropped)
 
 # Beep Sound Configuration
 BEEP_FREQUENCY = 1000  # Hz
 BEEP_DURATION = 0.2  # Seconds
+BEEP_ECHO_TAIL = 0.1  # Seconds after the beep during which the microphone may still pick it up
+BEEP_NOTCH_Q = 10  # Quality factor of the notch filtering the beep tone out of captured audio
 
 # Web Server SSL/HTTPS Configuration
 USE_HTTPS = False  # Set to True to enable HTTPS
@@ -50,3 +97,27 @@ SSL_KEY_FILE = "key.pem"  # Path to SSL private key file
 # Production Server Configuration
 USE_PRODUCTION_SERVER = True  # Use Waitress (production) instead of Flask dev server
 PRODUCTION_THREADS = 4  # Number of worker threads for production server
+TTS_WORKERS = 2  # Speech synthesis worker processes (each owns one TTS engine)
+
+# TTS Audio Cache
+TTS_CACHE_ENABLED = True  # Reuse synthesized audio for repeated phrases and answers
+TTS_CACHE_MAX_BYTES = 16 * 1024 * 1024  # Memory budget for cached audio
+TTS_CACHE_DIR = None  # Directory for audio evicted from memory (e.g. "cache/tts"), None to disable
+
+# Web Streaming (WebSocket endpoint for live audio in, tokens and audio out)
+WEB_STREAM_ENABLED = True  # Stream partial transcripts, tokens and sentence audio to the browser
+WEB_STREAM_PORT = 5001  # Port of the WebSocket endpoint (next to the web server port)
+STREAM_MAX_UTTERANCE = 15.0  # Seconds after which a streamed utterance is ended
+STREAM_MAX_MESSAGE_SIZE = 1024 * 1024  # Largest WebSocket message accepted from a client (bytes)
+
+# Web Response Audio
+RESPONSE_AUDIO_TTL = 60  # Seconds synthesized response audio waits for the browser to fetch it
+RESPONSE_AUDIO_MAX_ENTRIES = 32  # Maximum unfetched responses kept in memory
+
+# Latency Tracing
+TRACING_ENABLED = False  # Time each stage of every turn (wake word to end of playback)
+TRACE_FILE = None  # File to append one JSON line per turn to (e.g. "logs/traces.jsonl"), None to disable
+TRACE_WINDOW = 500  # Recent turns used for the p50/p95/p99 latency report
+
+# Metrics
+METRICS_ENABLED = True  # Serve request, STT, Ollama and TTS metrics at /metrics (Prometheus text format)
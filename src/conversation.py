@@ -0,0 +1,209 @@
+"""
+Conversation Context - Chat history kept within a token budget
+"""
+
+import threading
+from collections import deque
+from typing import Callable, Deque, Dict, Iterator, List, Optional, Tuple
+from . import config
+
+CHARS_PER_TOKEN = 4  # Rough English average for the tokenizers of common local models
+MESSAGE_OVERHEAD = 4  # Tokens the chat template adds around each message (role, separators)
+
+SUMMARY_PREFIX = "Summary of the earlier conversation: "
+
+# Folds evicted messages into the running summary: (previous summary, evicted messages) -> new summary
+Summarizer = Callable[[str, List[Dict[str, str]]], str]
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Estimate the prompt tokens a message takes
+
+    Args:
+        text: Message content
+
+    Returns:
+        Approximate token count, including the chat template overhead
+    """
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN + MESSAGE_OVERHEAD
+
+
+class ConversationContext:
+    """
+    Chat history trimmed to a token budget
+
+    Each message's token estimate is computed once when it is added, and a
+    running total is kept, so checking the budget is O(1) and trimming
+    only pops the oldest messages off a deque. Messages are evicted a whole
+    exchange (user question and assistant answer) at a time.
+
+    History is append-only between trims, and a trim evicts down to a
+    target well below the budget, so the start of the prompt only changes
+    once every several turns. Ollama reuses its KV cache for an unchanged
+    prompt prefix, so the turns in between only evaluate the new messages.
+
+    With a summarizer, evicted exchanges are folded into a rolling summary
+    on a background thread; the summary is sent ahead of the remaining
+    messages as a system message. It is swapped in when ready, so each
+    block eviction costs the prefix cache at most one more miss.
+    """
+
+    def __init__(self):
+        self._messages: Deque[Tuple[Dict[str, str], int]] = deque()
+        self._tokens = 0  # Sum of the message estimates
+        self._lock = threading.Lock()  # Guards the summary, which the background thread updates
+
+        self.summary = ""
+        self._summary_tokens = 0
+        self._evicted: List[Dict[str, str]] = []  # Waiting to be folded into the summary
+        self._summary_thread: Optional[threading.Thread] = None
+        self._summarizing = False
+        self._generation = 0  # Bumped by clear() so a running summary of the old conversation is discarded
+
+        # Statistics
+        self.evicted_messages = 0
+        self.summaries = 0
+
+    def append(self, message: Dict[str, str]):
+        """
+        Add a message (a {"role", "content"} dictionary) at the end
+
+        Args:
+            message: Message to add
+        """
+        tokens = estimate_tokens(message.get("content", ""))
+        self._messages.append((message, tokens))
+        self._tokens += tokens
+
+    def add(self, role: str, content: str):
+        """Add a message with the given role and content"""
+        self.append({"role": role, "content": content})
+
+    @property
+    def tokens(self) -> int:
+        """Estimated prompt tokens of the whole context, summary included"""
+        return self._tokens + self._summary_tokens
+
+    def trim(self, budget: int, summarizer: Optional[Summarizer] = None, target: Optional[int] = None) -> int:
+        """
+        Evict the oldest exchanges once the context exceeds the budget
+
+        The newest message is always kept, even if it alone exceeds the budget.
+
+        Args:
+            budget: Maximum estimated tokens
+            summarizer: Folds evicted messages into the summary (None to just drop them)
+            target: Tokens to evict down to once over budget (defaults to the budget).
+                    Lower targets evict bigger blocks, less often.
+
+        Returns:
+            Number of messages evicted
+        """
+        if self.tokens <= budget:
+            return 0
+
+        target = budget if target is None else min(target, budget)
+        evicted = []
+        while self.tokens > target and len(self._messages) > 1:
+            message, tokens = self._messages.popleft()
+            self._tokens -= tokens
+            evicted.append(message)
+
+            # Don't leave an answer behind without its question
+            if len(self._messages) > 1 and self._messages[0][0].get("role") == "assistant":
+                message, tokens = self._messages.popleft()
+                self._tokens -= tokens
+                evicted.append(message)
+
+        if evicted:
+            self.evicted_messages += len(evicted)
+            if summarizer is not None:
+                self._summarize(evicted, summarizer, budget)
+        return len(evicted)
+
+    def _summarize(self, evicted: List[Dict[str, str]], summarizer: Summarizer, budget: int):
+        """Queue evicted messages and start a background summary if none is running"""
+        with self._lock:
+            self._evicted.extend(evicted)
+            if self._summarizing:
+                return  # The running summary picks these up when it finishes
+            self._summarizing = True
+            self._summary_thread = threading.Thread(target=self._summary_worker, args=(summarizer, budget),
+                                                    name="context-summary", daemon=True)
+            self._summary_thread.start()
+
+    def _summary_worker(self, summarizer: Summarizer, budget: int):
+        """Fold queued messages into the summary until none are left"""
+        # Never let the summary take more than a fraction of the context
+        max_tokens = min(config.CONTEXT_SUMMARY_MAX_TOKENS, budget // 4)
+        while True:
+            with self._lock:
+                if not self._evicted:
+                    self._summarizing = False
+                    return
+                evicted, self._evicted = self._evicted, []
+                previous = self.summary
+                generation = self._generation
+
+            try:
+                summary = summarizer(previous, evicted).strip()
+            except Exception as e:
+                print(f"⚠ Could not summarize earlier conversation: {e}")
+                continue
+
+            # Hard limit in case the model ignored the requested length
+            max_chars = max(0, (max_tokens - MESSAGE_OVERHEAD) * CHARS_PER_TOKEN - len(SUMMARY_PREFIX))
+            if len(summary) > max_chars:
+                summary = summary[:max_chars].rsplit(' ', 1)[0]
+
+            with self._lock:
+                if generation != self._generation:
+                    continue
+                self.summary = summary
+                self._summary_tokens = estimate_tokens(SUMMARY_PREFIX + summary) if summary else 0
+                self.summaries += 1
+
+    def wait_for_summary(self, timeout: float = None) -> bool:
+        """
+        Wait for a background summary to finish
+
+        Returns:
+            True if no summary is still being generated
+        """
+        thread = self._summary_thread
+        if thread is not None:
+            thread.join(timeout)
+            return not thread.is_alive()
+        return True
+
+    def messages(self) -> List[Dict[str, str]]:
+        """
+        Get the messages to send, summary first
+
+        Returns:
+            New list of message dictionaries
+        """
+        with self._lock:
+            summary = self.summary
+        prefix = [{"role": "system", "content": SUMMARY_PREFIX + summary}] if summary else []
+        return prefix + [message for message, _ in self._messages]
+
+    def clear(self):
+        """Forget the conversation, including the summary"""
+        with self._lock:
+            self._messages.clear()
+            self._tokens = 0
+            self.summary = ""
+            self._summary_tokens = 0
+            self._evicted = []
+            self._generation += 1
+
+    def __len__(self) -> int:
+        return len(self._messages)
+
+    def __getitem__(self, index: int) -> Dict[str, str]:
+        return self._messages[index][0]
+
+    def __iter__(self) -> Iterator[Dict[str, str]]:
+        return (message for message, _ in self._messages)
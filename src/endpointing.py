@@ -0,0 +1,167 @@
+"""
+Endpointing - Decides when the user has finished speaking
+"""
+
+from abc import ABC, abstractmethod
+from typing import Optional
+from . import config
+
+# Marks an argument that should fall back to the mode's configured value
+_MODE_DEFAULT = object()
+
+
+class Endpointer(ABC):
+    """
+    Base endpointer
+
+    listen_for_speech() calls update() once per audio chunk; an endpointer
+    returns True when the utterance is complete. Subclasses implement
+    _check() and may use the shared bookkeeping done here.
+    """
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        """Prepare for a new utterance"""
+        self.elapsed = 0.0
+        self.last_speech_time = 0.0
+        self.heard_text = False
+        self.reason: Optional[str] = None
+        self.endpoint_delay: Optional[float] = None
+
+    def update(self, chunk_duration: float, is_speech: bool, partial_text: str, final_text: str) -> bool:
+        """
+        Process one chunk of recognition results
+
+        Args:
+            chunk_duration: Length of the chunk in seconds
+            is_speech: Whether the VAD found speech in the chunk
+            partial_text: Vosk partial result for the chunk (may be empty)
+            final_text: Vosk final result for the chunk (may be empty)
+
+        Returns:
+            True when the utterance has ended
+        """
+        self.elapsed += chunk_duration
+        if is_speech:
+            self.last_speech_time = self.elapsed
+        if partial_text or final_text:
+            self.heard_text = True
+
+        reason = self._check(chunk_duration, is_speech, partial_text, final_text)
+        if reason is None:
+            return False
+
+        self.reason = reason
+        self.endpoint_delay = self.elapsed - self.last_speech_time
+        return True
+
+    @abstractmethod
+    def _check(self, chunk_duration: float, is_speech: bool, partial_text: str,
+               final_text: str) -> Optional[str]:
+        """Return the endpoint reason, or None to keep listening"""
+
+
+class SilenceEndpointer(Endpointer):
+    """Original behaviour: stop after a fixed time without new recognized text"""
+
+    def __init__(self, silence_threshold: float = 2.0):
+        self.silence_threshold = silence_threshold
+        super().__init__()
+
+    def update(self, chunk_duration, is_speech, partial_text, final_text):
+        # Speech time is measured from recognized text, not from the VAD
+        return super().update(chunk_duration, bool(partial_text or final_text), partial_text, final_text)
+
+    def _check(self, chunk_duration, is_speech, partial_text, final_text):
+        if self.heard_text and self.elapsed - self.last_speech_time >= self.silence_threshold:
+            return "silence"
+        return None
+
+
+class SmartEndpointer(Endpointer):
+    """
+    Combines VAD trailing silence, partial-result stability and Vosk final results
+
+    - trailing_silence: the VAD has heard no speech for this many seconds
+    - stable_partials: the partial result has not changed for this many chunks
+      and the last chunk was quiet; after three times as many chunks it ends
+      the utterance even if the VAD is still triggered by background noise.
+      Only applies once the turn is trailing_silence old, so a stray early
+      partial (e.g. the end of the wake word) can't end the turn before the
+      user has started their request
+    - final_silence: Vosk emitted a final result and the VAD has been quiet
+      this long (None disables it, e.g. for dictation with pauses)
+    """
+
+    def __init__(self, mode: str = None, trailing_silence: float = None, stable_partials: int = None,
+                 final_silence=_MODE_DEFAULT):
+        """
+        Initialize endpointer
+
+        Args:
+            mode: "command" or "dictation" (uses config if not provided)
+            trailing_silence: Override the mode's trailing silence in seconds
+            stable_partials: Override the mode's stable partial count
+            final_silence: Override the mode's final-result silence (None disables)
+        """
+        self.mode = mode or config.ENDPOINT_MODE
+        thresholds = config.ENDPOINT_THRESHOLDS[self.mode]
+        self.trailing_silence = thresholds['trailing_silence'] if trailing_silence is None else trailing_silence
+        self.stable_partials = thresholds['stable_partials'] if stable_partials is None else stable_partials
+        self.final_silence = thresholds['final_silence'] if final_silence is _MODE_DEFAULT else final_silence
+        super().__init__()
+
+    def reset(self):
+        super().reset()
+        self.last_partial = ""
+        self.stable_count = 0
+        self.have_final = False
+
+    def _check(self, chunk_duration, is_speech, partial_text, final_text):
+        # A changed partial also counts as speech, in case the VAD missed a quiet speaker
+        # (final results arrive after Vosk's own trailing silence, so they don't)
+        if final_text:
+            self.have_final = True
+            self.last_partial = ""
+            self.stable_count = 0
+        elif partial_text and partial_text != self.last_partial:
+            self.last_partial = partial_text
+            self.stable_count = 0
+            self.last_speech_time = self.elapsed
+        elif self.heard_text:
+            self.stable_count += 1
+
+        if not self.heard_text:
+            return None
+
+        silence = self.elapsed - self.last_speech_time
+
+        if self.final_silence is not None and self.have_final and silence >= self.final_silence:
+            return "final result"
+        if silence >= self.trailing_silence:
+            return "trailing silence"
+        if self.elapsed < self.trailing_silence:
+            return None
+        if self.stable_count >= self.stable_partials and not is_speech:
+            return "stable partial"
+        if self.stable_count >= 3 * self.stable_partials:
+            return "stable partial"
+        return None
+
+
+def create_endpointer(mode: str = None, silence_threshold: float = None) -> Endpointer:
+    """
+    Create the configured endpointer
+
+    Args:
+        mode: "command" or "dictation" (uses config if not provided)
+        silence_threshold: If given, use the legacy fixed silence timeout instead
+
+    Returns:
+        Endpointer instance
+    """
+    if silence_threshold is not None:
+        return SilenceEndpointer(silence_threshold)
+    return SmartEndpointer(mode)
@@ -0,0 +1,504 @@
+"""
+Fake Ollama - Local stand-in for the Ollama API for offline load and latency testing
+
+Implements /api/tags, /api/show, /api/chat and /api/generate (streaming and not) with
+configurable time to first token, generation speed, model load delay and
+error injection, so the assistant and web server can be exercised
+deterministically without a model or GPU. Like Ollama, it keeps the last
+prompt (and answer) of each model and only evaluates the part of the next
+prompt that doesn't share its prefix, reported as prompt_eval_count.
+
+Usage:
+    python -m src.fake_ollama
+    python -m src.fake_ollama --port 11434 --first-token 0.3 --tokens-per-second 20 --load-delay 2
+    python -m src.fake_ollama --echo --error-rate 0.05 --seed 1
+"""
+
+import argparse
+import json
+import random
+import re
+import sys
+import threading
+import time
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+DEFAULT_PORT = 11434  # Ollama's own port
+DEFAULT_REPLY = ("This is a reply from the fake Ollama server. "
+                 "It speaks in complete sentences, so each one can be spoken as soon as it arrives.")
+
+
+def parse_keep_alive(value) -> Optional[float]:
+    """
+    Convert an Ollama keep_alive value to seconds
+
+    Args:
+        value: Seconds as a number, or a duration like "30m", "1h", "45s"
+
+    Returns:
+        Seconds to keep the model loaded, or None to keep it forever (negative values)
+    """
+    if value is None:
+        return 300.0  # Ollama's default
+    if isinstance(value, (int, float)):
+        seconds = float(value)
+    else:
+        match = re.fullmatch(r'\s*(-?\d+(?:\.\d+)?)\s*(ms|s|m|h)?\s*', str(value))
+        if not match:
+            return 300.0
+        seconds = float(match.group(1)) * {'ms': 0.001, 's': 1, 'm': 60, 'h': 3600, None: 1}[match.group(2)]
+    return None if seconds < 0 else seconds
+
+
+def split_tokens(text: str) -> List[str]:
+    """Split text into word tokens, keeping the whitespace that follows each one"""
+    return re.findall(r'\S+\s*', text)
+
+
+def render_prompt(messages: List[dict]) -> List[str]:
+    """
+    Turn messages into prompt tokens the way a chat template would
+
+    Tokens are four characters of text each, plus four per message for the
+    template (the same rule the assistant uses to estimate prompt size).
+
+    Args:
+        messages: Chat messages
+
+    Returns:
+        Prompt tokens
+    """
+    tokens = []
+    for message in messages:
+        content = str(message.get('content', ''))
+        tokens += ['<start>', message.get('role', 'user'), '<sep>']
+        tokens += [content[i:i + 4] for i in range(0, len(content), 4)]
+        tokens.append('<end>')
+    return tokens
+
+
+class FakeOllama:
+    """
+    Behavior of the fake server, independent of HTTP
+
+    Timing follows a real model: a request to a model that isn't loaded
+    first waits load_delay, then evaluates the prompt tokens that aren't in
+    its prefix cache at prompt_tokens_per_second, then waits first_token
+    before the first token, then one token every 1/tokens_per_second.
+    keep_alive is honored, so cold loads can be reproduced by letting a
+    model expire (which also empties its prefix cache).
+    """
+
+    def __init__(self, models: Sequence[str] = ("gemma3",), first_token: float = 0.0,
+                 tokens_per_second: float = 0.0, load_delay: float = 0.0, error_rate: float = 0.0,
+                 reply: str = DEFAULT_REPLY, replies: Optional[Sequence[str]] = None, echo: bool = False,
+                 seed: Optional[int] = None, context_length: int = 8192,
+                 prompt_tokens_per_second: float = 0.0):
+        """
+        Initialize fake
+
+        Args:
+            models: Model names reported by /api/tags (any name is accepted)
+            first_token: Seconds from request (after loading) to the first token
+            tokens_per_second: Generation speed (0 for instant)
+            load_delay: Seconds to "load" a model that isn't loaded
+            error_rate: Probability (0-1) that a request fails with HTTP 500
+            reply: Text of every answer
+            replies: Answers used in turn instead of reply (canned conversation)
+            echo: Answer with the last user message instead
+            seed: Random seed for repeatable error injection
+            context_length: Context length reported by /api/show
+            prompt_tokens_per_second: Prompt evaluation speed for uncached tokens (0 for instant)
+        """
+        self.models = list(models)
+        self.first_token = first_token
+        self.tokens_per_second = tokens_per_second
+        self.load_delay = load_delay
+        self.error_rate = error_rate
+        self.reply = reply
+        self.replies = list(replies) if replies else None
+        self.echo = echo
+        self.context_length = context_length
+        self.prompt_tokens_per_second = prompt_tokens_per_second
+
+        self._lock = threading.Lock()
+        self._random = random.Random(seed)
+        self._loaded: Dict[str, Tuple[float, Optional[float]]] = {}  # Model -> (ready at, unload at or None)
+        self._reply_index = 0
+        self._prefix_cache: Dict[str, List[str]] = {}  # Model -> tokens of the last prompt and its answer
+
+        # Statistics
+        self.requests = 0
+        self.errors = 0
+        self.loads = 0
+        self.prompt_tokens_evaluated = 0
+        self.prompt_tokens_reused = 0
+
+    def should_fail(self) -> bool:
+        """Count a request and decide whether to inject an error"""
+        with self._lock:
+            self.requests += 1
+            fail = self.error_rate > 0 and self._random.random() < self.error_rate
+            if fail:
+                self.errors += 1
+            return fail
+
+    def load(self, model: str, keep_alive) -> float:
+        """
+        Make sure a model is loaded
+
+        Args:
+            model: Model name
+            keep_alive: keep_alive value from the request
+
+        Returns:
+            Seconds spent waiting for the model to load (0 if it was loaded)
+        """
+        now = time.monotonic()
+        keep_seconds = parse_keep_alive(keep_alive)
+        with self._lock:
+            state = self._loaded.get(model)
+            if state is None or (state[1] is not None and state[1] <= now):
+                ready_at = now + self.load_delay
+                self.loads += 1
+                self._prefix_cache.pop(model, None)
+            else:
+                ready_at = state[0]  # Loaded, or still loading for another request
+
+            # keep_alive counts from this request (0 unloads it right away)
+            unload_at = None if keep_seconds is None else max(ready_at, now) + keep_seconds
+            self._loaded[model] = (ready_at, unload_at)
+
+        wait = max(0.0, ready_at - now)
+        if wait:
+            time.sleep(wait)
+        return wait
+
+    def answer(self, messages: List[dict]) -> str:
+        """Text of the answer to a conversation"""
+        if self.echo:
+            users = [message.get('content', '') for message in messages if message.get('role') == 'user']
+            return users[-1] if users else ''
+        if self.replies:
+            with self._lock:
+                text = self.replies[self._reply_index % len(self.replies)]
+                self._reply_index += 1
+            return text
+        return self.reply
+
+    def generate(self, text: str) -> Iterator[str]:
+        """
+        Yield the answer token by token at the configured pace
+
+        Args:
+            text: Answer text
+
+        Yields:
+            Tokens (words with their trailing whitespace)
+        """
+        if self.first_token:
+            time.sleep(self.first_token)
+
+        interval = 1.0 / self.tokens_per_second if self.tokens_per_second else 0.0
+        started = time.perf_counter()
+        tokens = split_tokens(text)
+        for index, token in enumerate(tokens):
+            if interval and index:
+                # Pace against the start time so sleep overshoot doesn't accumulate
+                delay = started + index * interval - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+            yield token
+
+    def evaluate_prompt(self, model: str, messages: List[dict], answer: str) -> int:
+        """
+        Evaluate a prompt against the model's prefix cache
+
+        Only the tokens after the longest prefix shared with the previous
+        prompt and answer are evaluated (at least the last one, as Ollama
+        does). The cache then holds this prompt followed by its answer.
+
+        Args:
+            model: Model name
+            messages: Chat messages of the request
+            answer: Answer that will be generated
+
+        Returns:
+            Number of prompt tokens evaluated (prompt_eval_count)
+        """
+        tokens = render_prompt(messages)
+        with self._lock:
+            cached = self._prefix_cache.get(model, [])
+            limit = min(len(cached), len(tokens) - 1)
+            reused = 0
+            while reused < limit and cached[reused] == tokens[reused]:
+                reused += 1
+            self._prefix_cache[model] = tokens + render_prompt([{'role': 'assistant', 'content': answer}])
+            self.prompt_tokens_evaluated += len(tokens) - reused
+            self.prompt_tokens_reused += reused
+
+        evaluated = len(tokens) - reused
+        if self.prompt_tokens_per_second:
+            time.sleep(evaluated / self.prompt_tokens_per_second)
+        return evaluated
+
+    def get_stats(self) -> dict:
+        """
+        Get server statistics
+
+        Returns:
+            Dictionary with request, injected error, model load and prompt token counts
+        """
+        with self._lock:
+            return {'requests': self.requests, 'errors': self.errors, 'loads': self.loads,
+                    'prompt_tokens_evaluated': self.prompt_tokens_evaluated,
+                    'prompt_tokens_reused': self.prompt_tokens_reused}
+
+
+class _FakeOllamaHandler(BaseHTTPRequestHandler):
+    """HTTP side of the fake server (self.server.fake holds the behavior)"""
+
+    protocol_version = "HTTP/1.1"  # Keep-alive, like Ollama
+    disable_nagle_algorithm = True  # Streamed lines go out as soon as they are written
+
+    def log_message(self, format, *args):
+        pass
+
+    def handle(self):
+        try:
+            super().handle()
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # Client gave up (e.g. hit its read timeout) before the answer was sent
+
+    def _send_json(self, status: int, body: dict):
+        data = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _read_json(self) -> dict:
+        length = int(self.headers.get('Content-Length', 0))
+        return json.loads(self.rfile.read(length) or b'{}') if length else {}
+
+    def do_GET(self):
+        fake: FakeOllama = self.server.fake
+        if self.path.rstrip('/') == '/api/tags':
+            modified = datetime.now(timezone.utc).isoformat()
+            self._send_json(200, {'models': [
+                {'name': name, 'model': name, 'modified_at': modified, 'size': 0, 'details': {}}
+                for name in fake.models
+            ]})
+        elif self.path in ('', '/'):
+            body = b'Ollama is running'
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/plain; charset=utf-8')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        else:
+            self._send_json(404, {'error': 'not found'})
+
+    def do_POST(self):
+        fake: FakeOllama = self.server.fake
+        path = self.path.rstrip('/')
+
+        # Always consume the body, or it would be read as the next request on this connection
+        try:
+            request = self._read_json()
+        except ValueError:
+            self._send_json(400, {'error': 'invalid JSON'})
+            return
+
+        if path == '/api/show':
+            self._send_json(200, {'details': {'family': 'fake'},
+                                  'model_info': {'fake.context_length': fake.context_length}})
+            return
+        if path not in ('/api/chat', '/api/generate'):
+            self._send_json(404, {'error': 'not found'})
+            return
+
+        model = request.get('model')
+        if not model:
+            self._send_json(400, {'error': 'model is required'})
+            return
+        if fake.should_fail():
+            self._send_json(500, {'error': 'injected failure'})
+            return
+
+        started = time.perf_counter()
+        load_seconds = fake.load(model, request.get('keep_alive'))
+
+        if path == '/api/chat':
+            messages = request.get('messages') or []
+        else:
+            prompt = request.get('prompt')
+            if not prompt:
+                # No prompt: Ollama only loads the model
+                self._send_json(200, self._final(model, started, load_seconds, 0, 0.0, 0, 0.0,
+                                                 {'response': '', 'done_reason': 'load'}))
+                return
+            messages = [{'role': 'user', 'content': prompt}]
+
+        text = fake.answer(messages)
+        evaluating = time.perf_counter()
+        prompt = (fake.evaluate_prompt(model, messages, text), time.perf_counter() - evaluating)
+
+        if request.get('stream', True):
+            self._stream(path, model, started, load_seconds, prompt, text)
+        else:
+            generating = time.perf_counter()
+            count = sum(1 for _ in fake.generate(text))
+            extra = ({'message': {'role': 'assistant', 'content': text}} if path == '/api/chat'
+                     else {'response': text})
+            self._send_json(200, self._final(model, started, load_seconds, *prompt, count,
+                                             time.perf_counter() - generating, extra))
+
+    def _stream(self, path: str, model: str, started: float, load_seconds: float,
+                prompt: Tuple[int, float], text: str):
+        """Send the answer as NDJSON lines with chunked transfer encoding, like Ollama"""
+        fake: FakeOllama = self.server.fake
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/x-ndjson')
+        self.send_header('Transfer-Encoding', 'chunked')
+        self.end_headers()
+
+        def send_line(body: dict):
+            data = json.dumps(body).encode() + b'\n'
+            self.wfile.write(f"{len(data):x}\r\n".encode() + data + b"\r\n")
+
+        created = datetime.now(timezone.utc).isoformat()
+        generating = time.perf_counter()
+        count = 0
+        for token in fake.generate(text):
+            count += 1
+            piece = ({'message': {'role': 'assistant', 'content': token}} if path == '/api/chat'
+                     else {'response': token})
+            send_line(dict(piece, model=model, created_at=created, done=False))
+
+        empty = ({'message': {'role': 'assistant', 'content': ''}} if path == '/api/chat'
+                 else {'response': ''})
+        send_line(self._final(model, started, load_seconds, *prompt, count,
+                              time.perf_counter() - generating, empty))
+        self.wfile.write(b"0\r\n\r\n")
+
+    @staticmethod
+    def _final(model: str, started: float, load_seconds: float, prompt_tokens: int, prompt_seconds: float,
+               eval_count: int, eval_seconds: float, extra: dict) -> dict:
+        """Last response object, with Ollama's timing fields (nanoseconds)"""
+        body = {
+            'model': model,
+            'created_at': datetime.now(timezone.utc).isoformat(),
+            'done': True,
+            'done_reason': 'stop',
+            'total_duration': int((time.perf_counter() - started) * 1e9),
+            'load_duration': int(load_seconds * 1e9),
+            'prompt_eval_count': prompt_tokens,
+            'prompt_eval_duration': int(prompt_seconds * 1e9),
+            'eval_count': eval_count,
+            'eval_duration': int(eval_seconds * 1e9)
+        }
+        body.update(extra)
+        return body
+
+
+class FakeOllamaServer:
+    """
+    HTTP server around a FakeOllama
+
+    Use start()/stop() or a with block to run it on a background thread
+    (tests, benchmarks), or serve_forever() from the command line.
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, **behavior):
+        """
+        Initialize server
+
+        Args:
+            host: Host to bind to
+            port: Port to listen on (0 picks a free port)
+            **behavior: FakeOllama options (first_token, tokens_per_second, ...)
+        """
+        self.fake = FakeOllama(**behavior)
+        self._server = ThreadingHTTPServer((host, port), _FakeOllamaHandler)
+        self._server.daemon_threads = True
+        self._server.fake = self.fake
+        self.host, self.port = self._server.server_address[:2]
+        self.base_url = f"http://{self.host}:{self.port}"
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> "FakeOllamaServer":
+        """Serve on a background thread"""
+        self._thread = threading.Thread(target=self._server.serve_forever, name="fake-ollama", daemon=True)
+        self._thread.start()
+        return self
+
+    def serve_forever(self):
+        """Serve on this thread until interrupted"""
+        self._server.serve_forever()
+
+    def stop(self):
+        """Stop serving and close the socket"""
+        if self._thread is not None:
+            self._server.shutdown()
+            self._thread = None
+        self._server.server_close()
+
+    def __enter__(self) -> "FakeOllamaServer":
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+
+def main():
+    """Run the fake server from the command line"""
+    parser = argparse.ArgumentParser(description="Fake Ollama server for offline testing")
+    parser.add_argument('--host', default="127.0.0.1", help="Host to bind to")
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT, help="Port to listen on")
+    parser.add_argument('--models', default="gemma3", help="Comma-separated model names to report")
+    parser.add_argument('--first-token', type=float, default=0.2, help="Seconds to the first token")
+    parser.add_argument('--tokens-per-second', type=float, default=30.0, help="Generation speed (0 = instant)")
+    parser.add_argument('--load-delay', type=float, default=0.0, help="Seconds to load a model that isn't loaded")
+    parser.add_argument('--error-rate', type=float, default=0.0, help="Fraction of requests failing with HTTP 500")
+    parser.add_argument('--reply', default=DEFAULT_REPLY, help="Text of every answer")
+    parser.add_argument('--replies-file', help="File with one canned answer per line, used in turn")
+    parser.add_argument('--echo', action='store_true', help="Answer with the user's message")
+    parser.add_argument('--seed', type=int, help="Random seed for repeatable error injection")
+    parser.add_argument('--context-length', type=int, default=8192, help="Context length reported by /api/show")
+    parser.add_argument('--prompt-tokens-per-second', type=float, default=0.0,
+                        help="Prompt evaluation speed for tokens not in the prefix cache (0 = instant)")
+    args = parser.parse_args()
+
+    replies = None
+    if args.replies_file:
+        with open(args.replies_file, encoding='utf-8') as replies_file:
+            replies = [line.strip() for line in replies_file if line.strip()]
+
+    server = FakeOllamaServer(
+        host=args.host, port=args.port, models=args.models.split(','),
+        first_token=args.first_token, tokens_per_second=args.tokens_per_second,
+        load_delay=args.load_delay, error_rate=args.error_rate,
+        reply=args.reply, replies=replies, echo=args.echo, seed=args.seed,
+        context_length=args.context_length, prompt_tokens_per_second=args.prompt_tokens_per_second
+    )
+
+    print(f"🧪 Fake Ollama on {server.base_url}")
+    print(f"   Models: {', '.join(server.fake.models)}")
+    print(f"   First token: {args.first_token}s, {args.tokens_per_second or 'instant'} tokens/s, "
+          f"load delay: {args.load_delay}s, error rate: {args.error_rate:.0%}")
+    print(f"   Point OLLAMA_URL in src/config.py at it, then start the assistant")
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print(f"\n👋 Stopped after {server.fake.get_stats()['requests']} requests")
+    finally:
+        server.stop()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,273 @@
+"""
+Metrics - Counters, gauges and histograms exported in Prometheus text format
+"""
+
+import math
+import threading
+from bisect import bisect_left
+from typing import Callable, Dict, List, Optional, Sequence, Tuple, Union
+
+# Default histogram buckets (seconds), from a fast cache hit to a slow cold LLM load
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+# Callback result: a single value, or values keyed by label values
+MetricFunction = Callable[[], Union[float, Dict[Tuple[str, ...], float]]]
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return '+Inf'
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ''
+    pairs = []
+    for name, value in zip(names, values):
+        value = str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+        pairs.append(f'{name}="{value}"')
+    return '{' + ','.join(pairs) + '}'
+
+
+class _Metric:
+    """
+    Base class: values are kept in one shard per thread
+
+    A thread only ever writes to its own shard, so recording takes no lock
+    and threads never contend; the shards are summed when metrics are
+    scraped. Shards of threads that have exited are folded into a single
+    retired shard, so threads started per connection don't pile up.
+    """
+
+    kind = 'untyped'
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 function: Optional[MetricFunction] = None):
+        """
+        Initialize metric
+
+        Args:
+            name: Metric name (e.g. "assistant_requests_total")
+            documentation: Help text
+            labelnames: Names of the labels values are recorded with
+            function: Called at scrape time for the value instead of recording
+                      (for counts another component already keeps)
+        """
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.function = function
+        self._local = threading.local()
+        self._shards: List[Tuple[threading.Thread, dict]] = []
+        self._retired: dict = {}
+        self._shards_lock = threading.Lock()  # Only taken by a thread's first write and by scrapes
+
+    def _shard(self) -> dict:
+        """This thread's shard"""
+        shard = getattr(self._local, 'shard', None)
+        if shard is None:
+            shard = self._local.shard = {}
+            with self._shards_lock:
+                self._shards.append((threading.current_thread(), shard))
+        return shard
+
+    def _key(self, labels: Dict[str, str]) -> Tuple[str, ...]:
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def _merge(self, total: dict, shard: dict):
+        """Add one shard's values into total"""
+        for key, value in shard.items():
+            total[key] = total.get(key, 0) + value
+
+    def _collect(self) -> dict:
+        """Values summed over all threads"""
+        if self.function is not None:
+            value = self.function()
+            return value if isinstance(value, dict) else {(): value}
+
+        total = {}
+        with self._shards_lock:
+            live = []
+            for thread, shard in self._shards:
+                if thread.is_alive():
+                    live.append((thread, shard))
+                else:
+                    self._merge(self._retired, shard)
+            self._shards = live
+            self._merge(total, self._retired)
+            for _, shard in live:
+                self._merge(total, shard.copy())
+        return total
+
+    def render(self) -> List[str]:
+        """Lines of the Prometheus text format for this metric"""
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        for key, value in sorted(self._collect().items()):
+            lines.append(f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}")
+        return lines
+
+
+class Counter(_Metric):
+    """Monotonically increasing count"""
+
+    kind = 'counter'
+
+    def inc(self, amount: float = 1, **labels):
+        """
+        Increase the count
+
+        Args:
+            amount: Amount to add (must not be negative)
+            **labels: Value for each label name
+        """
+        shard = self._shard()
+        key = self._key(labels)
+        shard[key] = shard.get(key, 0) + amount
+
+
+class Gauge(_Metric):
+    """Value that can go up and down (usually read with a function at scrape time)"""
+
+    kind = 'gauge'
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 function: Optional[MetricFunction] = None):
+        super().__init__(name, documentation, labelnames, function)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def set(self, value: float, **labels):
+        """Set the current value (last write wins, so there is nothing to shard)"""
+        self._values[self._key(labels)] = value
+
+    def _collect(self) -> dict:
+        if self.function is not None:
+            return super()._collect()
+        return self._values.copy()
+
+
+class Histogram(_Metric):
+    """Distribution of observed values in cumulative buckets"""
+
+    kind = 'histogram'
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        """
+        Initialize histogram
+
+        Args:
+            name: Metric name (e.g. "assistant_stt_real_time_factor")
+            documentation: Help text
+            labelnames: Names of the labels values are recorded with
+            buckets: Upper bounds of the buckets, ascending (+Inf is added)
+        """
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets)) + (math.inf,)
+
+    def observe(self, value: float, **labels):
+        """
+        Record one observation
+
+        Args:
+            value: Observed value
+            **labels: Value for each label name
+        """
+        shard = self._shard()
+        key = self._key(labels)
+        counts = shard.get(key)
+        if counts is None:
+            # One slot per bucket, then the sum of observations
+            counts = shard[key] = [0] * len(self.buckets) + [0.0]
+        counts[bisect_left(self.buckets, value)] += 1
+        counts[-1] += value
+
+    def _merge(self, total: dict, shard: dict):
+        for key, counts in shard.items():
+            counts = list(counts)
+            merged = total.get(key)
+            if merged is None:
+                total[key] = counts
+            else:
+                total[key] = [a + b for a, b in zip(merged, counts)]
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        names = self.labelnames + ('le',)
+        for key, counts in sorted(self._collect().items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets, counts):
+                cumulative += count
+                labels = _format_labels(names, key + (_format_value(bound),))
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            labels = _format_labels(self.labelnames, key)
+            # The count is taken from the buckets so the two always agree
+            lines.append(f"{self.name}_sum{labels} {_format_value(counts[-1])}")
+            lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+
+class MetricsRegistry:
+    """Named metrics of the process, rendered together for a /metrics scrape"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._metrics: Dict[str, _Metric] = {}
+
+    def _get_or_register(self, metric: _Metric) -> _Metric:
+        """
+        Register a metric, or return the one already registered under its name
+
+        Metrics backed by a function always replace the existing one, so an
+        object created again (e.g. a second web server in tests) reports its
+        own state.
+        """
+        with self._lock:
+            existing = self._metrics.get(metric.name)
+            if existing is not None and type(existing) is type(metric) and metric.function is None:
+                return existing
+            self._metrics[metric.name] = metric
+            return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                function: Optional[MetricFunction] = None) -> Counter:
+        """Get or create a counter"""
+        return self._get_or_register(Counter(name, documentation, labelnames, function))
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+              function: Optional[MetricFunction] = None) -> Gauge:
+        """Get or create a gauge"""
+        return self._get_or_register(Gauge(name, documentation, labelnames, function))
+
+    def histogram(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        """Get or create a histogram"""
+        return self._get_or_register(Histogram(name, documentation, labelnames, buckets))
+
+    def render(self) -> str:
+        """
+        Render all metrics
+
+        Returns:
+            Prometheus text exposition format (version 0.0.4)
+        """
+        with self._lock:
+            metrics = sorted(self._metrics.values(), key=lambda metric: metric.name)
+
+        lines = []
+        for metric in metrics:
+            try:
+                lines.extend(metric.render())
+            except Exception as e:
+                # One failing callback shouldn't break the whole scrape
+                print(f"⚠ Could not collect metric {metric.name}: {e}")
+        return '\n'.join(lines) + '\n'
+
+
+# Registry shared by all components of the process
+REGISTRY = MetricsRegistry()
+
+# Content type of the text exposition format
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
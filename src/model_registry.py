@@ -0,0 +1,137 @@
+"""
+Model Registry - Shares loaded Vosk models across components
+"""
+
+import os
+import threading
+import time
+from typing import Dict, List, Optional
+from vosk import Model
+
+
+def _resident_memory() -> Optional[int]:
+    """Current resident set size of this process in bytes, if it can be read"""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, AttributeError):
+        pass
+
+    try:
+        import psutil
+        return psutil.Process().memory_info().rss
+    except Exception:
+        return None
+
+
+def _directory_size(path: str) -> int:
+    """Total size of all files under path in bytes"""
+    total = 0
+    for root, _, files in os.walk(path):
+        for name in files:
+            try:
+                total += os.path.getsize(os.path.join(root, name))
+            except OSError:
+                pass
+    return total
+
+
+class ModelRegistry:
+    """Process-wide cache of refcounted Vosk models keyed by model path"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries: Dict[str, dict] = {}
+
+    def acquire(self, model_path: str) -> Model:
+        """
+        Get a shared model, loading it on first use
+
+        Args:
+            model_path: Path to Vosk model directory
+
+        Returns:
+            Shared vosk.Model instance (call release() when done)
+        """
+        key = os.path.abspath(model_path)
+
+        # Loading happens under the lock so two components never load the same model twice
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                entry['refcount'] += 1
+                print(f"✓ Reusing loaded Vosk model: {model_path} ({entry['refcount']} users)")
+                return entry['model']
+
+            print(f"\n🎤 Loading Vosk model from: {model_path}")
+            rss_before = _resident_memory()
+            start = time.perf_counter()
+            model = Model(model_path)
+            load_time = time.perf_counter() - start
+            rss_after = _resident_memory()
+
+            # RSS growth is the best estimate; fall back to the on-disk size
+            if rss_before is not None and rss_after is not None and rss_after > rss_before:
+                memory_bytes = rss_after - rss_before
+            else:
+                memory_bytes = _directory_size(key)
+
+            self._entries[key] = {
+                'model': model,
+                'path': key,
+                'refcount': 1,
+                'load_time': load_time,
+                'memory_bytes': memory_bytes
+            }
+
+        print(f"✓ Vosk model loaded in {load_time:.2f}s (~{memory_bytes / 1e6:.0f} MB)")
+        return model
+
+    def release(self, model_path: str):
+        """
+        Drop one reference to a model, unloading it when unused
+
+        Args:
+            model_path: Path previously passed to acquire()
+        """
+        key = os.path.abspath(model_path)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return
+
+            entry['refcount'] -= 1
+            if entry['refcount'] <= 0:
+                del self._entries[key]
+
+    def get_stats(self) -> List[dict]:
+        """
+        Get load statistics for every loaded model
+
+        Returns:
+            List of dictionaries with path, refcount, load_time and memory_bytes
+        """
+        with self._lock:
+            return [
+                {k: v for k, v in entry.items() if k != 'model'}
+                for entry in self._entries.values()
+            ]
+
+
+# Default registry shared by the whole process
+_registry = ModelRegistry()
+
+
+def acquire_model(model_path: str) -> Model:
+    """Get a shared Vosk model from the default registry"""
+    return _registry.acquire(model_path)
+
+
+def release_model(model_path: str):
+    """Release a Vosk model obtained from acquire_model()"""
+    _registry.release(model_path)
+
+
+def get_model_stats() -> List[dict]:
+    """Get load statistics from the default registry"""
+    return _registry.get_stats()
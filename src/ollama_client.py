@@ -2,10 +2,80 @@
 Ollama Client - Handles communication with Ollama API
 """
 
+import json
+import threading
+import time
 import requests
-from typing import List, Dict, Optional
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from typing import List, Dict, Optional, Iterator, Tuple
+from .conversation import ConversationContext, estimate_tokens
+from .metrics import REGISTRY
 from . import config
 
+_REQUEST_SECONDS = REGISTRY.histogram(
+    'assistant_ollama_request_seconds', 'Time Ollama spent on a chat request (total_duration)')
+_LOAD_SECONDS = REGISTRY.histogram(
+    'assistant_ollama_load_seconds', 'Time Ollama spent loading the model for a request (load_duration)')
+_TOKENS_PER_SECOND = REGISTRY.histogram(
+    'assistant_ollama_tokens_per_second', 'Generation speed of a chat request',
+    buckets=(1, 2, 5, 10, 20, 30, 50, 75, 100, 150, 200))
+_TOKENS = REGISTRY.counter(
+    'assistant_ollama_tokens_total', 'Tokens evaluated by Ollama', ('kind',))
+_COLD_LOADS = REGISTRY.counter(
+    'assistant_ollama_cold_loads_total', 'Requests that had to load the model first')
+_PROMPT_EVAL_TOKENS = REGISTRY.histogram(
+    'assistant_ollama_prompt_eval_tokens', 'Prompt tokens Ollama evaluated per request (prompt_eval_count; '
+    'tokens reused from its prefix cache are not counted)',
+    buckets=(8, 16, 32, 64, 128, 256, 512, 1024, 2048, 4096, 8192))
+_PROMPT_CACHED_RATIO = REGISTRY.histogram(
+    'assistant_ollama_prompt_cached_ratio', 'Estimated share of the prompt reused from Ollama\'s prefix cache',
+    buckets=(0.1, 0.25, 0.5, 0.75, 0.9, 0.95, 0.99, 1.0))
+_CONTEXT_EVICTIONS = REGISTRY.counter(
+    'assistant_context_evictions_total', 'Times old exchanges were evicted from a conversation (each '
+    'changes the prompt prefix)')
+
+
+def create_session(pool_size: int = None, max_retries: int = None, backoff: float = None) -> requests.Session:
+    """
+    Create a keep-alive HTTP session for talking to Ollama
+
+    Connections (and TLS sessions for https URLs) are pooled and reused
+    across requests. Only connection failures are retried: a request that
+    reached the server is never sent twice.
+
+    Args:
+        pool_size: Maximum pooled connections per host (uses config if not provided)
+        max_retries: Connection attempts retried before giving up (uses config if not provided)
+        backoff: Exponential backoff factor between retries in seconds (uses config if not provided)
+
+    Returns:
+        Configured requests.Session
+    """
+    pool_size = pool_size or config.OLLAMA_POOL_SIZE
+    max_retries = config.OLLAMA_MAX_RETRIES if max_retries is None else max_retries
+    backoff = config.OLLAMA_RETRY_BACKOFF if backoff is None else backoff
+
+    retry = Retry(total=max_retries, connect=max_retries, read=0, status=0, backoff_factor=backoff)
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+
+    session = requests.Session()
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
+
+# Shared session for calls made before a client exists (e.g. model selection)
+_shared_session: Optional[requests.Session] = None
+
+
+def _get_shared_session() -> requests.Session:
+    """Get the module-wide session, creating it on first use"""
+    global _shared_session
+    if _shared_session is None:
+        _shared_session = create_session()
+    return _shared_session
+
 
 class OllamaClient:
     """Client for interacting with Ollama API"""
@@ -13,12 +83,21 @@ class OllamaClient:
     def __init__(self, base_url: str = None, model: str = None):
         self.base_url = base_url or config.OLLAMA_URL
         self.model = model or config.OLLAMA_MODEL
-        self.conversation_history: List[Dict[str, str]] = []
-        self.max_context = config.MAX_CONTEXT_MESSAGES
+        self.conversation_history = ConversationContext()
+        self.num_ctx = config.OLLAMA_NUM_CTX
+        self._context_length: Optional[int] = None  # Model's trained context length (0 if unknown)
+        self.last_stats: Dict[str, int] = {}  # Timing/token counts from the last completed response
+        self.keep_alive = config.OLLAMA_KEEP_ALIVE
+        self.cold_loads = 0  # Responses that had to wait for the model to be loaded
+        self._warm_up_thread: Optional[threading.Thread] = None
 
         # Ensure URL doesn't end with slash
         self.base_url = self.base_url.rstrip('/')
 
+        # Persistent connection pool; connect and read timeouts are separate
+        self.session = create_session()
+        self.timeout = (config.OLLAMA_CONNECT_TIMEOUT, config.OLLAMA_READ_TIMEOUT)
+
         print(f"\n🤖 Ollama Client initialized")
         print(f"   URL: {self.base_url}")
         print(f"   Model: {self.model}")
@@ -37,7 +116,7 @@ class OllamaClient:
         """
         url = (base_url or config.OLLAMA_URL).rstrip('/')
         try:
-            response = requests.get(f"{url}/api/tags", timeout=5)
+            response = _get_shared_session().get(f"{url}/api/tags", timeout=(config.OLLAMA_CONNECT_TIMEOUT, 5))
             response.raise_for_status()
             models = response.json().get("models", [])
             return models
@@ -45,55 +124,48 @@ class OllamaClient:
             print(f"❌ Could not fetch models from {url}: {e}")
             return None
 
-    def chat(self, user_message: str, maintain_context: bool = True) -> str:
+    def chat(self, user_message: str, maintain_context: bool = True,
+             history: Optional[ConversationContext] = None) -> str:
         """
         Send a message to Ollama and get a response
 
         Args:
             user_message: The user's message/question
             maintain_context: Whether to include conversation history
+            history: Conversation to use and update instead of this client's own
+                     (e.g. one per web session)
 
         Returns:
             The assistant's response
         """
-        try:
-            # Add user message to history
-            if maintain_context:
-                self.conversation_history.append({
-                    "role": "user",
-                    "content": user_message
-                })
-
-                # Trim history if too long
-                if len(self.conversation_history) > self.max_context * 2:  # *2 because user+assistant pairs
-                    self.conversation_history = self.conversation_history[-self.max_context * 2:]
+        if history is None:
+            history = self.conversation_history
 
-                messages = self.conversation_history
-            else:
-                messages = [{"role": "user", "content": user_message}]
+        try:
+            messages, prompt_tokens = self._prepare_messages(user_message, maintain_context, history)
 
             # Make request to Ollama
             url = f"{self.base_url}/api/chat"
             payload = {
                 "model": self.model,
                 "messages": messages,
-                "stream": False
+                "stream": False,
+                "keep_alive": self.keep_alive,
+                "options": self._options()
             }
 
             print(f"📤 Sending request to Ollama...")
-            response = requests.post(url, json=payload, timeout=60)
+            response = self.session.post(url, json=payload, timeout=self.timeout)
             response.raise_for_status()
 
             # Extract response
             result = response.json()
             assistant_message = result.get("message", {}).get("content", "")
+            self._record_stats(result, prompt_tokens)
 
             # Add assistant response to history
             if maintain_context and assistant_message:
-                self.conversation_history.append({
-                    "role": "assistant",
-                    "content": assistant_message
-                })
+                history.add("assistant", assistant_message)
 
             print(f"📥 Received response from Ollama")
             return assistant_message
@@ -118,11 +190,308 @@ class OllamaClient:
             print(f"❌ {error_msg}")
             return "Sorry, an unexpected error occurred."
 
+    def chat_stream(self, user_message: str, maintain_context: bool = True,
+                    history: Optional[ConversationContext] = None) -> Iterator[str]:
+        """
+        Send a message to Ollama and yield the response as it is generated
+
+        Args:
+            user_message: The user's message/question
+            maintain_context: Whether to include conversation history
+            history: Conversation to use and update instead of this client's own
+
+        Yields:
+            Response text fragments (tokens) in order. On failure a single
+            error message is yielded instead, like chat() returns one.
+        """
+        if history is None:
+            history = self.conversation_history
+
+        pieces = []
+        try:
+            messages, prompt_tokens = self._prepare_messages(user_message, maintain_context, history)
+
+            url = f"{self.base_url}/api/chat"
+            payload = {
+                "model": self.model,
+                "messages": messages,
+                "stream": True,
+                "keep_alive": self.keep_alive,
+                "options": self._options()
+            }
+
+            print(f"📤 Sending streaming request to Ollama...")
+            with self.session.post(url, json=payload, stream=True, timeout=self.timeout) as response:
+                response.raise_for_status()
+
+                # One JSON object per line; the last one has done=true and the stats
+                for line in response.iter_lines():
+                    if not line:
+                        continue
+                    chunk = json.loads(line)
+                    if chunk.get("error"):
+                        raise requests.exceptions.HTTPError(chunk["error"])
+
+                    token = chunk.get("message", {}).get("content", "")
+                    if token:
+                        pieces.append(token)
+                        yield token
+
+                    if chunk.get("done"):
+                        self._record_stats(chunk, prompt_tokens)
+                        break
+
+            print(f"📥 Received response from Ollama")
+
+        except requests.exceptions.Timeout:
+            error_msg = "Request to Ollama timed out. Please try again."
+            print(f"❌ {error_msg}")
+            yield error_msg
+
+        except requests.exceptions.ConnectionError:
+            error_msg = f"Could not connect to Ollama at {self.base_url}. Please check if Ollama is running."
+            print(f"❌ {error_msg}")
+            yield error_msg
+
+        except requests.exceptions.HTTPError as e:
+            print(f"❌ Ollama API error: {e}")
+            yield "Sorry, there was an error communicating with the assistant."
+
+        except Exception as e:
+            print(f"❌ Unexpected error: {e}")
+            yield "Sorry, an unexpected error occurred."
+
+        finally:
+            # Record whatever was generated, even if the consumer stopped early
+            assistant_message = ''.join(pieces)
+            if maintain_context and assistant_message:
+                history.add("assistant", assistant_message)
+
+    def warm_up(self) -> bool:
+        """
+        Load the model into Ollama's memory without generating anything
+
+        A generate request without a prompt only loads the model, so the
+        first real question doesn't pay for it. keep_alive keeps it loaded.
+
+        Returns:
+            True if the model is loaded
+        """
+        url = f"{self.base_url}/api/generate"
+        payload = {
+            "model": self.model,
+            "keep_alive": self.keep_alive,
+            "options": self._options()  # Same options as chats, so they don't trigger a reload
+        }
+
+        start = time.perf_counter()
+        try:
+            response = self.session.post(url, json=payload, timeout=self.timeout)
+            response.raise_for_status()
+            result = response.json()
+        except Exception as e:
+            print(f"⚠ Could not warm up model '{self.model}': {e}")
+            return False
+
+        elapsed = time.perf_counter() - start
+        load_seconds = result.get("load_duration", 0) / 1e9
+        if load_seconds >= config.OLLAMA_COLD_LOAD_THRESHOLD:
+            print(f"🔥 Model '{self.model}' loaded into Ollama in {load_seconds:.1f}s")
+        else:
+            print(f"🔥 Model '{self.model}' already loaded ({elapsed:.2f}s)")
+
+        # Look up the context length now rather than on the first question
+        self.get_context_length()
+        return True
+
+    def start_warm_up(self):
+        """Warm up the model on a background thread (see wait_for_warm_up())"""
+        if self._warm_up_thread is not None:
+            return
+        self._warm_up_thread = threading.Thread(target=self.warm_up, name="ollama-warm-up", daemon=True)
+        self._warm_up_thread.start()
+
+    def wait_for_warm_up(self, timeout: float = None) -> bool:
+        """
+        Wait for a warm-up started with start_warm_up()
+
+        Args:
+            timeout: Maximum seconds to wait (None waits until done)
+
+        Returns:
+            True if no warm-up is still running
+        """
+        thread = self._warm_up_thread
+        if thread is None:
+            return True
+        if thread.is_alive():
+            print(f"⏳ Waiting for Ollama to load '{self.model}'...")
+            thread.join(timeout)
+        return not thread.is_alive()
+
+    def _options(self) -> dict:
+        """Model options sent with every request"""
+        return {"num_ctx": self.num_ctx} if self.num_ctx else {}
+
+    def get_context_length(self) -> int:
+        """
+        Get the context length the model was trained with (from /api/show)
+
+        Looked up once per client.
+
+        Returns:
+            Context length in tokens, or 0 if the server doesn't report it
+        """
+        if self._context_length is None:
+            self._context_length = 0
+            try:
+                response = self.session.post(f"{self.base_url}/api/show", json={"model": self.model},
+                                             timeout=(config.OLLAMA_CONNECT_TIMEOUT, 5))
+                response.raise_for_status()
+                for key, value in response.json().get("model_info", {}).items():
+                    if key.endswith(".context_length"):
+                        self._context_length = int(value)
+                        break
+            except Exception as e:
+                print(f"⚠ Could not get context length of '{self.model}': {e}")
+        return self._context_length
+
+    def context_budget(self) -> int:
+        """
+        Get the tokens the conversation history may take
+
+        The context window is num_ctx (or Ollama's default of 2048), capped
+        at the model's own context length, minus room for the answer.
+
+        Returns:
+            Token budget for the messages of a request
+        """
+        window = self.num_ctx or 2048
+        trained = self.get_context_length()
+        if trained:
+            window = min(window, trained)
+        return max(window - config.CONTEXT_RESPONSE_RESERVE - self._system_tokens(), window // 4)
+
+    def _system_messages(self) -> List[Dict[str, str]]:
+        """The fixed system prompt every request starts with (empty if none is configured)"""
+        prompt = config.OLLAMA_SYSTEM_PROMPT
+        return [{"role": "system", "content": prompt}] if prompt else []
+
+    def _system_tokens(self) -> int:
+        """Estimated tokens of the system prompt"""
+        prompt = config.OLLAMA_SYSTEM_PROMPT
+        return estimate_tokens(prompt) if prompt else 0
+
+    def summarize(self, summary: str, messages: List[Dict[str, str]]) -> str:
+        """
+        Fold messages dropped from the context into the conversation summary
+
+        Args:
+            summary: Summary so far (may be empty)
+            messages: Messages to add to it
+
+        Returns:
+            Updated summary
+        """
+        transcript = "\n".join(f"{message['role']}: {message['content']}" for message in messages)
+        words = config.CONTEXT_SUMMARY_MAX_TOKENS * 3 // 4
+        prompt = (f"Summarize this conversation between a user and a voice assistant in at most {words} words. "
+                  f"Keep names, facts and open questions; reply with the summary only.\n\n")
+        if summary:
+            prompt += f"Earlier summary: {summary}\n\n"
+        prompt += f"Conversation:\n{transcript}"
+
+        url = f"{self.base_url}/api/chat"
+        payload = {
+            "model": self.model,
+            "messages": [{"role": "user", "content": prompt}],
+            "stream": False,
+            "keep_alive": self.keep_alive,
+            "options": self._options()
+        }
+        response = self.session.post(url, json=payload, timeout=self.timeout)
+        response.raise_for_status()
+        return response.json().get("message", {}).get("content", "")
+
+    def _prepare_messages(self, user_message: str, maintain_context: bool,
+                          history: ConversationContext) -> Tuple[List[Dict[str, str]], int]:
+        """
+        Build the message list for a request
+
+        The system prompt comes first and never changes, and the history
+        is only trimmed in blocks, so consecutive requests share a long
+        prompt prefix that Ollama doesn't evaluate again.
+
+        Args:
+            user_message: The user's message/question
+            maintain_context: Whether to add to and send the conversation history
+            history: Conversation to add the message to (trimmed to the token budget)
+
+        Returns:
+            Tuple of (messages to send to Ollama, their estimated prompt tokens)
+        """
+        if not maintain_context:
+            return (self._system_messages() + [{"role": "user", "content": user_message}],
+                    self._system_tokens() + estimate_tokens(user_message))
+
+        history.add("user", user_message)
+
+        # Once the history outgrows the budget, drop (or summarize) a large block of old
+        # exchanges at once rather than one per turn, which would shift the prefix every time
+        budget = self.context_budget()
+        summarizer = self.summarize if config.CONTEXT_SUMMARY_ENABLED else None
+        if history.trim(budget, summarizer, target=int(budget * config.CONTEXT_EVICTION_TARGET)):
+            _CONTEXT_EVICTIONS.inc()
+
+        return self._system_messages() + history.messages(), self._system_tokens() + history.tokens
+
+    def _record_stats(self, result: dict, prompt_tokens: int = 0):
+        """
+        Keep the timing and token counts Ollama reports with a finished response
+
+        Args:
+            result: Final response object
+            prompt_tokens: Estimated tokens of the prompt that was sent
+        """
+        self.last_stats = {
+            key: result[key]
+            for key in ('total_duration', 'load_duration', 'prompt_eval_count',
+                        'prompt_eval_duration', 'eval_count', 'eval_duration')
+            if key in result
+        }
+
+        stats = self.last_stats
+        if 'total_duration' in stats:
+            _REQUEST_SECONDS.observe(stats['total_duration'] / 1e9)
+        if 'load_duration' in stats:
+            _LOAD_SECONDS.observe(stats['load_duration'] / 1e9)
+        if stats.get('eval_duration'):
+            _TOKENS_PER_SECOND.observe(stats.get('eval_count', 0) / (stats['eval_duration'] / 1e9))
+        _TOKENS.inc(stats.get('prompt_eval_count', 0), kind='prompt')
+        _TOKENS.inc(stats.get('eval_count', 0), kind='generated')
+        if 'prompt_eval_count' in stats:
+            _PROMPT_EVAL_TOKENS.observe(stats['prompt_eval_count'])
+            if prompt_tokens:
+                # Prompt tokens Ollama didn't evaluate were reused from its prefix cache
+                _PROMPT_CACHED_RATIO.observe(min(1.0, max(0.0, 1 - stats['prompt_eval_count'] / prompt_tokens)))
+
+        # A load here means the model was evicted (or never warmed up)
+        load_seconds = stats.get('load_duration', 0) / 1e9
+        if load_seconds >= config.OLLAMA_COLD_LOAD_THRESHOLD:
+            self.cold_loads += 1
+            _COLD_LOADS.inc()
+            print(f"🧊 Cold start: Ollama spent {load_seconds:.1f}s loading '{self.model}' "
+                  f"(keep_alive={self.keep_alive})")
+
     def clear_context(self):
         """Clear the conversation history"""
-        self.conversation_history = []
+        self.conversation_history.clear()
         print("🔄 Conversation context cleared")
 
+    def close(self):
+        """Close pooled connections"""
+        self.session.close()
+
     def get_context_size(self) -> int:
         """Get the number of messages in the conversation history"""
         return len(self.conversation_history)
@@ -131,7 +500,7 @@ class OllamaClient:
         """Test connection to Ollama server"""
         try:
             url = f"{self.base_url}/api/tags"
-            response = requests.get(url, timeout=5)
+            response = self.session.get(url, timeout=(config.OLLAMA_CONNECT_TIMEOUT, 5))
             response.raise_for_status()
             print(f"✓ Successfully connected to Ollama at {self.base_url}")
 
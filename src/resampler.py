@@ -0,0 +1,223 @@
+"""
+Resampler - Streaming rational polyphase resampling in float32
+"""
+
+from functools import lru_cache
+from math import gcd
+from typing import Tuple
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+from scipy import signal
+from . import config
+
+# Outputs computed per matrix product (bounds temporary memory for long buffers)
+_BLOCK_SIZE = 4096
+
+# Filter banks kept designed; an awkward rate pair (e.g. 191999 -> 16000)
+# needs a filter of several MB, so least recently used ones are dropped
+_FILTER_CACHE_SIZE = 8
+
+
+@lru_cache(maxsize=_FILTER_CACHE_SIZE)
+def _filter_bank(up: int, down: int) -> Tuple[np.ndarray, int]:
+    """
+    Design the anti-aliasing filter for a reduced up/down ratio and split it into phases
+
+    Uses the same Kaiser-windowed FIR as scipy.signal.resample_poly, so
+    results match it. The most recently used rate pairs are cached.
+
+    Returns:
+        Tuple of (phases, delay)
+        - phases: Read-only float32 array of shape (up, taps_per_phase); each
+          row is reversed so it can be applied to ascending input windows
+        - delay: Filter delay in upsampled samples (compensated in the output)
+    """
+    max_rate = max(up, down)
+    half_len = 10 * max_rate
+    taps = signal.firwin(2 * half_len + 1, 1.0 / max_rate, window=('kaiser', 5.0)) * up
+
+    taps_per_phase = -(-len(taps) // up)
+    padded = np.zeros(taps_per_phase * up)
+    padded[:len(taps)] = taps
+
+    phases = padded.reshape(taps_per_phase, up).T[:, ::-1].astype(np.float32)
+    phases.flags.writeable = False
+    return phases, half_len
+
+
+def filter_cache_info():
+    """Hit/miss statistics of the filter cache"""
+    return _filter_bank.cache_info()
+
+
+class PolyphaseResampler:
+    """
+    Resamples audio by a rational factor, whole buffers or chunk by chunk
+
+    process() can be called with chunks of any size; the input history
+    needed by the filter is carried over between calls, so concatenating
+    the outputs of process() and flush() gives the same result as
+    resampling the whole signal at once. Samples keep the scale of the
+    input (int16 input gives float32 in int16 units) and everything is
+    computed in float32.
+    """
+
+    def __init__(self, source_rate: int, target_rate: int = None):
+        """
+        Initialize resampler
+
+        Args:
+            source_rate: Sample rate of the input
+            target_rate: Sample rate of the output (uses config if not provided)
+        """
+        self.source_rate = int(source_rate)
+        self.target_rate = int(target_rate or config.SAMPLE_RATE)
+
+        divisor = gcd(self.source_rate, self.target_rate)
+        self.up = self.target_rate // divisor
+        self.down = self.source_rate // divisor
+        self.passthrough = self.up == self.down
+
+        if not self.passthrough:
+            self._phases, self._delay = _filter_bank(self.up, self.down)
+            self._taps = self._phases.shape[1]
+        self.reset()
+
+    def reset(self):
+        """Forget carried-over input (start a new signal)"""
+        self._history = np.zeros(self._taps - 1, dtype=np.float32) if not self.passthrough else None
+        self._inputs = 0
+        self._outputs = 0
+
+    def _input_index(self, output_index: int) -> int:
+        """Newest input sample that output_index depends on"""
+        return (output_index * self.down + self._delay) // self.up
+
+    def process(self, chunk: np.ndarray) -> np.ndarray:
+        """
+        Resample the next chunk of a stream
+
+        Args:
+            chunk: Mono samples at source_rate (int16 or float)
+
+        Returns:
+            float32 samples at target_rate available so far (output lags the
+            input by the filter delay; call flush() at the end of the stream)
+        """
+        chunk = np.asarray(chunk, dtype=np.float32).reshape(-1)
+        if self.passthrough:
+            return chunk
+
+        total_inputs = self._inputs + len(chunk)
+        buffer = np.concatenate((self._history, chunk))
+
+        # Outputs whose newest input sample has arrived
+        last = total_inputs * self.up - 1 - self._delay
+        end = last // self.down + 1 if last >= 0 else 0
+        output = self._filter(buffer, self._inputs - (self._taps - 1), self._outputs, max(end, self._outputs))
+
+        self._history = buffer[len(buffer) - (self._taps - 1):]
+        self._inputs = total_inputs
+        self._outputs = max(end, self._outputs)
+        return output
+
+    def flush(self) -> np.ndarray:
+        """
+        Finish the stream (the input is treated as followed by silence)
+
+        Returns:
+            Remaining float32 samples; the total output length is
+            ceil(inputs * target_rate / source_rate), as with resample_poly
+        """
+        if self.passthrough:
+            self.reset()
+            return np.zeros(0, dtype=np.float32)
+
+        total_outputs = -(-self._inputs * self.up // self.down)
+        output = np.zeros(0, dtype=np.float32)
+        if total_outputs > self._outputs:
+            padding = self._input_index(total_outputs - 1) - self._inputs + 1
+            buffer = np.concatenate((self._history, np.zeros(max(padding, 0), dtype=np.float32)))
+            output = self._filter(buffer, self._inputs - (self._taps - 1), self._outputs, total_outputs)
+
+        self.reset()
+        return output
+
+    def resample(self, audio: np.ndarray) -> np.ndarray:
+        """
+        Resample a whole buffer (resets any stream in progress)
+
+        Args:
+            audio: Mono samples at source_rate
+
+        Returns:
+            float32 samples at target_rate
+        """
+        self.reset()
+        if self.passthrough:
+            return np.asarray(audio, dtype=np.float32).reshape(-1)
+        head = self.process(audio)
+        return np.concatenate((head, self.flush()))
+
+    def _filter(self, buffer: np.ndarray, first_index: int, start: int, end: int) -> np.ndarray:
+        """
+        Compute outputs start..end-1
+
+        Args:
+            buffer: Input samples, buffer[0] being input number first_index
+            first_index: Stream index of buffer[0]
+            start: First output index
+            end: One past the last output index
+        """
+        count = end - start
+        output = np.empty(count, dtype=np.float32)
+        if count <= 0:
+            return output
+
+        windows = sliding_window_view(buffer, self._taps)
+
+        if count < 8 * self.up:
+            # Few outputs per phase (small stream chunks at rates like 44.1 kHz):
+            # gather each output's window and filter row in one vectorized pass
+            for block in range(start, end, _BLOCK_SIZE):
+                positions = np.arange(block, min(end, block + _BLOCK_SIZE)) * self.down + self._delay
+                rows = windows[positions // self.up - (self._taps - 1) - first_index]
+                output[block - start:block - start + len(positions)] = np.einsum(
+                    'ij,ij->i', rows, self._phases[positions % self.up])
+            return output
+
+        # Outputs up samples apart use the same phase and inputs down samples apart,
+        # so each phase is a strided view of the input windows times one filter row
+        for offset in range(self.up):
+            position = (start + offset) * self.down + self._delay
+            phase = self._phases[position % self.up]
+            first_window = position // self.up - (self._taps - 1) - first_index
+            n = len(range(offset, count, self.up))
+
+            for block in range(0, n, _BLOCK_SIZE):
+                block_end = min(n, block + _BLOCK_SIZE)
+                rows = windows[first_window + block * self.down:
+                               first_window + (block_end - 1) * self.down + 1:self.down]
+                output[offset + block * self.up:offset + block_end * self.up:self.up] = rows @ phase
+
+        return output
+
+
+def resample(audio: np.ndarray, source_rate: int, target_rate: int = None) -> np.ndarray:
+    """
+    Resample a whole buffer
+
+    Args:
+        audio: Mono samples at source_rate (int16 or float)
+        source_rate: Sample rate of the input
+        target_rate: Sample rate of the output (uses config if not provided)
+
+    Returns:
+        float32 samples at target_rate, in the input's scale
+    """
+    return PolyphaseResampler(source_rate, target_rate).resample(audio)
+
+
+def to_int16(samples: np.ndarray) -> np.ndarray:
+    """Round and clip float samples in int16 units back to int16"""
+    return np.clip(np.rint(samples), -32768, 32767).astype(np.int16)
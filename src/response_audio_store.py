@@ -0,0 +1,108 @@
+"""
+Response Audio Store - Keeps synthesized web responses until the browser fetches them
+"""
+
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Optional
+from . import config
+
+
+class ResponseAudioStore:
+    """
+    Short-lived in-memory store of synthesized response audio keyed by response id
+
+    /api/process_audio synthesizes the reply once and puts it here; the
+    browser then fetches it by id instead of asking for a second synthesis.
+    Entries expire after ttl seconds and the oldest are evicted beyond
+    max_entries, so audio nobody fetches doesn't accumulate.
+    """
+
+    def __init__(self, ttl: float = None, max_entries: int = None):
+        """
+        Initialize store
+
+        Args:
+            ttl: Seconds an entry stays available (uses config if not provided)
+            max_entries: Maximum entries kept at once (uses config if not provided)
+        """
+        self.ttl = ttl or config.RESPONSE_AUDIO_TTL
+        self.max_entries = max_entries or config.RESPONSE_AUDIO_MAX_ENTRIES
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()  # id -> (expires_at, audio)
+
+        # Statistics
+        self.hits = 0
+        self.misses = 0
+        self.expired = 0  # Dropped after ttl
+        self.evicted = 0  # Dropped to stay within max_entries
+
+    def put(self, audio: bytes) -> str:
+        """
+        Store response audio
+
+        Args:
+            audio: Encoded audio (WAV bytes)
+
+        Returns:
+            Response id to fetch it with
+        """
+        response_id = uuid.uuid4().hex
+        with self._lock:
+            self._purge(time.monotonic())
+            self._entries[response_id] = (time.monotonic() + self.ttl, audio)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evicted += 1
+        return response_id
+
+    def get(self, response_id: str) -> Optional[bytes]:
+        """
+        Look up stored response audio
+
+        Args:
+            response_id: Id returned by put()
+
+        Returns:
+            The audio, or None if it is unknown or has expired
+        """
+        with self._lock:
+            self._purge(time.monotonic())
+            entry = self._entries.get(response_id)
+            if entry is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            return entry[1]
+
+    def _purge(self, now: float):
+        """Drop expired entries (oldest first, so stop at the first live one)"""
+        while self._entries:
+            response_id, (expires_at, _) = next(iter(self._entries.items()))
+            if expires_at > now:
+                break
+            del self._entries[response_id]
+            self.expired += 1
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def get_stats(self) -> dict:
+        """
+        Get store statistics
+
+        Returns:
+            Dictionary with entry count, stored bytes, hits, misses, expirations and evictions
+        """
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'bytes': sum(len(audio) for _, audio in self._entries.values()),
+                'hits': self.hits,
+                'misses': self.misses,
+                'expired': self.expired,
+                'evicted': self.evicted
+            }
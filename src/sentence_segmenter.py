@@ -0,0 +1,99 @@
+"""
+Sentence Segmenter - Splits streamed LLM output into speakable sentences
+"""
+
+import re
+from typing import List, Optional
+
+# Sentence end: terminal punctuation (optionally followed by closing quotes/brackets)
+# and then whitespace, or a line break
+_BOUNDARY = re.compile(r'[.!?]+["\')\]]*\s+|\n+')
+
+# Words ending in a period that don't end a sentence
+_ABBREVIATIONS = {'mr', 'mrs', 'ms', 'dr', 'prof', 'sr', 'jr', 'st', 'vs', 'etc', 'e.g', 'i.e'}
+
+# Abbreviations only before a number ("No. 5"), otherwise ordinary words ("the answer is no.")
+_NUMBER_ABBREVIATIONS = {'no'}
+
+
+class SentenceSegmenter:
+    """
+    Incremental sentence splitter for token streams
+
+    A boundary is only accepted once the whitespace after the punctuation
+    has arrived, so "3." followed by "14" or "Dr." followed by a name are
+    not split.
+    """
+
+    def __init__(self, min_length: int = 12):
+        """
+        Initialize segmenter
+
+        Args:
+            min_length: Shorter sentences are merged into the next one so TTS
+                        isn't started for fragments like "Sure."
+        """
+        self.min_length = min_length
+        self._buffer = ""
+
+    def feed(self, text: str) -> List[str]:
+        """
+        Add streamed text
+
+        Args:
+            text: Next fragment of the response
+
+        Returns:
+            Sentences completed by this fragment (possibly empty)
+        """
+        self._buffer += text
+        sentences = []
+        start = 0
+
+        for match in _BOUNDARY.finditer(self._buffer):
+            end = match.end()
+            candidate = self._buffer[start:end].strip()
+
+            if match.group().startswith('.') and self._is_abbreviation(self._buffer[start:match.start()],
+                                                                       self._buffer[end:]):
+                continue
+            if len(candidate) < self.min_length and '\n' not in match.group():
+                continue
+
+            if candidate:
+                sentences.append(candidate)
+            start = end
+
+        self._buffer = self._buffer[start:]
+        return sentences
+
+    def flush(self) -> Optional[str]:
+        """
+        Get whatever text is left at the end of the stream
+
+        Returns:
+            The remaining text, or None if there is none
+        """
+        remaining = self._buffer.strip()
+        self._buffer = ""
+        return remaining or None
+
+    @staticmethod
+    def _is_abbreviation(text: str, following: str) -> bool:
+        """
+        Check whether text ends with a known abbreviation or a single initial
+
+        Args:
+            text: Text up to the period
+            following: Text after the period and its whitespace (may not have arrived yet)
+
+        Returns:
+            True if the period doesn't end a sentence (or can't be decided yet)
+        """
+        words = text.split()
+        if not words:
+            return False
+        word = words[-1].lower().rstrip('.')
+        if word in _NUMBER_ABBREVIATIONS:
+            return not following or following[0].isdigit()
+        return word in _ABBREVIATIONS or (len(word) == 1 and word.isalpha())
@@ -0,0 +1,136 @@
+"""
+Session Store - Per-client conversation state for web mode
+"""
+
+import secrets
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+from .conversation import ConversationContext
+from . import config
+
+# Cookie identifying a browser's conversation
+SESSION_COOKIE = 'assistant_session'
+
+
+class Session:
+    """Conversation state of one browser client"""
+
+    def __init__(self, session_id: str):
+        self.id = session_id
+        self.history = ConversationContext()  # Trimmed by OllamaClient to the model's context budget
+        self.lock = threading.Lock()  # Held for a whole turn so one client's requests don't interleave
+        self.created_at = time.monotonic()
+        self.last_active = self.created_at
+
+    def clear(self):
+        """Forget the conversation"""
+        self.history.clear()
+
+
+class SessionStore:
+    """
+    Sessions keyed by session id with idle expiry and LRU eviction
+
+    The store lock only guards the session table and is held for O(1)
+    work per lookup; conversation turns use each session's own lock, so
+    clients don't contend with each other. Sessions are kept in
+    least-recently-used order, which is also idle-time order, so expiry
+    and eviction only ever look at the front of the table.
+    """
+
+    def __init__(self, timeout: float = None, max_sessions: int = None):
+        """
+        Initialize store
+
+        Args:
+            timeout: Seconds of inactivity before a session expires (uses config if not provided)
+            max_sessions: Maximum sessions kept; the least recently used is evicted (uses config if not provided)
+        """
+        self.timeout = timeout or config.SESSION_TIMEOUT
+        self.max_sessions = max_sessions or config.MAX_WEB_SESSIONS
+        self._lock = threading.Lock()
+        self._sessions: "OrderedDict[str, Session]" = OrderedDict()
+
+        # Statistics
+        self.created = 0
+        self.expired = 0
+        self.evicted = 0
+
+    def get(self, session_id: Optional[str]) -> Optional[Session]:
+        """
+        Look up a live session and mark it as active
+
+        Args:
+            session_id: Id from the client's cookie
+
+        Returns:
+            The session, or None if it is unknown or has expired
+        """
+        now = time.monotonic()
+        with self._lock:
+            self._expire(now)
+            session = self._sessions.get(session_id) if session_id else None
+            if session is not None:
+                session.last_active = now
+                self._sessions.move_to_end(session_id)
+            return session
+
+    def get_or_create(self, session_id: Optional[str]) -> Session:
+        """
+        Look up a session, starting a new one if needed
+
+        Args:
+            session_id: Id from the client's cookie (None for a new client)
+
+        Returns:
+            Live session (check session.id against the cookie to see if it is new)
+        """
+        session = self.get(session_id)
+        if session is not None:
+            return session
+
+        session = Session(secrets.token_urlsafe(16))
+        with self._lock:
+            self._sessions[session.id] = session
+            self.created += 1
+            while len(self._sessions) > self.max_sessions:
+                self._sessions.popitem(last=False)
+                self.evicted += 1
+        return session
+
+    def remove(self, session_id: str):
+        """End a session"""
+        with self._lock:
+            self._sessions.pop(session_id, None)
+
+    def _expire(self, now: float):
+        """Drop sessions idle for longer than the timeout (caller holds the lock)"""
+        while self._sessions:
+            session = next(iter(self._sessions.values()))
+            if now - session.last_active < self.timeout:
+                break
+            del self._sessions[session.id]
+            self.expired += 1
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._sessions)
+
+    def get_stats(self) -> dict:
+        """
+        Get store statistics
+
+        Returns:
+            Dictionary with active, created, expired and evicted session counts
+        """
+        with self._lock:
+            self._expire(time.monotonic())
+            return {
+                'active': len(self._sessions),
+                'max_sessions': self.max_sessions,
+                'created': self.created,
+                'expired': self.expired,
+                'evicted': self.evicted
+            }
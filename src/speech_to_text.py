@@ -4,11 +4,46 @@ Speech-to-Text - Converts speech to text using Vosk
 
 import json
 import os
-from vosk import Model, KaldiRecognizer
+import time
+from typing import List, Optional, Union
+from vosk import KaldiRecognizer
+from vosk.vosk_cffi import ffi as vosk_ffi
 import numpy as np
-from scipy import signal
+from .model_registry import acquire_model, release_model
+from .endpointing import Endpointer, create_endpointer
+from .vad import VoiceActivityDetector
+from .resampler import resample, to_int16
+from .tracing import NULL_TURN
+from .metrics import REGISTRY
 from . import config
 
+_AUDIO_SECONDS = REGISTRY.counter(
+    'assistant_stt_audio_seconds_total', 'Seconds of audio recognized', ('mode',))
+_PROCESSING_SECONDS = REGISTRY.counter(
+    'assistant_stt_processing_seconds_total', 'Seconds spent recognizing audio', ('mode',))
+_REAL_TIME_FACTOR = REGISTRY.histogram(
+    'assistant_stt_real_time_factor', 'Recognition time divided by audio duration of a whole utterance',
+    buckets=(0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.0))
+
+
+def as_waveform(audio_chunk: Union[bytes, np.ndarray]):
+    """
+    Wrap audio for KaldiRecognizer.AcceptWaveform without copying it
+
+    The Vosk binding only takes bytes or a cffi buffer, so int16 arrays
+    (including read-only ring buffer views) are wrapped with ffi.from_buffer
+    instead of being copied with tobytes().
+
+    Args:
+        audio_chunk: int16 samples or raw PCM bytes
+
+    Returns:
+        Object accepted by AcceptWaveform
+    """
+    if isinstance(audio_chunk, bytes):
+        return audio_chunk
+    return vosk_ffi.from_buffer(np.ascontiguousarray(audio_chunk, dtype=np.int16))
+
 
 class SpeechToText:
     """Handles speech-to-text conversion using Vosk"""
@@ -31,13 +66,33 @@ class SpeechToText:
                 f"Extract the model to: {self.model_path}"
             )
 
-        print(f"\n🎤 Loading Vosk model from: {self.model_path}")
-        self.model = Model(self.model_path)
+        # Shared with every other component using the same model path
+        self.model = acquire_model(self.model_path)
         self.sample_rate = config.SAMPLE_RATE
-        print(f"✓ Vosk model loaded successfully")
 
-    def create_recognizer(self) -> KaldiRecognizer:
-        """Create a new recognizer instance"""
+        # Speech/silence classification for endpointing
+        self.vad = VoiceActivityDetector(sample_rate=self.sample_rate)
+        self.last_endpoint = None  # Reason and delay of the last listen_for_speech() endpoint
+
+    def close(self):
+        """Release the shared Vosk model"""
+        if self.model is not None:
+            release_model(self.model_path)
+            self.model = None
+
+    def create_recognizer(self, grammar: Optional[List[str]] = None) -> KaldiRecognizer:
+        """
+        Create a new recognizer instance
+
+        Args:
+            grammar: Optional list of phrases to restrict decoding to
+                     (include "[unk]" to absorb everything else)
+
+        Returns:
+            KaldiRecognizer using the full vocabulary, or the grammar if given
+        """
+        if grammar:
+            return KaldiRecognizer(self.model, self.sample_rate, json.dumps(grammar))
         return KaldiRecognizer(self.model, self.sample_rate)
 
     def transcribe_audio(self, audio_data: np.ndarray, source_sample_rate: int = None) -> str:
@@ -75,20 +130,12 @@ class SpeechToText:
         # Resample if needed
         if source_sample_rate != self.sample_rate:
             print(f"   Resampling from {source_sample_rate} Hz to {self.sample_rate} Hz...")
-            # Convert to float for resampling
-            if audio_data.dtype == np.int16:
-                audio_float = audio_data.astype(np.float32) / 32767.0
-            else:
-                audio_float = audio_data.astype(np.float32)
-
-            # Calculate number of samples after resampling
-            num_samples = int(len(audio_float) * self.sample_rate / source_sample_rate)
-
-            # Resample using scipy
-            audio_resampled = signal.resample(audio_float, num_samples)
+            # Work in int16 units so the result only needs rounding, not rescaling
+            if audio_data.dtype != np.int16:
+                audio_data = audio_data.astype(np.float32) * 32767
 
-            # Convert back to int16
-            audio_data = (audio_resampled * 32767).astype(np.int16)
+            # Polyphase filter (cached per rate pair), float32 throughout
+            audio_data = to_int16(resample(audio_data, source_sample_rate, self.sample_rate))
         else:
             # Convert numpy array to int16 if needed
             if audio_data.dtype != np.int16:
@@ -108,25 +155,32 @@ class SpeechToText:
         print(f"   Final audio shape: {audio_data.shape}, dtype: {audio_data.dtype}")
         print(f"   Processing {len(audio_data)} samples...")
 
-        audio_bytes = audio_data.tobytes()
-
         # Process audio
-        recognizer.AcceptWaveform(audio_bytes)
+        started_at = time.perf_counter()
+        recognizer.AcceptWaveform(as_waveform(audio_data))
 
         # Get result
         result = json.loads(recognizer.FinalResult())
         text = result.get('text', '').strip()
 
+        processing_seconds = time.perf_counter() - started_at
+        audio_seconds = len(audio_data) / self.sample_rate
+        _AUDIO_SECONDS.inc(audio_seconds, mode='utterance')
+        _PROCESSING_SECONDS.inc(processing_seconds, mode='utterance')
+        if audio_seconds > 0:
+            _REAL_TIME_FACTOR.observe(processing_seconds / audio_seconds)
+
         print(f"   Vosk result: {result}")
 
         return text
 
-    def transcribe_stream(self, audio_chunk: bytes, recognizer: KaldiRecognizer) -> tuple[str, str]:
+    def transcribe_stream(self, audio_chunk: Union[bytes, np.ndarray],
+                          recognizer: KaldiRecognizer) -> tuple[str, str]:
         """
         Transcribe audio stream chunk by chunk
 
         Args:
-            audio_chunk: Audio chunk as bytes
+            audio_chunk: Audio chunk as int16 samples or bytes
             recognizer: KaldiRecognizer instance
 
         Returns:
@@ -136,8 +190,9 @@ class SpeechToText:
         """
         partial_text = ""
         final_text = ""
+        started_at = time.perf_counter()
 
-        if recognizer.AcceptWaveform(audio_chunk):
+        if recognizer.AcceptWaveform(as_waveform(audio_chunk)):
             # Final result (end of speech segment)
             result = json.loads(recognizer.Result())
             final_text = result.get('text', '').strip()
@@ -146,68 +201,83 @@ class SpeechToText:
             result = json.loads(recognizer.PartialResult())
             partial_text = result.get('partial', '').strip()
 
+        samples = len(audio_chunk) // 2 if isinstance(audio_chunk, bytes) else len(audio_chunk)
+        _AUDIO_SECONDS.inc(samples / self.sample_rate, mode='stream')
+        _PROCESSING_SECONDS.inc(time.perf_counter() - started_at, mode='stream')
+
         return partial_text, final_text
 
-    def listen_for_speech(self, audio_manager, timeout: float = 10.0, silence_threshold: float = 2.0) -> str:
+    def listen_for_speech(self, audio_manager, timeout: float = 10.0, silence_threshold: float = None,
+                          endpointer: Endpointer = None, trace=NULL_TURN) -> str:
         """
         Listen for speech and transcribe it
 
         Args:
             audio_manager: AudioManager instance for recording
             timeout: Maximum time to listen (seconds)
-            silence_threshold: Time of silence before stopping (seconds)
+            silence_threshold: If given, stop after this much time without new text
+                               (legacy fixed timeout instead of smart endpointing)
+            endpointer: Endpointer deciding when the utterance is over
+                        (defaults to the configured SmartEndpointer)
+            trace: Turn to mark speech_start, endpoint and stt_final on
 
         Returns:
             Transcribed text
         """
         recognizer = self.create_recognizer()
+        endpointer = endpointer or create_endpointer(silence_threshold=silence_threshold)
+        endpointer.reset()
+        self.vad.reset()
         transcribed_text = []
-        last_speech_time = 0
-        elapsed_time = 0
-        chunk_duration = 0.25  # 250ms chunks
+        chunk_duration = config.STT_CHUNK_DURATION
 
         print("🎤 Listening... (speak now)")
 
         def process_chunk(audio_chunk):
-            nonlocal last_speech_time, elapsed_time, transcribed_text
-
-            # Convert to bytes
-            audio_bytes = audio_chunk.tobytes()
-
-            # Process with Vosk
-            partial_text, final_text = self.transcribe_stream(audio_bytes, recognizer)
-
-            # Update elapsed time
-            elapsed_time += chunk_duration
+            # Process with Vosk (the chunk is handed over without copying)
+            partial_text, final_text = self.transcribe_stream(audio_chunk, recognizer)
+            is_speech = bool(self.vad.classify_frames(audio_chunk).any())
+            if is_speech:
+                trace.mark('speech_start')
 
             if partial_text:
-                # Speech detected
-                last_speech_time = elapsed_time
                 print(f"   Hearing: {partial_text}", end='\r')
 
             if final_text:
                 # Complete phrase recognized
                 transcribed_text.append(final_text)
                 print(f"\n   Recognized: {final_text}")
-                last_speech_time = elapsed_time
 
-            # Check stop conditions
-            silence_duration = elapsed_time - last_speech_time
+            # Chunks may be coalesced when recognition falls behind
+            if endpointer.update(len(audio_chunk) / self.sample_rate, is_speech, partial_text, final_text):
+                print(f"\n🔇 End of speech ({endpointer.reason}, "
+                      f"{endpointer.endpoint_delay:.2f}s after last speech), processing...")
+                trace.mark('endpoint')
+                return False
 
             # Stop if timeout reached
-            if elapsed_time >= timeout:
+            if endpointer.elapsed >= timeout:
                 print("\n⏱ Timeout reached")
-                return False
-
-            # Stop if silence threshold reached (but only if we've heard something)
-            if transcribed_text and silence_duration >= silence_threshold:
-                print("\n🔇 Silence detected, processing...")
+                trace.mark('endpoint')
                 return False
 
             return True
 
-        # Record stream with callback
-        audio_manager.record_stream(process_chunk, chunk_duration=chunk_duration)
+        # Read the capture stream, starting after the wake word if there was one
+        audio_manager.record_stream(process_chunk, chunk_duration=chunk_duration,
+                                    start_position=audio_manager.pre_roll_position(), name="stt")
+
+        # Flush whatever Vosk has not finalized yet (we may stop before its own endpoint)
+        remaining = json.loads(recognizer.FinalResult()).get('text', '').strip()
+        if remaining:
+            transcribed_text.append(remaining)
+        trace.mark('stt_final')
+
+        self.last_endpoint = {
+            'reason': endpointer.reason or 'timeout',
+            'delay': endpointer.endpoint_delay,
+            'duration': endpointer.elapsed
+        }
 
         # Combine all transcribed text
         full_text = ' '.join(transcribed_text).strip()
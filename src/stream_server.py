@@ -0,0 +1,324 @@
+"""
+Stream Server - WebSocket endpoint for live web conversations
+
+Protocol (one utterance at a time per connection):
+
+    client -> server
+        {"type": "start", "sample_rate": 16000}   begin an utterance
+        <binary>                                  16-bit little-endian mono PCM
+        {"type": "stop"}                          user stopped talking (optional,
+                                                  the server also endpoints itself)
+        {"type": "clear"}                         forget the conversation
+
+    server -> client
+        {"type": "ready"}
+        {"type": "partial", "text": ...}          while the user speaks
+        {"type": "transcript", "text": ...}       utterance finished
+        {"type": "token", "text": ...}            LLM output as it is generated
+        {"type": "audio", "text": ...} <binary>   WAV for one sentence, in order
+        {"type": "done", "response_text": ...}
+        {"type": "error", "error": ...}
+
+Handshakes from a browser page on another site are refused: the Origin
+header has to name the web server (see web_origins()).
+"""
+
+import json
+import socket
+import threading
+from collections import deque
+from concurrent.futures import Future
+from http.cookies import SimpleCookie
+from typing import Callable, Deque, Iterable, List, Optional, Sequence, Tuple
+import numpy as np
+from websockets.exceptions import ConnectionClosed
+from websockets.sync.server import serve
+
+from .speech_to_text import SpeechToText
+from .ollama_client import OllamaClient
+from .session_store import SESSION_COOKIE, Session, SessionStore
+from .sentence_segmenter import SentenceSegmenter
+from .endpointing import create_endpointer
+from .vad import VoiceActivityDetector
+from .resampler import PolyphaseResampler, to_int16
+from .tracing import NULL_TURN, Tracer, trace_tokens
+from . import config
+
+
+class _Utterance:
+    """Incremental recognition of one utterance streamed from a browser"""
+
+    def __init__(self, stt: SpeechToText, sample_rate: int, trace=NULL_TURN):
+        self.stt = stt
+        self.sample_rate = sample_rate
+        self.trace = trace
+        self.resampler = PolyphaseResampler(sample_rate) if sample_rate != config.SAMPLE_RATE else None
+        self.recognizer = stt.create_recognizer()
+        self.vad = VoiceActivityDetector(sample_rate=config.SAMPLE_RATE)  # Per connection, not the shared one
+        self.endpointer = create_endpointer()
+        self.texts = []
+        self.partial = ""
+
+    def feed(self, data: bytes) -> bool:
+        """
+        Recognize one frame of PCM
+
+        Args:
+            data: 16-bit little-endian mono samples at self.sample_rate
+
+        Returns:
+            True when the utterance has ended
+        """
+        samples = np.frombuffer(data, dtype='<i2')
+        if self.resampler is not None:
+            # Filter state carries over between frames, so frame edges don't click
+            samples = to_int16(self.resampler.process(samples))
+        if len(samples) == 0:
+            return False
+
+        partial_text, final_text = self.stt.transcribe_stream(samples, self.recognizer)
+        if final_text:
+            self.texts.append(final_text)
+            self.partial = ""
+        elif partial_text:
+            self.partial = partial_text
+
+        is_speech = bool(self.vad.classify_frames(samples).any())
+        if is_speech:
+            self.trace.mark('speech_start')
+        ended = self.endpointer.update(len(samples) / config.SAMPLE_RATE, is_speech, partial_text, final_text)
+        return ended or self.endpointer.elapsed >= config.STREAM_MAX_UTTERANCE
+
+    @property
+    def text(self) -> str:
+        """Text recognized so far, including the current partial result"""
+        return ' '.join(self.texts + ([self.partial] if self.partial else []))
+
+    def finish(self) -> str:
+        """Flush the recognizer and return the full transcript"""
+        self.trace.mark('endpoint')
+        if self.resampler is not None:
+            tail = to_int16(self.resampler.flush())
+            if len(tail):
+                _, final_text = self.stt.transcribe_stream(tail, self.recognizer)
+                if final_text:
+                    self.texts.append(final_text)
+        remaining = json.loads(self.recognizer.FinalResult()).get('text', '').strip()
+        if remaining:
+            self.texts.append(remaining)
+        self.trace.mark('stt_final')
+        return ' '.join(self.texts).strip()
+
+
+def web_origins(host: str, port: int, secure: bool, addresses: Iterable[Optional[str]] = ()) -> List[str]:
+    """
+    Get the origins a page served by the web server can have
+
+    Args:
+        host: Host the web server is bound to
+        port: Port of the web server
+        secure: True if the web server uses HTTPS
+        addresses: Local addresses it is reachable on, for a wildcard host (None is skipped)
+
+    Returns:
+        Origins as browsers send them, e.g. "https://192.168.1.20:5000"
+    """
+    if host in ("0.0.0.0", "::"):
+        hosts = {"localhost", "127.0.0.1", "::1", socket.gethostname(), socket.getfqdn(),
+                 *filter(None, addresses)}
+    else:
+        hosts = {host}
+
+    scheme = "https" if secure else "http"
+    default_port = 443 if secure else 80
+    origins = []
+    for name in sorted(hosts):
+        name = name.lower()  # Browsers send host names in lower case
+        if ':' in name:
+            name = f"[{name}]"  # IPv6 literal
+        origins.append(f"{scheme}://{name}" if port == default_port else f"{scheme}://{name}:{port}")
+    return origins
+
+
+class StreamServer:
+    """
+    WebSocket server streaming partial transcripts, LLM tokens and sentence audio
+
+    Runs next to the Flask app on its own port and thread. Recognition
+    happens while the user is still talking, so the transcript is ready as
+    soon as they stop; each sentence of the answer is synthesized as soon
+    as the LLM completes it.
+    """
+
+    def __init__(self, stt: SpeechToText, ollama: OllamaClient, sessions: SessionStore,
+                 synthesize: Callable[[str], Future], host: str = "0.0.0.0", port: int = None,
+                 ssl_context=None, tracer: Tracer = None, origins: Optional[Sequence[str]] = None):
+        """
+        Initialize stream server
+
+        Args:
+            stt: Speech recognizer (its model is shared, recognizers are per utterance)
+            ollama: Ollama client
+            sessions: Session store shared with the HTTP routes
+            synthesize: Returns a Future of WAV bytes for a sentence
+            host: Host to bind to
+            port: Port to listen on (uses config if not provided, 0 for any free port)
+            ssl_context: ssl.SSLContext for wss:// (optional)
+            tracer: Latency tracer shared with the HTTP routes (optional)
+            origins: Page origins allowed to connect, from web_origins()
+                     (None skips the check)
+        """
+        self.stt = stt
+        self.ollama = ollama
+        self.sessions = sessions
+        self.synthesize = synthesize
+        self.host = host
+        self.port = config.WEB_STREAM_PORT if port is None else port
+        self.ssl_context = ssl_context
+        self.tracer = tracer or Tracer(enabled=False)
+        self.origins = origins
+        self._server = None
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        """Start serving on a background thread"""
+        # Clients without an Origin header aren't browsers, so they can't be a hostile page
+        origins = None if self.origins is None else [*self.origins, None]
+        self._server = serve(self._handle, self.host, self.port, ssl=self.ssl_context, origins=origins,
+                             max_size=config.STREAM_MAX_MESSAGE_SIZE)
+        self.port = self._server.socket.getsockname()[1]
+        self._thread = threading.Thread(target=self._server.serve_forever, name="stream-server", daemon=True)
+        self._thread.start()
+        protocol = "wss" if self.ssl_context else "ws"
+        print(f"✓ Streaming endpoint on {protocol}://{self.host}:{self.port}")
+
+    def stop(self):
+        """Stop serving"""
+        if self._server is not None:
+            self._server.shutdown()
+            self._server = None
+
+    def _session_for(self, websocket) -> Session:
+        """Find the browser's session from the cookie sent with the handshake"""
+        cookie = SimpleCookie(websocket.request.headers.get('Cookie', ''))
+        morsel = cookie.get(SESSION_COOKIE)
+        return self.sessions.get_or_create(morsel.value if morsel else None)
+
+    def _handle(self, websocket):
+        """Serve one connection (runs on its own thread)"""
+        session = self._session_for(websocket)
+        utterance: Optional[_Utterance] = None
+
+        try:
+            websocket.send(json.dumps({'type': 'ready'}))
+
+            for message in websocket:
+                if isinstance(message, bytes):
+                    # Frames arriving after the server ended the utterance are ignored
+                    if utterance is None:
+                        continue
+
+                    if len(message) % 2:
+                        websocket.send(json.dumps({'type': 'error', 'error': 'PCM data must be 16-bit samples'}))
+                        continue
+
+                    previous = utterance.text
+                    ended = utterance.feed(message)
+                    if utterance.text != previous:
+                        websocket.send(json.dumps({'type': 'partial', 'text': utterance.text}))
+                    if ended:
+                        self._respond(websocket, session, utterance)
+                        utterance = None
+                    continue
+
+                try:
+                    command = json.loads(message)
+                    kind = command.get('type')
+                except (ValueError, AttributeError):
+                    websocket.send(json.dumps({'type': 'error', 'error': 'Invalid command'}))
+                    continue
+
+                if kind == 'start':
+                    session = self.sessions.get(session.id) or session  # Keeps a long-lived connection's session alive
+                    try:
+                        sample_rate = int(command.get('sample_rate', config.SAMPLE_RATE))
+                    except (TypeError, ValueError):
+                        sample_rate = None
+                    if sample_rate is None or not 8000 <= sample_rate <= 192000:
+                        utterance = None
+                        websocket.send(json.dumps({
+                            'type': 'error',
+                            'error': f"Unsupported sample rate: {command.get('sample_rate')}"
+                        }))
+                        continue
+                    utterance = _Utterance(self.stt, sample_rate, trace=self.tracer.start_turn('stream'))
+                elif kind == 'stop' and utterance is not None:
+                    self._respond(websocket, session, utterance)
+                    utterance = None
+                elif kind == 'clear':
+                    with session.lock:
+                        session.clear()
+
+        except ConnectionClosed:
+            pass
+        except Exception as e:
+            print(f"❌ Error in stream connection: {e}")
+            import traceback
+            traceback.print_exc()
+            try:
+                websocket.send(json.dumps({'type': 'error', 'error': str(e)}))
+            except ConnectionClosed:
+                pass
+
+    def _respond(self, websocket, session: Session, utterance: _Utterance):
+        """Stream the answer to a finished utterance"""
+        try:
+            self._stream_answer(websocket, session, utterance.finish(), utterance.trace)
+        finally:
+            utterance.trace.finish()
+
+    def _stream_answer(self, websocket, session: Session, text: str, trace):
+        """Send the transcript, then tokens and sentence audio as they are generated"""
+        websocket.send(json.dumps({'type': 'transcript', 'text': text}))
+        if not text:
+            websocket.send(json.dumps({
+                'type': 'error',
+                'error': 'No speech detected. Please speak louder or check your microphone.'
+            }))
+            return
+
+        print(f"✓ Streamed transcript: \"{text}\"")
+        segmenter = SentenceSegmenter()
+        pending: Deque[Tuple[str, Future]] = deque()
+        pieces = []
+
+        with session.lock:
+            for token in trace_tokens(trace, self.ollama.chat_stream(text, history=session.history)):
+                pieces.append(token)
+                websocket.send(json.dumps({'type': 'token', 'text': token}))
+
+                # Start synthesizing each sentence as soon as it is complete
+                for sentence in segmenter.feed(token):
+                    pending.append((sentence, self.synthesize(sentence)))
+                self._send_audio(websocket, pending, wait=False, trace=trace)
+
+        remaining = segmenter.flush()
+        if remaining:
+            pending.append((remaining, self.synthesize(remaining)))
+        self._send_audio(websocket, pending, wait=True, trace=trace)
+
+        websocket.send(json.dumps({'type': 'done', 'response_text': ''.join(pieces)}))
+
+    @staticmethod
+    def _send_audio(websocket, pending: Deque[Tuple[str, Future]], wait: bool, trace=NULL_TURN):
+        """Send finished sentence audio in order (all of it if wait is True)"""
+        while pending and (wait or pending[0][1].done()):
+            sentence, future = pending.popleft()
+            try:
+                audio = future.result()
+            except Exception as e:
+                websocket.send(json.dumps({'type': 'error', 'error': f"Speech synthesis failed: {e}"}))
+                continue
+            websocket.send(json.dumps({'type': 'audio', 'text': sentence}))
+            websocket.send(audio)
+            trace.mark('tts_first_audio')
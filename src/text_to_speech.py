@@ -2,25 +2,88 @@
 Text-to-Speech - Converts text to speech using pyttsx3
 """
 
+import os
 import pyttsx3
+import queue
+import tempfile
+import threading
 import time
-from typing import Optional
+from typing import Callable, Iterable, Optional, Tuple
+from .sentence_segmenter import SentenceSegmenter
+from .tts_cache import TTSCache
+from .tracing import NULL_TURN
+
+
+def _open_render_target() -> Tuple[int, str]:
+    """
+    Create a private file for one synthesis, in memory where possible
+
+    Returns:
+        Tuple of (file_descriptor, path) - memfd on Linux, otherwise a
+        unique temp file (on tmpfs if /dev/shm exists)
+    """
+    if hasattr(os, 'memfd_create') and os.path.isdir('/proc/self/fd'):
+        try:
+            fd = os.memfd_create('tts')
+            return fd, f'/proc/self/fd/{fd}'
+        except OSError:
+            pass
+
+    directory = '/dev/shm' if os.path.isdir('/dev/shm') else None
+    return tempfile.mkstemp(prefix='tts_', suffix='.wav', dir=directory)
+
+
+def render_to_wav(engine, text: str) -> bytes:
+    """
+    Synthesize text with a pyttsx3 engine and return the WAV file contents
+
+    pyttsx3 drivers can only render to a path, so each call gets its own
+    memory-backed file that is released before returning.
+
+    Args:
+        engine: pyttsx3 engine
+        text: Text to synthesize
+
+    Returns:
+        WAV file contents
+    """
+    fd, path = _open_render_target()
+    try:
+        engine.save_to_file(text, path)
+        engine.runAndWait()
+        with open(path, 'rb') as f:
+            return f.read()
+    finally:
+        os.close(fd)
+        if not path.startswith('/proc/'):
+            try:
+                os.remove(path)
+            except OSError:
+                pass
 
 
 class TextToSpeech:
     """Handles text-to-speech conversion using pyttsx3"""
 
-    def __init__(self, rate: int = 150, volume: float = 0.9):
+    def __init__(self, rate: int = 150, volume: float = 0.9, cache: Optional[TTSCache] = None,
+                 player: Optional[Callable[[bytes], None]] = None, speak_via_player: bool = False):
         """
         Initialize TTS engine
 
         Args:
             rate: Speech rate (words per minute). Default: 150
             volume: Volume level (0.0 to 1.0). Default: 0.9
+            cache: Audio cache for phrases spoken repeatedly (optional)
+            player: Plays WAV bytes, e.g. AudioManager.play_wav (needed to use the cache)
+            speak_via_player: Render all speech to WAV and play it with player instead of
+                              the engine's own audio device (for hardware-free audio backends)
         """
         self.engine = pyttsx3.init()
         self.rate = rate
         self.volume = volume
+        self.cache = cache
+        self.player = player
+        self.speak_via_player = speak_via_player and player is not None
 
         # Configure engine
         self.engine.setProperty('rate', self.rate)
@@ -53,7 +116,20 @@ class TextToSpeech:
 
         print(f"💬 Speaking: {text[:100]}{'...' if len(text) > 100 else ''}")
 
+        # Cached phrases are played directly instead of being synthesized again
+        if self.cache is not None and self.player is not None:
+            audio = self.cache.get(self.cache_key(text))
+            if audio is not None:
+                try:
+                    self.player(audio)
+                    return
+                except Exception as e:
+                    print(f"⚠ Could not play cached audio, synthesizing instead: {e}")
+
         try:
+            if self.speak_via_player:
+                self.player(self.synthesize(text))
+                return
             # Wait 100ms for Bluetooth device latency
             time.sleep(0.1)
             self.engine.say(text)
@@ -61,6 +137,114 @@ class TextToSpeech:
         except Exception as e:
             print(f"❌ Error during speech synthesis: {e}")
 
+    def speak_stream(self, text_stream: Iterable[str], trace=NULL_TURN) -> str:
+        """
+        Speak streamed text sentence by sentence while it is still being generated
+
+        A background thread pulls fragments from text_stream (e.g.
+        OllamaClient.chat_stream) and queues complete sentences; this thread
+        speaks them as they arrive, so the engine stays on the caller's thread.
+
+        Args:
+            text_stream: Iterable of text fragments
+            trace: Turn to mark tts_first_audio and playback_end on
+
+        Returns:
+            The full text that was received
+        """
+        sentences = queue.Queue()
+        pieces = []
+        errors = []
+        done = object()
+
+        def produce():
+            segmenter = SentenceSegmenter()
+            try:
+                for fragment in text_stream:
+                    pieces.append(fragment)
+                    for sentence in segmenter.feed(fragment):
+                        sentences.put(sentence)
+                remaining = segmenter.flush()
+                if remaining:
+                    sentences.put(remaining)
+            except Exception as e:
+                errors.append(e)
+            finally:
+                sentences.put(done)
+
+        producer = threading.Thread(target=produce, name="tts-producer", daemon=True)
+        producer.start()
+
+        first = True
+        while True:
+            sentence = sentences.get()
+            if sentence is done:
+                break
+
+            print(f"💬 Speaking: {sentence[:100]}{'...' if len(sentence) > 100 else ''}")
+            try:
+                if self.speak_via_player:
+                    audio = self.synthesize(sentence)
+                    if first:
+                        first = False
+                        trace.mark('tts_first_audio')
+                    self.player(audio)
+                    continue
+                if first:
+                    # Wait 100ms for Bluetooth device latency (once per response)
+                    time.sleep(0.1)
+                    first = False
+                    trace.mark('tts_first_audio')
+                self.engine.say(sentence)
+                self.engine.runAndWait()
+            except Exception as e:
+                print(f"❌ Error during speech synthesis: {e}")
+        trace.mark('playback_end')
+
+        producer.join()
+        if errors:
+            raise errors[0]
+
+        return ''.join(pieces)
+
+    def synthesize(self, text: str) -> bytes:
+        """
+        Convert text to speech without playing it
+
+        Args:
+            text: The text to synthesize
+
+        Returns:
+            WAV file contents
+        """
+        return render_to_wav(self.engine, text)
+
+    def cache_key(self, text: str) -> str:
+        """Get the cache key for text spoken with the current voice settings"""
+        return TTSCache.make_key(text, self.engine.getProperty('voice'), self.rate, self.volume)
+
+    def prewarm(self, phrases: Iterable[str]) -> int:
+        """
+        Synthesize phrases into the cache ahead of time
+
+        Args:
+            phrases: Fixed phrases that will be spoken later
+
+        Returns:
+            Number of phrases now cached
+        """
+        if self.cache is None:
+            return 0
+
+        count = 0
+        for phrase in phrases:
+            try:
+                self.cache.get_or_synthesize(self.cache_key(phrase), lambda: self.synthesize(phrase))
+                count += 1
+            except Exception as e:
+                print(f"⚠ Could not prewarm \"{phrase}\": {e}")
+        return count
+
     def set_rate(self, rate: int):
         """
         Set speech rate
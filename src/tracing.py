@@ -0,0 +1,205 @@
+"""
+Tracing - Per-turn latency marks for the voice pipeline
+"""
+
+import json
+import os
+import threading
+import time
+from collections import deque
+from datetime import datetime
+from typing import Deque, Dict, Iterable, Iterator, Optional
+import numpy as np
+from . import config
+
+# Pipeline stages in pipeline order. A stage's duration is the time since the
+# latest earlier stage marked before it in the same turn (stages can overlap
+# when streaming, e.g. the first sentence plays before the last token arrives).
+STAGES = (
+    'wake_word',        # Wake word detected (turn start in voice mode)
+    'beep_done',        # Listening beep finished
+    'speech_start',     # First speech frame heard
+    'endpoint',         # User finished speaking
+    'stt_final',        # Final transcript available
+    'llm_request',      # Request sent to Ollama
+    'first_token',      # First token received
+    'last_token',       # Response complete
+    'tts_first_audio',  # First synthesized audio ready / started playing
+    'playback_end',     # Last sentence finished playing
+)
+
+
+class Turn:
+    """Monotonic timestamps of the stages of one conversation turn"""
+
+    def __init__(self, tracer: "Tracer", kind: str):
+        self.tracer = tracer
+        self.kind = kind
+        self.started_at = datetime.now().isoformat(timespec='milliseconds')
+        self.start = time.monotonic()
+        self.marks: Dict[str, float] = {}
+
+    def mark(self, stage: str):
+        """Record that a stage was reached (only the first mark of a stage counts)"""
+        if stage not in self.marks:
+            self.marks[stage] = time.monotonic() - self.start
+
+    def finish(self):
+        """End the turn and hand it to the tracer"""
+        self.tracer.record(self)
+
+    def stage_durations(self) -> Dict[str, float]:
+        """Seconds spent in each marked stage, plus 'total'"""
+        durations = {}
+        earlier = [0.0]
+        for stage in STAGES:
+            if stage in self.marks:
+                offset = self.marks[stage]
+                durations[stage] = offset - max(mark for mark in earlier if mark <= offset)
+                earlier.append(offset)
+        durations['total'] = max(self.marks.values(), default=0.0)
+        return durations
+
+    def to_dict(self) -> dict:
+        """JSON-serializable form of the turn (marks are seconds since turn start)"""
+        return {
+            'kind': self.kind,
+            'started_at': self.started_at,
+            'marks': {stage: round(offset, 4) for stage, offset in self.marks.items()},
+            'stages': {stage: round(duration, 4) for stage, duration in self.stage_durations().items()}
+        }
+
+
+class NullTurn:
+    """Turn that records nothing, handed out when tracing is disabled"""
+
+    kind = None
+    marks: Dict[str, float] = {}
+
+    def mark(self, stage: str):
+        pass
+
+    def finish(self):
+        pass
+
+
+NULL_TURN = NullTurn()
+
+
+def trace_tokens(turn, tokens: Iterable[str]) -> Iterable[str]:
+    """
+    Pass a token stream through, marking llm_request, first_token and last_token
+
+    Args:
+        turn: Turn (or NULL_TURN) to mark
+        tokens: Lazy token stream, e.g. OllamaClient.chat_stream() (the request
+                is sent when iteration starts)
+
+    Returns:
+        The same tokens (the stream itself when tracing is disabled)
+    """
+    if turn is NULL_TURN:
+        return tokens
+    return _traced_tokens(turn, tokens)
+
+
+def _traced_tokens(turn: Turn, tokens: Iterable[str]) -> Iterator[str]:
+    turn.mark('llm_request')
+    for token in tokens:
+        turn.mark('first_token')
+        yield token
+    turn.mark('last_token')
+
+
+class Tracer:
+    """
+    Collects finished turns, exports them as JSON lines and aggregates percentiles
+
+    Only the most recent turns are kept for the percentiles, so memory use
+    is bounded however long the assistant runs.
+    """
+
+    def __init__(self, enabled: bool = None, export_path: Optional[str] = None, window: int = None):
+        """
+        Initialize tracer
+
+        Args:
+            enabled: Record turns at all (uses config if not provided)
+            export_path: File to append one JSON line per turn to (uses config if not provided)
+            window: Number of recent turns aggregated per stage (uses config if not provided)
+        """
+        self.enabled = config.TRACING_ENABLED if enabled is None else enabled
+        self.export_path = export_path if export_path is not None else config.TRACE_FILE
+        self.window = window or config.TRACE_WINDOW
+        self._lock = threading.Lock()
+        self._samples: Dict[str, Deque[float]] = {}
+        self.turns = 0
+
+    def start_turn(self, kind: str):
+        """
+        Start timing a turn
+
+        Args:
+            kind: Where the turn comes from (e.g. "voice", "web", "stream")
+
+        Returns:
+            Turn to mark stages on (NULL_TURN when tracing is disabled)
+        """
+        if not self.enabled:
+            return NULL_TURN
+        return Turn(self, kind)
+
+    def record(self, turn: Turn):
+        """Add a finished turn to the aggregates and the export file"""
+        if not turn.marks:
+            return
+
+        line = json.dumps(turn.to_dict())
+        with self._lock:
+            self.turns += 1
+            for stage, duration in turn.stage_durations().items():
+                samples = self._samples.get(stage)
+                if samples is None:
+                    samples = self._samples[stage] = deque(maxlen=self.window)
+                samples.append(duration)
+
+            if self.export_path:
+                directory = os.path.dirname(self.export_path)
+                if directory:
+                    os.makedirs(directory, exist_ok=True)
+                with open(self.export_path, 'a', encoding='utf-8') as trace_file:
+                    trace_file.write(line + '\n')
+
+    def percentiles(self) -> Dict[str, dict]:
+        """
+        Get latency percentiles per stage over the recent turns
+
+        Returns:
+            Dictionary mapping stage to count, p50, p95 and p99 (seconds)
+        """
+        with self._lock:
+            samples = {stage: list(values) for stage, values in self._samples.items()}
+
+        summary = {}
+        for stage in STAGES + ('total',):
+            if stage not in samples:
+                continue
+            p50, p95, p99 = np.percentile(samples[stage], [50, 95, 99])
+            summary[stage] = {
+                'count': len(samples[stage]),
+                'p50': round(float(p50), 4),
+                'p95': round(float(p95), 4),
+                'p99': round(float(p99), 4)
+            }
+        return summary
+
+    def print_report(self):
+        """Print the per-stage percentiles"""
+        summary = self.percentiles()
+        if not summary:
+            return
+
+        print(f"\n⏱  Latency over the last {min(self.turns, self.window)} turns (seconds)")
+        print(f"   {'stage':<16}{'count':>7}{'p50':>9}{'p95':>9}{'p99':>9}")
+        for stage, stats in summary.items():
+            print(f"   {stage:<16}{stats['count']:>7}{stats['p50']:>9.3f}{stats['p95']:>9.3f}{stats['p99']:>9.3f}")
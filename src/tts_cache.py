@@ -0,0 +1,191 @@
+"""
+TTS Cache - Reuses synthesized audio for repeated phrases
+"""
+
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from typing import Callable, Optional
+from . import config
+
+
+def normalize_text(text: str) -> str:
+    """Collapse whitespace so trivially different strings share an entry"""
+    return ' '.join(text.split())
+
+
+class TTSCache:
+    """
+    Content-addressed LRU cache of synthesized audio
+
+    Entries are keyed by a hash of (normalized text, voice id, rate, volume)
+    and hold WAV bytes. The in-memory part is bounded by a byte budget;
+    entries evicted from memory are kept in spill_dir (if set) and reloaded
+    from there on the next hit.
+    """
+
+    def __init__(self, max_bytes: int = None, spill_dir: str = None):
+        """
+        Initialize cache
+
+        Args:
+            max_bytes: Memory budget for cached audio (uses config if not provided)
+            spill_dir: Directory for entries evicted from memory (uses config if not provided, None disables)
+        """
+        self.max_bytes = max_bytes or config.TTS_CACHE_MAX_BYTES
+        self.spill_dir = spill_dir if spill_dir is not None else config.TTS_CACHE_DIR
+        if self.spill_dir:
+            os.makedirs(self.spill_dir, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, bytes]" = OrderedDict()
+        self.size_bytes = 0
+
+        # Statistics
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def make_key(text: str, voice: Optional[str], rate: int, volume: float) -> str:
+        """
+        Build the cache key for a synthesis request
+
+        Args:
+            text: Text to synthesize
+            voice: Voice id (None for the engine default)
+            rate: Speech rate
+            volume: Volume level
+
+        Returns:
+            Hex digest identifying the audio
+        """
+        identity = '\0'.join((normalize_text(text), voice or 'default', str(rate), f'{volume:.3f}'))
+        return hashlib.sha256(identity.encode('utf-8')).hexdigest()
+
+    def get(self, key: str) -> Optional[bytes]:
+        """
+        Look up cached audio
+
+        Args:
+            key: Key from make_key()
+
+        Returns:
+            WAV bytes, or None on a miss
+        """
+        with self._lock:
+            audio = self._entries.get(key)
+            if audio is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return audio
+
+        audio = self._read_spilled(key)
+        if audio is None:
+            with self._lock:
+                self.misses += 1
+            return None
+
+        with self._lock:
+            self.disk_hits += 1
+        self.put(key, audio)
+        return audio
+
+    def put(self, key: str, audio: bytes):
+        """
+        Add audio to the cache, evicting the least recently used entries if needed
+
+        Args:
+            key: Key from make_key()
+            audio: WAV bytes
+        """
+        if len(audio) > self.max_bytes:
+            self._spill(key, audio)
+            return
+
+        evicted = []
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.size_bytes -= len(old)
+            self._entries[key] = audio
+            self.size_bytes += len(audio)
+
+            while self.size_bytes > self.max_bytes:
+                old_key, old_audio = self._entries.popitem(last=False)
+                self.size_bytes -= len(old_audio)
+                self.evictions += 1
+                evicted.append((old_key, old_audio))
+
+        # Disk writes happen outside the lock
+        for old_key, old_audio in evicted:
+            self._spill(old_key, old_audio)
+
+    def get_or_synthesize(self, key: str, synthesize: Callable[[], bytes]) -> bytes:
+        """
+        Get cached audio or synthesize and cache it
+
+        Args:
+            key: Key from make_key()
+            synthesize: Called on a miss to produce the WAV bytes
+
+        Returns:
+            WAV bytes
+        """
+        audio = self.get(key)
+        if audio is None:
+            audio = synthesize()
+            if audio:
+                self.put(key, audio)
+        return audio
+
+    def _spill_path(self, key: str) -> str:
+        return os.path.join(self.spill_dir, f"{key}.wav")
+
+    def _spill(self, key: str, audio: bytes):
+        """Write an entry to the spill directory (if enabled)"""
+        if not self.spill_dir:
+            return
+        path = self._spill_path(key)
+        if os.path.exists(path):
+            return
+        try:
+            # Write then rename so readers never see a partial file
+            temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(temp_path, 'wb') as f:
+                f.write(audio)
+            os.replace(temp_path, path)
+        except OSError as e:
+            print(f"⚠ Could not spill TTS audio to {self.spill_dir}: {e}")
+
+    def _read_spilled(self, key: str) -> Optional[bytes]:
+        """Read an entry from the spill directory (if enabled and present)"""
+        if not self.spill_dir:
+            return None
+        try:
+            with open(self._spill_path(key), 'rb') as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def get_stats(self) -> dict:
+        """
+        Get cache statistics
+
+        Returns:
+            Dictionary with entry count, memory use, hits, disk hits, misses and evictions
+        """
+        with self._lock:
+            lookups = self.hits + self.disk_hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'bytes': self.size_bytes,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'disk_hits': self.disk_hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': (self.hits + self.disk_hits) / lookups if lookups else 0.0
+            }
@@ -0,0 +1,158 @@
+"""
+TTS Service - Synthesizes speech for concurrent clients on a pool of worker processes
+"""
+
+import multiprocessing
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Optional
+from .text_to_speech import render_to_wav
+from .metrics import REGISTRY
+from . import config
+
+_SYNTHESIS_SECONDS = REGISTRY.histogram(
+    'assistant_tts_synthesis_seconds', 'Time a worker spent synthesizing one text')
+_QUEUE_WAIT_SECONDS = REGISTRY.histogram(
+    'assistant_tts_queue_wait_seconds', 'Time a synthesis job waited for a free worker')
+_FAILURES = REGISTRY.counter(
+    'assistant_tts_failures_total', 'Synthesis jobs that raised an error')
+
+# Engine owned by a worker process (set up by _init_worker)
+_worker_engine = None
+
+
+def _init_worker(rate: int, volume: float):
+    """Create this worker's private pyttsx3 engine"""
+    global _worker_engine
+    import pyttsx3
+    _worker_engine = pyttsx3.init()
+    _worker_engine.setProperty('rate', rate)
+    _worker_engine.setProperty('volume', volume)
+
+
+def _synthesize_job(text: str, submitted_at: float) -> tuple:
+    """
+    Render text to WAV in a worker process
+
+    Returns:
+        Tuple of (queue_wait_seconds, synthesis_seconds, wav_bytes)
+    """
+    started_at = time.monotonic()
+    audio = render_to_wav(_worker_engine, text)
+    return started_at - submitted_at, time.monotonic() - started_at, audio
+
+
+class TTSService:
+    """
+    Speech synthesis shared by many request threads
+
+    pyttsx3 engines are not reentrant, so instead of sharing one engine
+    between server threads each worker process owns its own. Jobs queue up
+    in the executor and callers get a Future for the WAV bytes.
+    """
+
+    def __init__(self, workers: int = None, rate: int = 150, volume: float = 0.9):
+        """
+        Start the worker pool
+
+        Args:
+            workers: Number of worker processes (uses config if not provided)
+            rate: Speech rate (words per minute)
+            volume: Volume level (0.0 to 1.0)
+        """
+        self.workers = workers or config.TTS_WORKERS
+        self.rate = rate
+        self.volume = volume
+        self.voice = None  # Workers use the engine's default voice
+        # Spawned, not forked: by now other threads (e.g. the Ollama warm-up) are
+        # running, and forking a multithreaded process can deadlock the child
+        self._executor = ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker,
+                                             initargs=(rate, volume),
+                                             mp_context=multiprocessing.get_context('spawn'))
+
+        # Metrics
+        self._lock = threading.Lock()
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self.total_queue_wait = 0.0
+        self.max_queue_wait = 0.0
+        self.total_synthesis_time = 0.0
+
+        print(f"\n🔊 TTS service started with {self.workers} worker process(es)")
+
+    def submit(self, text: str) -> Future:
+        """
+        Queue text for synthesis
+
+        Args:
+            text: Text to speak
+
+        Returns:
+            Future resolving to WAV file contents
+        """
+        with self._lock:
+            self.submitted += 1
+
+        result = Future()
+        job = self._executor.submit(_synthesize_job, text, time.monotonic())
+        job.add_done_callback(lambda done: self._finish(done, result))
+        return result
+
+    def synthesize(self, text: str, timeout: Optional[float] = None) -> bytes:
+        """
+        Synthesize text and wait for the audio
+
+        Args:
+            text: Text to speak
+            timeout: Maximum seconds to wait (None waits until done)
+
+        Returns:
+            WAV file contents
+        """
+        return self.submit(text).result(timeout)
+
+    def _finish(self, job: Future, result: Future):
+        """Record metrics for a finished job and pass its audio on"""
+        error = job.exception()
+        if error is not None:
+            with self._lock:
+                self.failed += 1
+            _FAILURES.inc()
+            print(f"❌ Error during speech synthesis: {error}")
+            result.set_exception(error)
+            return
+
+        queue_wait, synthesis_time, audio = job.result()
+        with self._lock:
+            self.completed += 1
+            self.total_queue_wait += queue_wait
+            self.max_queue_wait = max(self.max_queue_wait, queue_wait)
+            self.total_synthesis_time += synthesis_time
+        _QUEUE_WAIT_SECONDS.observe(queue_wait)
+        _SYNTHESIS_SECONDS.observe(synthesis_time)
+        result.set_result(audio)
+
+    def get_stats(self) -> dict:
+        """
+        Get service statistics
+
+        Returns:
+            Dictionary with job counts and average/max queue wait and synthesis time
+        """
+        with self._lock:
+            return {
+                'workers': self.workers,
+                'submitted': self.submitted,
+                'completed': self.completed,
+                'failed': self.failed,
+                'pending': self.submitted - self.completed - self.failed,
+                'avg_queue_wait': self.total_queue_wait / self.completed if self.completed else 0.0,
+                'max_queue_wait': self.max_queue_wait,
+                'avg_synthesis_time': self.total_synthesis_time / self.completed if self.completed else 0.0
+            }
+
+    def shutdown(self):
+        """Stop the worker processes (waits for queued jobs)"""
+        self._executor.shutdown(wait=True)
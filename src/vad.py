@@ -0,0 +1,177 @@
+"""
+Voice Activity Detection - Gates silence away from the speech recognizer
+"""
+
+import numpy as np
+from typing import Optional, Tuple
+from .metrics import REGISTRY
+from . import config
+
+_ACTIVE_SECONDS = REGISTRY.counter(
+    'assistant_vad_active_seconds_total', 'Seconds of audio the VAD passed on to the recognizer '
+    '(including the lead-in chunk at speech onset)')
+_IDLE_SECONDS = REGISTRY.counter(
+    'assistant_vad_idle_seconds_total', 'Seconds of audio the VAD kept from the recognizer as silence')
+
+
+class VoiceActivityDetector:
+    """
+    Streaming energy/zero-crossing VAD with an adaptive noise floor
+
+    Each chunk is split into short frames that are classified in one
+    vectorized pass. Chunks containing speech, plus a hangover period after
+    speech ends and one chunk of lead-in before it starts, are passed on;
+    everything else is dropped before it reaches Vosk.
+    """
+
+    def __init__(self, sample_rate: int = None, frame_duration: float = None, energy_ratio: float = None,
+                 min_energy: float = None, hangover: float = None, reset_silence: float = None,
+                 max_noise_zcr: float = 0.35, adapt_rate: float = 0.05):
+        """
+        Initialize VAD
+
+        Args:
+            sample_rate: Audio sample rate (uses config if not provided)
+            frame_duration: Analysis frame length in seconds
+            energy_ratio: How many times louder than the noise floor speech must be
+            min_energy: Minimum RMS (int16 scale) ever treated as speech
+            hangover: Seconds of audio still passed on after speech stops
+            reset_silence: Seconds of silence after which the recognizer should be reset
+            max_noise_zcr: Zero-crossing rate above which quiet frames count as hiss
+            adapt_rate: How fast the noise floor follows the background level (0-1)
+        """
+        self.sample_rate = sample_rate or config.SAMPLE_RATE
+        self.frame_size = int((frame_duration or config.VAD_FRAME_DURATION) * self.sample_rate)
+        self.energy_ratio = energy_ratio or config.VAD_ENERGY_RATIO
+        self.min_energy = min_energy if min_energy is not None else config.VAD_MIN_ENERGY
+        self.hangover_samples = int((hangover if hangover is not None else config.VAD_HANGOVER) * self.sample_rate)
+        self.reset_samples = int((reset_silence or config.VAD_RESET_SILENCE) * self.sample_rate)
+        self.max_noise_zcr = max_noise_zcr
+        self.adapt_rate = adapt_rate
+
+        self.noise_floor = None
+        self.is_active = False
+        self._hangover_left = 0
+        self._silence_samples = 0
+        self._previous_chunk = np.zeros(0, dtype=np.int16)
+        self._previous_length = 0
+
+        # Duty cycle counters
+        self.active_samples = 0
+        self.total_samples = 0
+        self.resets = 0
+
+    def reset(self):
+        """Close the gate and forget the previous chunk (the noise floor is kept)"""
+        self.is_active = False
+        self._hangover_left = 0
+        self._silence_samples = 0
+        self._previous_length = 0
+
+    def classify_frames(self, audio_chunk: np.ndarray) -> np.ndarray:
+        """
+        Classify each frame of a chunk as speech or non-speech
+
+        Args:
+            audio_chunk: int16 audio samples
+
+        Returns:
+            Boolean array with one entry per full frame
+        """
+        num_frames = len(audio_chunk) // self.frame_size
+        if num_frames == 0:
+            return np.zeros(0, dtype=bool)
+
+        frames = audio_chunk[:num_frames * self.frame_size].reshape(num_frames, self.frame_size)
+        frames = frames.astype(np.float32)
+        energy = np.sqrt(np.mean(frames * frames, axis=1))
+        signs = np.signbit(frames)
+        zcr = np.mean(signs[:, 1:] != signs[:, :-1], axis=1)
+
+        if self.noise_floor is None:
+            self.noise_floor = float(np.median(energy))
+
+        threshold = max(self.noise_floor * self.energy_ratio, self.min_energy)
+
+        # Loud frames are speech unless they look like broadband hiss just over the threshold
+        speech = (energy > threshold) & ~((zcr > self.max_noise_zcr) & (energy < 2 * threshold))
+
+        # Track the background level from non-speech frames only
+        quiet = energy[~speech]
+        if quiet.size:
+            weight = self.adapt_rate * quiet.size / num_frames
+            self.noise_floor += weight * (float(np.median(quiet)) - self.noise_floor)
+
+        return speech
+
+    def process(self, audio_chunk: np.ndarray) -> Tuple[Optional[np.ndarray], bool]:
+        """
+        Gate one chunk of audio
+
+        Args:
+            audio_chunk: int16 audio samples
+
+        Returns:
+            Tuple of (audio_to_recognize, reset_recognizer)
+            - audio_to_recognize: Chunk (with lead-in on speech onset) or None during silence
+            - reset_recognizer: True once per long silence; the caller should call Reset()
+        """
+        count = len(audio_chunk)
+        was_active = self.is_active
+        reset = False
+
+        if self.classify_frames(audio_chunk).any():
+            self._hangover_left = self.hangover_samples
+            self._silence_samples = 0
+            self.is_active = True
+        else:
+            self.is_active = self._hangover_left > 0
+            self._hangover_left -= count
+            self._silence_samples += count
+
+            if self._silence_samples >= self.reset_samples and self._silence_samples - count < self.reset_samples:
+                self.resets += 1
+                reset = True
+
+        self.total_samples += count
+
+        output = None
+        if self.is_active:
+            output = audio_chunk
+            if not was_active and self._previous_length:
+                # Speech onset: include the chunk before it so the first phoneme isn't clipped
+                output = np.concatenate((self._previous_chunk[:self._previous_length], audio_chunk))
+            self.active_samples += len(output)
+            _ACTIVE_SECONDS.inc(len(output) / self.sample_rate)
+        else:
+            _IDLE_SECONDS.inc(count / self.sample_rate)
+
+        # Keep a private copy; the incoming chunk may be a view that gets overwritten
+        if len(self._previous_chunk) < count:
+            self._previous_chunk = np.empty(count, dtype=np.int16)
+        self._previous_chunk[:count] = audio_chunk
+        self._previous_length = count
+
+        return output, reset
+
+    @property
+    def duty_cycle(self) -> float:
+        """Fraction of processed audio that was passed on to the recognizer"""
+        if self.total_samples == 0:
+            return 0.0
+        return min(1.0, self.active_samples / self.total_samples)
+
+    def get_stats(self) -> dict:
+        """
+        Get VAD statistics
+
+        Returns:
+            Dictionary with duty cycle, active/idle seconds, noise floor and reset count
+        """
+        return {
+            'duty_cycle': self.duty_cycle,
+            'active_seconds': self.active_samples / self.sample_rate,
+            'idle_seconds': max(0, self.total_samples - self.active_samples) / self.sample_rate,
+            'noise_floor': self.noise_floor,
+            'resets': self.resets
+        }
@@ -10,18 +10,30 @@ A voice-activated assistant that uses:
 import sys
 import time
 from datetime import datetime
+from .audio_backends import AudioBackend
 from .audio_manager import AudioManager
 from .wake_word_detector import WakeWordDetector
 from .speech_to_text import SpeechToText
 from .text_to_speech import TextToSpeech
 from .ollama_client import OllamaClient
+from .tts_cache import TTSCache
+from .tracing import Tracer, trace_tokens
 from . import config
 
 
 class VoiceAssistant:
     """Main voice assistant controller"""
 
-    def __init__(self, interactive_audio_setup: bool = False, model: str = None, test_devices: bool = False):
+    # Fixed phrases, synthesized once at startup and played from the TTS cache
+    PHRASES = {
+        'no_speech': "I didn't hear anything. Please try again.",
+        'goodbye': "Goodbye!",
+        'no_response': "Sorry, I couldn't generate a response.",
+        'error': "Sorry, an error occurred. Please try again.",
+    }
+
+    def __init__(self, interactive_audio_setup: bool = False, model: str = None, test_devices: bool = False,
+                 audio_backend: AudioBackend = None):
         """
         Initialize all components
 
@@ -29,24 +41,38 @@ class VoiceAssistant:
             interactive_audio_setup: If True, prompt user to select audio devices
             model: Ollama model name to use (uses config default if not provided)
             test_devices: If True, test microphone and speaker after setup
+            audio_backend: Audio input/output (uses config.AUDIO_BACKEND if not provided)
         """
         print("=" * 60)
         print("🎙️  OLLAMA VOICE ASSISTANT")
         print("=" * 60)
 
         try:
+            # Start loading the LLM first so it overlaps with audio setup and the Vosk load
+            self.ollama = OllamaClient(model=model)
+            if config.OLLAMA_WARM_UP:
+                self.ollama.start_warm_up()
+
             # Initialize audio manager
-            self.audio_manager = AudioManager(interactive_setup=interactive_audio_setup)
+            self.audio_manager = AudioManager(interactive_setup=interactive_audio_setup, backend=audio_backend)
 
             # Test devices if requested
             if test_devices:
                 self.audio_manager.test_devices()
 
             # Initialize other components
-            self.wake_word_detector = WakeWordDetector()
             self.stt = SpeechToText()
-            self.tts = TextToSpeech()
-            self.ollama = OllamaClient(model=model)
+            self.wake_word_detector = WakeWordDetector(stt=self.stt)
+            tts_cache = TTSCache() if config.TTS_CACHE_ENABLED else None
+            # Without audio hardware, speech is rendered and handed to the backend like any other sound
+            self.tts = TextToSpeech(cache=tts_cache, player=self.audio_manager.play_wav,
+                                    speak_via_player=not self.audio_manager.backend.hardware)
+            if tts_cache is not None:
+                cached = self.tts.prewarm(self.PHRASES.values())
+                print(f"✓ Prewarmed {cached}/{len(self.PHRASES)} spoken phrases")
+
+            # Per-turn latency tracing (a no-op unless enabled in config)
+            self.tracer = Tracer()
 
             # Session state
             self.session_active = False
@@ -70,11 +96,17 @@ class VoiceAssistant:
             print(f"   3. Model is available: {config.OLLAMA_MODEL}")
             return
 
+        # Don't announce readiness while the model is still loading
+        self.ollama.wait_for_warm_up()
+
         print("\n🚀 Voice Assistant is ready!")
         print(f"   Say '{config.WAKE_WORD}' to activate")
         print("\n" + "-" * 60 + "\n")
 
         try:
+            # Keep one input stream open for the whole session
+            self.audio_manager.start_capture()
+
             while True:
                 # Listen for wake word
                 if self.wake_word_detector.listen_for_wake_word(self.audio_manager):
@@ -89,24 +121,30 @@ class VoiceAssistant:
             print(f"\n❌ Error in main loop: {e}")
             import traceback
             traceback.print_exc()
+        finally:
+            self.audio_manager.stop_capture()
+            self.tracer.print_report()
 
     def handle_interaction(self):
         """Handle a single voice interaction"""
+        turn = self.tracer.start_turn('voice')
+        turn.mark('wake_word')
         try:
             # Play beep to indicate listening
             print("\n🔔 *beep*")
             self.audio_manager.play_beep()
+            turn.mark('beep_done')
 
             # Listen for user speech
             user_speech = self.stt.listen_for_speech(
                 self.audio_manager,
                 timeout=10.0,
-                silence_threshold=2.0
+                trace=turn
             )
 
             if not user_speech:
                 print("❌ No speech detected")
-                self.tts.speak("I didn't hear anything. Please try again.")
+                self.tts.speak(self.PHRASES['no_speech'])
                 return
 
             print(f"\n💭 You said: {user_speech}")
@@ -114,21 +152,19 @@ class VoiceAssistant:
             # Check for exit commands
             if self._is_exit_command(user_speech):
                 print("\n👋 Ending session...")
-                self.tts.speak("Goodbye!")
+                self.tts.speak(self.PHRASES['goodbye'])
                 self.ollama.clear_context()
                 self.session_active = False
                 return
 
-            # Get response from Ollama
+            # Stream the response from Ollama and speak each sentence as soon as it is complete
             print("\n🤔 Thinking...")
-            response = self.ollama.chat(user_speech, maintain_context=True)
+            tokens = trace_tokens(turn, self.ollama.chat_stream(user_speech, maintain_context=True))
+            response = self.tts.speak_stream(tokens, trace=turn)
 
             if response:
                 print(f"\n🤖 Assistant: {response}\n")
 
-                # Speak the response
-                self.tts.speak(response)
-
                 # Update session state
                 if not self.session_active:
                     self.session_active = True
@@ -136,18 +172,21 @@ class VoiceAssistant:
 
                 # Show context size
                 context_size = self.ollama.get_context_size()
-                print(f"\n📊 Context: {context_size // 2} exchanges in history")
+                print(f"\n📊 Context: {context_size // 2} exchanges in history "
+                      f"(~{self.ollama.conversation_history.tokens} tokens)")
             else:
                 print("\n❌ No response from Ollama")
-                self.tts.speak("Sorry, I couldn't generate a response.")
+                self.tts.speak(self.PHRASES['no_response'])
 
         except Exception as e:
             print(f"\n❌ Error during interaction: {e}")
             import traceback
             traceback.print_exc()
-            self.tts.speak("Sorry, an error occurred. Please try again.")
+            self.tts.speak(self.PHRASES['error'])
 
         finally:
+            turn.finish()
+
             # Ready for next wake word
             print("\n" + "-" * 60)
             print(f"👂 Listening for wake word: '{config.WAKE_WORD}'...")
@@ -3,30 +3,61 @@ Wake Word Detector - Detects wake word using Vosk
 """
 
 import json
+from typing import Optional
 from vosk import KaldiRecognizer
-from .speech_to_text import SpeechToText
+from .speech_to_text import SpeechToText, as_waveform
+from .vad import VoiceActivityDetector
 from . import config
 
 
 class WakeWordDetector:
     """Detects wake word from audio stream"""
 
-    def __init__(self, wake_word: str = None, threshold: float = None):
+    def __init__(self, wake_word: str = None, threshold: float = None, stt: SpeechToText = None,
+                 use_grammar: bool = None, use_vad: bool = None):
         """
         Initialize wake word detector
 
         Args:
             wake_word: The wake word to detect (e.g., "hello lamma")
             threshold: Confidence threshold (not used with Vosk keyword matching)
+            stt: SpeechToText instance to share (creates one if not provided)
+            use_grammar: Restrict decoding to the wake word (uses config if not provided)
+            use_vad: Skip silent audio instead of decoding it (uses config if not provided)
         """
         self.wake_word = (wake_word or config.WAKE_WORD).lower().strip()
         self.threshold = threshold or config.WAKE_WORD_THRESHOLD
+        self.use_grammar = config.WAKE_WORD_USE_GRAMMAR if use_grammar is None else use_grammar
 
-        # Initialize speech recognition
-        self.stt = SpeechToText()
+        # Voice activity gate in front of the always-on recognizer
+        use_vad = config.VAD_ENABLED if use_vad is None else use_vad
+        self.vad = VoiceActivityDetector() if use_vad else None
+
+        # Initialize speech recognition (the Vosk model itself is shared via the model registry)
+        self.stt = stt or SpeechToText()
 
         print(f"\n🎯 Wake Word Detector initialized")
         print(f"   Wake word: '{self.wake_word}'")
+        print(f"   Mode: {'grammar' if self.use_grammar else 'full vocabulary'}"
+              f"{' + VAD' if self.vad else ''}")
+
+    def get_grammar(self) -> list:
+        """
+        Get the phrases the wake word recognizer is restricted to
+
+        Returns:
+            The wake word plus "[unk]" to absorb all other speech
+        """
+        return [self.wake_word, "[unk]"]
+
+    def create_recognizer(self):
+        """
+        Create a recognizer for wake word spotting
+
+        Returns:
+            Grammar-constrained KaldiRecognizer, or a full vocabulary one if grammar mode is off
+        """
+        return self.stt.create_recognizer(self.get_grammar() if self.use_grammar else None)
 
     def listen_for_wake_word(self, audio_manager) -> bool:
         """
@@ -38,9 +69,13 @@ class WakeWordDetector:
         Returns:
             True when wake word is detected
         """
-        recognizer = self.stt.create_recognizer()
+        # The full vocabulary recognizer is only used by STT after the hit
+        recognizer = self.create_recognizer()
         chunk_duration = 0.5  # 500ms chunks for wake word detection
 
+        if self.vad:
+            self.vad.reset()
+
         print(f"\n👂 Listening for wake word: '{self.wake_word}'...")
         print("   (Press Ctrl+C to exit)")
 
@@ -49,41 +84,76 @@ class WakeWordDetector:
         def process_chunk(audio_chunk):
             nonlocal wake_word_detected
 
-            # Convert to bytes
-            audio_bytes = audio_chunk.tobytes()
-
-            # Process with Vosk
-            if recognizer.AcceptWaveform(audio_bytes):
-                # Final result
-                result = json.loads(recognizer.Result())
-                text = result.get('text', '').lower().strip()
-
-                if text:
-                    # Check if wake word is in the recognized text
-                    if self._matches_wake_word(text):
-                        print(f"\n✓ Wake word detected: '{text}'")
-                        wake_word_detected = True
-                        return False  # Stop listening
-            else:
-                # Partial result - also check for wake word
-                result = json.loads(recognizer.PartialResult())
-                partial = result.get('partial', '').lower().strip()
-
-                if partial and self._matches_wake_word(partial):
-                    print(f"\n✓ Wake word detected: '{partial}'")
-                    wake_word_detected = True
-                    return False  # Stop listening
+            detected_text = self.process_audio(recognizer, audio_chunk)
+            if detected_text is not None:
+                print(f"\n✓ Wake word detected: '{detected_text}'")
+                wake_word_detected = True
+                return False  # Stop listening
 
             return True  # Continue listening
 
         try:
-            audio_manager.record_stream(process_chunk, chunk_duration=chunk_duration)
+            position = audio_manager.record_stream(process_chunk, chunk_duration=chunk_duration,
+                                                   name="wake_word")
         except KeyboardInterrupt:
             print("\n\nWake word detection stopped by user")
             return False
 
+        if wake_word_detected:
+            # STT starts right after the wake word, so speech that follows it isn't lost
+            audio_manager.mark_wake_word(position)
+
+            if self.vad:
+                print(f"   VAD duty cycle: {self.vad.duty_cycle:.1%} of audio decoded")
+
         return wake_word_detected
 
+    def process_audio(self, recognizer, audio_chunk) -> Optional[str]:
+        """
+        Feed one chunk to the recognizer and check for the wake word
+
+        Args:
+            recognizer: Recognizer from create_recognizer()
+            audio_chunk: int16 audio samples
+
+        Returns:
+            The recognized text if it contains the wake word, otherwise None
+        """
+        if self.vad:
+            audio_chunk, reset = self.vad.process(audio_chunk)
+            if reset:
+                # Drop stale hypotheses after a long silence
+                recognizer.Reset()
+            if audio_chunk is None:
+                return None
+
+        # Process with Vosk (the chunk is handed over without copying)
+        if recognizer.AcceptWaveform(as_waveform(audio_chunk)):
+            # Final result
+            text = json.loads(recognizer.Result()).get('text', '')
+        else:
+            # Partial result - also check for wake word
+            text = json.loads(recognizer.PartialResult()).get('partial', '')
+
+        # Grammar mode reports everything else as [unk]
+        text = ' '.join(word for word in text.lower().split() if word != '[unk]')
+
+        if text and self._matches_wake_word(text):
+            return text
+        return None
+
+    def get_stats(self) -> dict:
+        """
+        Get wake word detector statistics
+
+        Returns:
+            Dictionary with the mode and VAD idle/active duty cycle
+        """
+        return {
+            'mode': 'grammar' if self.use_grammar else 'full',
+            'vad': self.vad.get_stats() if self.vad else None
+        }
+
     def _matches_wake_word(self, text: str) -> bool:
         """
         Check if text contains the wake word
@@ -2,18 +2,26 @@
 Web Server - Flask server for web-based voice assistant interface
 """
 
-import os
 import io
-import tempfile
+import ssl
 import wave
 import socket
-from flask import Flask, render_template, request, jsonify, send_file
+import time
+from concurrent.futures import Future
+from flask import Flask, Response, render_template, request, jsonify, send_file, g
 from flask_cors import CORS
 import numpy as np
 
 from .speech_to_text import SpeechToText
-from .text_to_speech import TextToSpeech
+from .tts_service import TTSService
+from .tts_cache import TTSCache
 from .ollama_client import OllamaClient
+from .model_registry import get_model_stats
+from .response_audio_store import ResponseAudioStore
+from .session_store import SESSION_COOKIE, Session, SessionStore
+from .stream_server import StreamServer, web_origins
+from .tracing import Tracer
+from .metrics import REGISTRY, CONTENT_TYPE
 from . import config
 
 
@@ -45,69 +53,115 @@ class WebServer:
 
         # Initialize components
         print("\n🌐 Initializing web server components...")
-        self.stt = SpeechToText()
-        self.tts = TextToSpeech()
         self.ollama = OllamaClient(model=model)
+        if config.OLLAMA_WARM_UP:
+            self.ollama.start_warm_up()  # Overlaps with the Vosk model load
+        self.stt = SpeechToText()
+        self.tts = TTSService()  # Engines in worker processes, safe for concurrent requests
+        self.tts_cache = TTSCache() if config.TTS_CACHE_ENABLED else None
+
+        # Conversation context, one per browser
+        self.sessions = SessionStore()
+
+        # Synthesized replies waiting to be fetched by the browser
+        self.response_audio = ResponseAudioStore()
 
-        # Conversation context
-        self.conversation_history = []
+        # Per-turn latency tracing (a no-op unless enabled in config)
+        self.tracer = Tracer()
+
+        # WebSocket streaming port, set once the stream server is running
+        self.stream_port = None
 
         # Register routes
         self._register_routes()
+        if config.METRICS_ENABLED:
+            self._register_metrics()
 
         print(f"✓ Web server initialized")
 
     def _register_routes(self):
         """Register Flask routes"""
 
+        @self.app.after_request
+        def set_session_cookie(response):
+            """Give new clients the id of the session created for them"""
+            session = g.get('session')
+            if session is not None and request.cookies.get(SESSION_COOKIE) != session.id:
+                response.set_cookie(SESSION_COOKIE, session.id, httponly=True, samesite='Lax')
+            return response
+
         @self.app.route('/')
         def index():
             """Serve the main page"""
-            return render_template('index.html', wake_word=config.WAKE_WORD)
+            # Start the session here so the WebSocket handshake carries its cookie
+            self._current_session()
+            return render_template('index.html', wake_word=config.WAKE_WORD, stream_port=self.stream_port)
 
         @self.app.route('/api/process_audio', methods=['POST'])
         def process_audio():
             """
             Process audio from the browser
-            Expects: WAV audio file
+            Expects: raw 16-bit mono PCM (application/octet-stream) with the
+                     sample rate in the X-Sample-Rate header, or a WAV file
+                     uploaded as multipart form field 'audio'
             Returns: JSON with transcribed text and response
             """
+            # The upload arrives once the user has stopped talking
+            turn = self.tracer.start_turn('web')
+            turn.mark('endpoint')
             try:
-                # Get audio file from request
-                if 'audio' not in request.files:
-                    return jsonify({'error': 'No audio file provided'}), 400
+                if request.mimetype == 'application/octet-stream':
+                    # Compact upload: the browser already converted to 16 kHz int16
+                    try:
+                        framerate = int(request.headers.get('X-Sample-Rate', config.SAMPLE_RATE))
+                    except ValueError:
+                        return jsonify({'error': 'Invalid X-Sample-Rate header'}), 400
+                    if not 8000 <= framerate <= 192000:
+                        return jsonify({'error': f'Unsupported sample rate: {framerate}'}), 400
+
+                    audio_bytes = request.get_data()
+                    if not audio_bytes:
+                        return jsonify({'error': 'No audio data provided'}), 400
+                    if len(audio_bytes) % 2:
+                        return jsonify({'error': 'PCM data must be 16-bit samples'}), 400
+                    audio_array = np.frombuffer(audio_bytes, dtype='<i2')
+                else:
+                    # Get audio file from request
+                    if 'audio' not in request.files:
+                        return jsonify({'error': 'No audio file provided'}), 400
 
-                audio_file = request.files['audio']
+                    audio_file = request.files['audio']
 
-                # Read audio data
-                audio_bytes = audio_file.read()
+                    # Read audio data
+                    audio_bytes = audio_file.read()
 
-                # Parse WAV file
-                with io.BytesIO(audio_bytes) as wav_io:
-                    with wave.open(wav_io, 'rb') as wav_file:
-                        # Get audio parameters
-                        channels = wav_file.getnchannels()
-                        sample_width = wav_file.getsampwidth()
-                        framerate = wav_file.getframerate()
+                    # Parse WAV file
+                    with io.BytesIO(audio_bytes) as wav_io:
+                        with wave.open(wav_io, 'rb') as wav_file:
+                            # Get audio parameters
+                            channels = wav_file.getnchannels()
+                            sample_width = wav_file.getsampwidth()
+                            framerate = wav_file.getframerate()
 
-                        # Read audio frames
-                        audio_data = wav_file.readframes(wav_file.getnframes())
+                            # Read audio frames
+                            audio_data = wav_file.readframes(wav_file.getnframes())
 
-                        # Convert to numpy array
-                        if sample_width == 2:  # 16-bit
-                            audio_array = np.frombuffer(audio_data, dtype=np.int16)
-                        else:
-                            return jsonify({'error': f'Unsupported sample width: {sample_width}'}), 400
+                            # Convert to numpy array
+                            if sample_width == 2:  # 16-bit
+                                audio_array = np.frombuffer(audio_data, dtype=np.int16)
+                            else:
+                                return jsonify({'error': f'Unsupported sample width: {sample_width}'}), 400
 
-                        # Convert stereo to mono if needed
-                        if channels == 2:
-                            audio_array = audio_array.reshape(-1, 2).mean(axis=1).astype(np.int16)
+                            # Convert stereo to mono if needed
+                            if channels == 2:
+                                audio_array = audio_array.reshape(-1, 2).mean(axis=1).astype(np.int16)
 
                 print(f"\n📥 Received audio: {len(audio_array)} samples at {framerate} Hz")
 
                 # Transcribe audio
                 print("🔄 Transcribing audio...")
                 text = self.stt.transcribe_audio(audio_array, source_sample_rate=framerate)
+                turn.mark('stt_final')
 
                 if not text:
                     return jsonify({
@@ -121,41 +175,30 @@ class WebServer:
                 # In web mode, we can skip wake word requirement or make it optional
                 # For now, let's process all audio
 
-                # Get response from Ollama
+                # Get response from Ollama with this client's conversation
                 print("🤖 Getting response from Ollama...")
-                self.conversation_history.append({"role": "user", "content": text})
-
-                response = self.ollama.chat(self.conversation_history)
+                session = self._current_session()
+                with session.lock:
+                    turn.mark('llm_request')
+                    response = self.ollama.chat(text, history=session.history)
+                    turn.mark('first_token')  # Not streamed: the whole answer arrives at once
+                    turn.mark('last_token')
 
                 if response:
-                    self.conversation_history.append({"role": "assistant", "content": response})
                     print(f"✓ Response: \"{response[:100]}...\"")
                 else:
                     response = "I'm sorry, I couldn't generate a response."
 
-                # Generate audio response
+                # Generate audio response once; the browser fetches it by id
                 print("🔊 Generating audio response...")
-                # Save TTS to temporary file
-                temp_audio_path = os.path.join(tempfile.gettempdir(), 'tts_response.wav')
-
-                # Use pyttsx3 to save to file
-                self.tts.engine.save_to_file(response, temp_audio_path)
-                self.tts.engine.runAndWait()
-
-                # Read the generated audio file
-                with open(temp_audio_path, 'rb') as f:
-                    audio_response = f.read()
-
-                # Clean up temp file
-                try:
-                    os.remove(temp_audio_path)
-                except:
-                    pass
+                response_id = self.response_audio.put(self._synthesize(response))
+                turn.mark('tts_first_audio')
 
                 return jsonify({
                     'success': True,
                     'transcribed_text': text,
                     'response_text': response,
+                    'response_id': response_id,
                     'has_audio': True
                 })
 
@@ -164,31 +207,34 @@ class WebServer:
                 import traceback
                 traceback.print_exc()
                 return jsonify({'error': str(e)}), 500
+            finally:
+                turn.finish()
 
         @self.app.route('/api/get_response_audio', methods=['POST'])
         def get_response_audio():
             """
-            Generate and return audio for a text response
+            Return the audio for a response
+            Expects: JSON with 'response_id' from /api/process_audio,
+                     or 'text' to synthesize (e.g. after the stored audio expired)
             """
             try:
-                data = request.get_json()
+                data = request.get_json() or {}
+                response_id = data.get('response_id')
                 text = data.get('text', '')
 
-                if not text:
-                    return jsonify({'error': 'No text provided'}), 400
-
-                print(f"🔊 Generating audio for: \"{text[:50]}...\"")
+                audio = self.response_audio.get(response_id) if response_id else None
 
-                # Generate audio response
-                temp_audio_path = os.path.join(tempfile.gettempdir(), 'tts_response.wav')
+                if audio is None:
+                    if not text:
+                        if response_id:
+                            return jsonify({'error': 'Response audio not found or expired'}), 404
+                        return jsonify({'error': 'No text provided'}), 400
 
-                # Use pyttsx3 to save to file
-                self.tts.engine.save_to_file(text, temp_audio_path)
-                self.tts.engine.runAndWait()
+                    print(f"🔊 Generating audio for: \"{text[:50]}...\"")
+                    audio = self._synthesize(text)
 
-                # Return the audio file
                 return send_file(
-                    temp_audio_path,
+                    io.BytesIO(audio),
                     mimetype='audio/wav',
                     as_attachment=False,
                     download_name='response.wav'
@@ -202,22 +248,126 @@ class WebServer:
 
         @self.app.route('/api/clear_history', methods=['POST'])
         def clear_history():
-            """Clear conversation history"""
-            self.conversation_history = []
+            """Clear this client's conversation history"""
+            session = self.sessions.get(request.cookies.get(SESSION_COOKIE))
+            if session is not None:
+                with session.lock:
+                    session.clear()
             return jsonify({'success': True, 'message': 'Conversation history cleared'})
 
         @self.app.route('/api/status', methods=['GET'])
         def status():
             """Get server status"""
+            session = self.sessions.get(request.cookies.get(SESSION_COOKIE))
             return jsonify({
                 'status': 'running',
                 'wake_word': config.WAKE_WORD,
                 'model': self.ollama.model,
-                'messages_in_history': len(self.conversation_history)
+                'messages_in_history': len(session.history) if session else 0,
+                'context_tokens': session.history.tokens if session else 0,
+                'sessions': self.sessions.get_stats(),
+                'ollama_cold_loads': self.ollama.cold_loads,
+                'ollama_last_stats': self.ollama.last_stats,
+                'vosk_models': get_model_stats(),
+                'response_audio': self.response_audio.get_stats(),
+                'tts': self.tts.get_stats(),
+                'tts_cache': self.tts_cache.get_stats() if self.tts_cache else None,
+                'latency': self.tracer.percentiles()
             })
 
+    def _register_metrics(self):
+        """Count requests per route and expose all metrics at /metrics"""
+        requests_total = REGISTRY.counter(
+            'assistant_http_requests_total', 'HTTP requests handled', ('route', 'method', 'status'))
+        errors_total = REGISTRY.counter(
+            'assistant_http_request_errors_total', 'HTTP requests answered with a server error', ('route',))
+        request_seconds = REGISTRY.histogram(
+            'assistant_http_request_seconds', 'Time to handle an HTTP request', ('route',))
+
+        # State other components already track, read when scraped
+        REGISTRY.gauge('assistant_active_sessions', 'Live browser sessions', function=lambda: len(self.sessions))
+        REGISTRY.gauge('assistant_tts_queue_depth', 'Synthesis jobs submitted but not finished',
+                       function=lambda: self.tts.get_stats()['pending'])
+        REGISTRY.gauge('assistant_response_audio_pending', 'Synthesized replies waiting to be fetched',
+                       function=lambda: len(self.response_audio))
+        if self.tts_cache is not None:
+            REGISTRY.counter('assistant_tts_cache_lookups_total', 'TTS cache lookups by result', ('result',),
+                             function=self._tts_cache_lookups)
+            REGISTRY.gauge('assistant_tts_cache_bytes', 'Audio held in the TTS cache memory',
+                           function=lambda: self.tts_cache.get_stats()['bytes'])
+
+        @self.app.before_request
+        def start_timer():
+            g.request_started = time.perf_counter()
+
+        @self.app.after_request
+        def record_request(response):
+            # Label by route pattern, not path, so ids don't create new series
+            route = request.url_rule.rule if request.url_rule else 'unmatched'
+            requests_total.inc(route=route, method=request.method, status=response.status_code)
+            if response.status_code >= 500:
+                errors_total.inc(route=route)
+            started = g.get('request_started')
+            if started is not None:
+                request_seconds.observe(time.perf_counter() - started, route=route)
+            return response
+
+        @self.app.route('/metrics', methods=['GET'])
+        def metrics():
+            """Prometheus scrape endpoint"""
+            return Response(REGISTRY.render(), mimetype=None, content_type=CONTENT_TYPE)
+
+    def _tts_cache_lookups(self) -> dict:
+        """TTS cache hit and miss counts keyed by result label"""
+        stats = self.tts_cache.get_stats()
+        return {('hit',): stats['hits'], ('disk_hit',): stats['disk_hits'], ('miss',): stats['misses']}
+
+    def _current_session(self) -> Session:
+        """Get the requesting client's session, starting a new one if needed"""
+        if 'session' not in g:
+            g.session = self.sessions.get_or_create(request.cookies.get(SESSION_COOKIE))
+        return g.session
+
+    def _synthesize(self, text: str) -> bytes:
+        """
+        Get WAV audio for text, from the TTS cache when the same answer was synthesized before
+
+        Args:
+            text: Text to speak
+
+        Returns:
+            WAV file contents
+        """
+        return self._synthesize_async(text).result()
+
+    def _synthesize_async(self, text: str) -> Future:
+        """
+        Start getting WAV audio for text (cached audio is returned immediately)
+
+        Args:
+            text: Text to speak
+
+        Returns:
+            Future resolving to WAV file contents
+        """
+        if self.tts_cache is None:
+            return self.tts.submit(text)
+
+        key = TTSCache.make_key(text, self.tts.voice, self.tts.rate, self.tts.volume)
+        audio = self.tts_cache.get(key)
+        if audio is not None:
+            cached = Future()
+            cached.set_result(audio)
+            return cached
+
+        future = self.tts.submit(text)
+        future.add_done_callback(lambda done: done.exception() is None and self.tts_cache.put(key, done.result()))
+        return future
+
     def run(self):
         """Start the web server"""
+        self.ollama.wait_for_warm_up()
+
         # Get local IPv4 address
         local_ipv4 = None
         try:
@@ -238,6 +388,26 @@ class WebServer:
         except:
             pass
 
+        # WebSocket endpoint for live streaming, on its own port
+        stream_server = None
+        if config.WEB_STREAM_ENABLED:
+            ssl_context = None
+            if self.use_ssl:
+                ssl_context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+                ssl_context.load_cert_chain(self.ssl_cert, self.ssl_key)
+            # Only pages served by this web server may open the WebSocket
+            origins = web_origins(self.host, self.port, bool(self.use_ssl), (local_ipv4, local_ipv6))
+            stream_server = StreamServer(self.stt, self.ollama, self.sessions, self._synthesize_async,
+                                         host=self.host, ssl_context=ssl_context, tracer=self.tracer,
+                                         origins=origins)
+            try:
+                stream_server.start()
+                self.stream_port = stream_server.port
+            except Exception as e:
+                # The HTTP UI still works without streaming (it falls back to uploads)
+                print(f"⚠ Could not start streaming endpoint on port {config.WEB_STREAM_PORT}: {e}")
+                stream_server = None
+
         # Determine protocol
         protocol = "https" if self.use_ssl else "http"
 
@@ -315,6 +485,10 @@ class WebServer:
 
         except KeyboardInterrupt:
             print("\n\n⏹  Server stopped by user")
+        finally:
+            if stream_server is not None:
+                stream_server.stop()
+            self.tts.shutdown()
 
 
 def start_web_server(model: str = None, host: str = "0.0.0.0", port: int = 5000,
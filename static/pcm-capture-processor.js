@@ -0,0 +1,168 @@
+/**
+ * PCM capture - downsamples microphone audio to 16 kHz 16-bit mono
+ *
+ * Loaded twice by the web page: as an AudioWorklet module (runs
+ * PcmCaptureProcessor off the main thread) and as a plain script, which
+ * only defines Int16Downsampler for browsers without AudioWorklet.
+ */
+
+class Int16Downsampler {
+    /**
+     * @param {number} sourceRate - Input sample rate (e.g. 48000)
+     * @param {number} targetRate - Output sample rate (never above sourceRate)
+     * @param {number} blockSize - Output samples per emitted block
+     * @param {function(Int16Array)} onBlock - Called with each full block
+     */
+    constructor(sourceRate, targetRate, blockSize, onBlock) {
+        this.targetRate = Math.min(targetRate, sourceRate);
+        this.ratio = sourceRate / this.targetRate;
+        this.blockSize = blockSize;
+        this.onBlock = onBlock;
+        this.block = new Int16Array(blockSize);
+        this.filled = 0;
+
+        if (this.ratio > 1) {
+            this.designFilter(sourceRate);
+            // Input not yet consumed, starting with silence as the filter's history
+            this.buffer = new Float32Array(4096);
+            this.length = this.half;
+            // Input position of the next output sample: buffer index plus a fraction
+            this.index = this.half;
+            this.frac = 0;
+        }
+    }
+
+    /**
+     * Design the anti-aliasing low-pass: a Blackman-windowed sinc cutting
+     * off at 90% of the output Nyquist rate, stopping aliases above it.
+     * Output samples fall between input samples (44.1 kHz is not a
+     * multiple of 16 kHz), so the filter is tabulated at PHASES
+     * fractional offsets and each output uses the nearest one.
+     */
+    designFilter(sourceRate) {
+        const cutoff = 0.45 * this.targetRate / sourceRate;  // Cycles per input sample
+        const transition = 0.1 * this.targetRate / sourceRate;
+        this.half = Math.ceil(5.5 / transition / 2);  // Blackman transition width is ~5.5 / taps
+        this.taps = 2 * this.half;
+
+        // Row p is for outputs p / PHASES of an input sample after buffer[index]
+        this.table = [];
+        for (let p = 0; p <= Int16Downsampler.PHASES; p++) {
+            const frac = p / Int16Downsampler.PHASES;
+            const row = new Float32Array(this.taps);
+            let sum = 0;
+            for (let k = 0; k < this.taps; k++) {
+                const distance = k - this.half + 1 - frac;
+                const x = 2 * cutoff * distance;
+                const sinc = x === 0 ? 1 : Math.sin(Math.PI * x) / (Math.PI * x);
+                const w = Math.PI * distance / this.half;
+                const window = 0.42 + 0.5 * Math.cos(w) + 0.08 * Math.cos(2 * w);
+                row[k] = sinc * Math.max(0, window);
+                sum += row[k];
+            }
+            // Unity gain at DC
+            for (let k = 0; k < this.taps; k++) row[k] /= sum;
+            this.table.push(row);
+        }
+    }
+
+    /**
+     * Add float samples in [-1, 1]
+     *
+     * Filter history carries over between calls, so block edges don't click.
+     */
+    push(samples) {
+        if (this.ratio === 1) {
+            for (let i = 0; i < samples.length; i++) this.emit(samples[i]);
+            return;
+        }
+
+        if (this.length + samples.length > this.buffer.length) {
+            const grown = new Float32Array(2 * (this.length + samples.length));
+            grown.set(this.buffer.subarray(0, this.length));
+            this.buffer = grown;
+        }
+        this.buffer.set(samples, this.length);
+        this.length += samples.length;
+
+        // Every output whose filter window is fully available
+        while (this.index + this.half < this.length) {
+            const row = this.table[Math.round(this.frac * Int16Downsampler.PHASES)];
+            const base = this.index - this.half + 1;
+            let acc = 0;
+            for (let k = 0; k < this.taps; k++) acc += this.buffer[base + k] * row[k];
+            this.emit(acc);
+
+            this.frac += this.ratio;
+            const step = Math.floor(this.frac);
+            this.index += step;
+            this.frac -= step;
+        }
+
+        // Drop input no later output needs
+        const consumed = this.index - this.half + 1;
+        if (consumed > 0) {
+            this.buffer.copyWithin(0, consumed, this.length);
+            this.length -= consumed;
+            this.index -= consumed;
+        }
+    }
+
+    emit(sample) {
+        const clamped = Math.max(-1, Math.min(1, sample));
+        this.block[this.filled++] = clamped < 0 ? clamped * 0x8000 : clamped * 0x7FFF;
+        if (this.filled === this.blockSize) {
+            this.onBlock(this.block);
+            this.block = new Int16Array(this.blockSize);
+            this.filled = 0;
+        }
+    }
+
+    /** Emit the rest of the input (call once it has ended), including a partially filled block */
+    flush() {
+        if (this.ratio > 1) {
+            // Silence after the input lets the filter reach its last samples
+            this.push(new Float32Array(this.half));
+        }
+        if (this.filled > 0) {
+            this.onBlock(this.block.slice(0, this.filled));
+            this.filled = 0;
+        }
+    }
+}
+
+Int16Downsampler.PHASES = 64;  // Fractional output positions the filter is tabulated at
+
+if (typeof AudioWorkletProcessor !== 'undefined') {
+    class PcmCaptureProcessor extends AudioWorkletProcessor {
+        constructor(options) {
+            super();
+            const settings = (options && options.processorOptions) || {};
+
+            // Blocks are transferred to the main thread without copying
+            this.downsampler = new Int16Downsampler(
+                sampleRate,
+                settings.targetRate || 16000,
+                settings.blockSize || 1600,
+                (block) => this.port.postMessage(block, [block.buffer])
+            );
+
+            this.port.onmessage = (event) => {
+                if (event.data === 'flush') {
+                    this.downsampler.flush();
+                    this.port.postMessage('flushed');
+                }
+            };
+        }
+
+        process(inputs) {
+            const input = inputs[0];
+            if (input && input[0]) {
+                this.downsampler.push(input[0]);
+            }
+            return true;
+        }
+    }
+
+    registerProcessor('pcm-capture-processor', PcmCaptureProcessor);
+}
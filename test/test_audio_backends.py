@@ -0,0 +1,286 @@
+"""
+Test Audio Backends
+
+Runs AudioManager without audio hardware: WAV replay into record_stream at
+faster than real time, the null backend's silence and playback sink, and
+backend selection.
+"""
+
+import sys
+import os
+import tempfile
+import threading
+import time
+import numpy as np
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.audio_backends import AudioBackend, NullBackend, WavReplayBackend, create_audio_backend
+from src.audio_manager import AudioManager
+from src.resampler import to_int16
+from benchmarks.fixtures import save_wav
+from src import config
+
+# Set UTF-8 encoding for Windows console
+if sys.platform == 'win32':
+    try:
+        sys.stdout.reconfigure(encoding='utf-8')
+    except:
+        pass
+
+
+def _write_clip(directory: str, duration: float, sample_rate: int = config.SAMPLE_RATE) -> tuple:
+    """Write a recognizable (ramp) clip and return its path and samples"""
+    samples = (np.arange(int(duration * sample_rate)) % 20000 - 10000).astype(np.int16)
+    path = os.path.join(directory, f'clip_{sample_rate}.wav')
+    save_wav(path, samples, sample_rate)
+    return path, samples
+
+
+def _collect(audio_manager: AudioManager, consumer_delay: float = 0.0) -> np.ndarray:
+    """Read the capture stream until the backend runs out of input"""
+    chunks = []
+
+    def on_chunk(chunk):
+        chunks.append(chunk.copy())
+        if consumer_delay:
+            time.sleep(consumer_delay)
+        return True
+
+    audio_manager.record_stream(on_chunk, chunk_duration=0.1, name="test")
+    return np.concatenate(chunks)
+
+
+def test_replay_is_lossless():
+    """Unpaced replay waits for a slow consumer instead of dropping audio"""
+    with tempfile.TemporaryDirectory() as directory:
+        path, samples = _write_clip(directory, 3.0)
+        backend = WavReplayBackend([path], speed=0, gap=0.5)
+        audio_manager = AudioManager(backend=backend)
+
+        start = time.perf_counter()
+        received = _collect(audio_manager, consumer_delay=0.002)
+        elapsed = time.perf_counter() - start
+
+    assert np.array_equal(received[:len(samples)], samples)
+    assert not received[len(samples):].any()
+    assert len(received) >= len(samples) + 0.4 * config.SAMPLE_RATE
+    assert audio_manager.get_capture_stats()['dropped_seconds'] == 0
+    assert backend.finished.is_set() and not audio_manager.capture_active
+    assert elapsed < 3.0  # Faster than real time
+
+
+def test_replay_pacing_and_resampling():
+    """Replay speed is honored and other rates are resampled to 16 kHz"""
+    with tempfile.TemporaryDirectory() as directory:
+        path, samples = _write_clip(directory, 1.0, sample_rate=48000)
+        audio_manager = AudioManager(backend=WavReplayBackend([path], speed=5, gap=0.0))
+
+        start = time.perf_counter()
+        received = _collect(audio_manager)
+        elapsed = time.perf_counter() - start
+
+    assert 0.15 <= elapsed < 1.2  # One second of audio at 5x (plus noticing the end)
+    assert abs(len(received) - config.SAMPLE_RATE) <= 0.1 * config.SAMPLE_RATE
+
+
+def test_input_waits_for_listener():
+    """Replayed audio doesn't advance while nobody is listening"""
+    with tempfile.TemporaryDirectory() as directory:
+        path, _ = _write_clip(directory, 2.0)
+        audio_manager = AudioManager(backend=WavReplayBackend([path], speed=0))
+        audio_manager.start_capture()
+        time.sleep(0.2)
+        held_back = audio_manager.ring_buffer.write_position
+        audio_manager.stop_capture()
+
+    assert held_back == 0
+    assert not audio_manager.capture_active
+
+
+def test_null_backend_sink():
+    """Beeps and WAV playback land in the null sink; input is silence until stopped"""
+    backend = NullBackend(keep_output=True)
+    audio_manager = AudioManager(backend=backend)
+
+    audio_manager.play_beep()
+    with tempfile.TemporaryDirectory() as directory:
+        path, _ = _write_clip(directory, 0.5)
+        with open(path, 'rb') as wav_file:
+            audio_manager.play_wav(wav_file.read())
+
+    assert len(backend.played) == 2
+    assert abs(backend.played_seconds - (config.BEEP_DURATION + 0.5)) < 0.01
+
+    chunks = []
+    audio_manager.record_stream(lambda chunk: chunks.append(chunk.copy()) or len(chunks) < 3,
+                                chunk_duration=0.1, name="test")
+    audio_manager.stop_capture()
+    assert len(chunks) == 3 and not np.concatenate(chunks).any()
+    assert not audio_manager.capture_active
+    assert audio_manager.record_audio(0.2).shape == (int(0.2 * config.SAMPLE_RATE), 1)
+
+
+class _EchoBackend(NullBackend):
+    """A 'hardware' backend whose microphone hears everything it plays (tests feed its input)"""
+
+    hardware = True
+    audio_manager = None
+    _active = False
+
+    def start_input(self, callback, sample_rate, channels, block_duration, device=None):
+        self._active = True
+
+    def stop_input(self):
+        self._active = False
+
+    @property
+    def input_active(self) -> bool:
+        return self._active
+
+    def play(self, audio, sample_rate, device=None):
+        echo = to_int16(audio * 32767)
+        for start in range(0, len(echo), 800):
+            self.audio_manager._capture_callback(echo[start:start + 800])
+
+
+def test_stt_starts_after_wake_word():
+    """STT starts after the wake word, reaching back at most the pre-roll before the beep ended"""
+    audio_manager = AudioManager(backend=NullBackend())
+    audio_manager.ring_buffer.write(np.zeros(config.SAMPLE_RATE, dtype=np.int16))
+    audio_manager.mark_wake_word(config.SAMPLE_RATE)
+    audio_manager.play_beep()
+    assert audio_manager.pre_roll_position() == config.SAMPLE_RATE
+    assert audio_manager.pre_roll_position() is None
+
+    backend = _EchoBackend()
+    audio_manager = AudioManager(backend=backend)
+    backend.audio_manager = audio_manager
+    audio_manager.ring_buffer.write(np.zeros(config.SAMPLE_RATE, dtype=np.int16))
+    audio_manager.mark_wake_word(config.SAMPLE_RATE)
+    audio_manager.play_beep()
+    audio_manager.ring_buffer.write(np.zeros(config.SAMPLE_RATE, dtype=np.int16))
+
+    beep_end = config.SAMPLE_RATE + int((config.BEEP_DURATION + config.BEEP_ECHO_TAIL) * config.SAMPLE_RATE)
+    assert audio_manager.pre_roll_position() == beep_end - int(config.PRE_ROLL_DURATION * config.SAMPLE_RATE)
+
+
+def test_beep_is_notched_out():
+    """Readers get the beep picked up by the microphone filtered out, and other sound untouched"""
+    backend = _EchoBackend()
+    audio_manager = AudioManager(backend=backend)
+    backend.audio_manager = audio_manager
+    audio_manager.start_capture()
+    audio_manager.play_beep()
+
+    t = np.arange(config.SAMPLE_RATE) / config.SAMPLE_RATE
+    tone = to_int16(np.sin(2 * np.pi * 300 * t) * 10000)
+    audio_manager._capture_callback(tone)
+    raw = np.array(audio_manager.ring_buffer._buffer[:int(config.BEEP_DURATION * config.SAMPLE_RATE)])
+
+    chunks = []
+    total = len(raw) + len(tone)
+    audio_manager.record_stream(lambda chunk: chunks.append(chunk.copy()) or sum(map(len, chunks)) < total,
+                                chunk_duration=0.1, start_position=0, name="test")
+    received = np.concatenate(chunks).astype(np.float64)
+
+    def rms(samples):
+        return np.sqrt(np.mean(samples.astype(np.float64) ** 2))
+
+    # The ring buffer itself keeps the raw capture
+    assert rms(raw) > 0.9 * 0.3 * 32767 / np.sqrt(2)
+    settled = received[len(raw) // 2:len(raw)]  # After the filter has settled
+    assert rms(settled) < 0.05 * rms(raw)
+
+    # Past the echo tail the audio isn't filtered at all
+    echo_end = len(raw) + int(config.BEEP_ECHO_TAIL * config.SAMPLE_RATE)
+    assert np.array_equal(received[echo_end:total], tone[echo_end - len(raw):])
+    assert rms(received[len(raw) + 800:echo_end]) > 0.9 * rms(tone)
+
+
+def test_resampling_off_capture_callback():
+    """Input at another rate is resampled on the capture-processing thread, not in the callback"""
+    backend = _EchoBackend()
+    backend.input_rate = lambda sample_rate, channels, device=None: 48000
+    audio_manager = AudioManager(backend=backend)
+    writers = []
+    write = audio_manager.ring_buffer.write
+    audio_manager.ring_buffer.write = lambda samples: writers.append(threading.current_thread().name) or write(samples)
+
+    audio_manager.start_capture()
+    for _ in range(10):
+        audio_manager._capture_callback(np.zeros(4800, dtype=np.int16))  # 100 ms at 48 kHz
+    audio_manager.stop_capture()
+
+    assert writers and set(writers) == {"capture-resampler"}
+    assert abs(audio_manager.ring_buffer.write_position - config.SAMPLE_RATE) <= 0.05 * config.SAMPLE_RATE
+    assert not audio_manager.capture_active
+
+
+def test_create_backend():
+    """Backends are picked by name"""
+    assert isinstance(create_audio_backend("null"), NullBackend)
+    try:
+        create_audio_backend("tape")
+        assert False, "unknown backend accepted"
+    except ValueError:
+        pass
+
+
+def test_backend_interface_is_abstract():
+    """A backend missing part of the interface can't be created"""
+    class _InputOnly(AudioBackend):
+        def start_input(self, callback, sample_rate, channels, block_duration, device=None):
+            pass
+
+        def stop_input(self):
+            pass
+
+        @property
+        def input_active(self) -> bool:
+            return False
+
+    for backend_class in (AudioBackend, _InputOnly):
+        try:
+            backend_class()
+            assert False, f"{backend_class.__name__} instantiated"
+        except TypeError:
+            pass
+
+
+def main():
+    """Run all tests"""
+    print("\n" + "=" * 70)
+    print("🧪 AUDIO BACKEND TEST SUITE")
+    print("=" * 70)
+
+    tests = [
+        ("Lossless replay", test_replay_is_lossless),
+        ("Replay pacing and resampling", test_replay_pacing_and_resampling),
+        ("Input waits for a listener", test_input_waits_for_listener),
+        ("Null backend sink", test_null_backend_sink),
+        ("STT starts after the wake word", test_stt_starts_after_wake_word),
+        ("Beep notched out of capture", test_beep_is_notched_out),
+        ("Resampling off the capture callback", test_resampling_off_capture_callback),
+        ("Backend selection", test_create_backend),
+        ("Abstract backend interface", test_backend_interface_is_abstract),
+    ]
+
+    passed = 0
+    for name, test in tests:
+        try:
+            test()
+            print(f"  ✅ PASS - {name}")
+            passed += 1
+        except AssertionError as e:
+            print(f"  ❌ FAIL - {name} {e}")
+
+    print(f"\n  Result: {passed}/{len(tests)} tests passed")
+    print("=" * 70)
+
+    return passed == len(tests)
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
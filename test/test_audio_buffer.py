@@ -0,0 +1,189 @@
+"""
+Test Audio Ring Buffer
+
+Exercises the shared capture buffer without any audio hardware.
+"""
+
+import sys
+import os
+import threading
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+from src.audio_buffer import AudioRingBuffer, POLICY_DROP_OLDEST, POLICY_COALESCE
+
+# Set UTF-8 encoding for Windows console
+if sys.platform == 'win32':
+    try:
+        sys.stdout.reconfigure(encoding='utf-8')
+    except:
+        pass
+
+
+def test_independent_readers():
+    """Each reader sees every sample through its own cursor"""
+    ring = AudioRingBuffer(1000)
+    wake = ring.create_reader("wake_word", position=0)
+    stt = ring.create_reader("stt", position=0)
+
+    ring.write(np.arange(300, dtype=np.int16))
+
+    assert np.array_equal(wake.read(100, timeout=0), np.arange(100))
+    assert np.array_equal(wake.read(100, timeout=0), np.arange(100, 200))
+    assert np.array_equal(stt.read(300, timeout=0), np.arange(300))
+    assert wake.available() == 100
+    assert stt.available() == 0
+
+
+def test_wraparound_and_pre_roll():
+    """Reads across the wrap point and rewinds for pre-roll"""
+    ring = AudioRingBuffer(100)
+    reader = ring.create_reader()
+
+    ring.write(np.arange(80, dtype=np.int16))
+    ring.write(np.arange(80, 160, dtype=np.int16))
+
+    # Only the newest 100 samples are still available
+    assert ring.oldest_position == 60
+    reader.seek(0)
+    assert reader.position == 60
+
+    reader.seek(150)
+    reader.rewind(30)
+    assert np.array_equal(reader.read(40, timeout=0), np.arange(120, 160))
+
+
+def test_overrun_skips_to_recent_audio():
+    """A reader that falls behind loses old audio instead of reading garbage"""
+    ring = AudioRingBuffer(100)
+    reader = ring.create_reader(position=0)
+
+    ring.write(np.arange(250, dtype=np.int16))
+    block = reader.read(50, timeout=0)
+
+    assert reader.overruns == 1
+    assert np.array_equal(block, np.arange(200, 250))
+
+
+def test_blocking_read():
+    """Readers wait for the capture thread and time out cleanly"""
+    ring = AudioRingBuffer(1000)
+    reader = ring.create_reader()
+
+    assert reader.read(10, timeout=0.01) is None
+
+    writer = threading.Timer(0.05, lambda: ring.write(np.ones(10, dtype=np.int16)))
+    writer.start()
+    block = reader.read(10, timeout=2.0)
+    writer.join()
+
+    assert block is not None and block.sum() == 10
+
+
+def test_backlog_drop_oldest():
+    """A slow consumer skips old blocks to stay within the backlog bound"""
+    ring = AudioRingBuffer(1000)
+    reader = ring.create_reader(position=0)
+
+    ring.write(np.arange(500, dtype=np.int16))
+    block = reader.read_pending(100, max_backlog=200, policy=POLICY_DROP_OLDEST, timeout=0)
+
+    assert reader.dropped_samples == 300
+    assert np.array_equal(block, np.arange(300, 400))
+    assert reader.available() == 100
+
+
+def test_backlog_coalesce():
+    """A slow consumer gets all pending blocks in one chunk"""
+    ring = AudioRingBuffer(1000)
+    reader = ring.create_reader(position=0)
+
+    ring.write(np.arange(350, dtype=np.int16))
+    block = reader.read_pending(100, max_backlog=1000, policy=POLICY_COALESCE, timeout=0)
+
+    assert len(block) == 300
+    assert reader.coalesced_blocks == 2
+    assert reader.available() == 50
+
+
+def test_zero_copy_reads():
+    """Views share memory with the ring buffer and cannot be modified"""
+    ring = AudioRingBuffer(100)
+    reader = ring.create_reader(position=0)
+
+    ring.write(np.arange(30, dtype=np.int16))
+    view = reader.read(20, timeout=0, copy=False)
+    assert np.shares_memory(view, ring._buffer)
+    assert not view.flags.writeable
+    assert reader.block_intact()
+
+    # A block that wraps around comes from the reader's scratch buffer
+    ring.write(np.arange(30, 110, dtype=np.int16))
+    reader.read(30, timeout=0)
+    wrapped = reader.read(60, timeout=0, copy=False)
+    assert not np.shares_memory(wrapped, ring._buffer)
+    assert np.array_equal(wrapped, np.arange(50, 110))
+
+
+def test_lagging_reader_views():
+    """A reader about to be overrun gets a copy; a view overwritten while in use is reported"""
+    ring = AudioRingBuffer(100)
+    reader = ring.create_reader(position=0)
+
+    # Less than one block of headroom left: the block is copied, so later writes can't change it
+    ring.write(np.arange(90, dtype=np.int16))
+    block = reader.read(20, timeout=0, copy=False)
+    assert not np.shares_memory(block, ring._buffer)
+    ring.write(np.arange(90, 120, dtype=np.int16))
+    assert np.array_equal(block, np.arange(20)) and reader.block_intact()
+
+    # Enough headroom for a view, but the writer laps it while the consumer still holds it
+    reader.seek(100)
+    view = reader.read(20, timeout=0, copy=False)
+    assert np.shares_memory(view, ring._buffer)
+    ring.write(np.arange(120, 210, dtype=np.int16))
+    assert not reader.block_intact()
+    assert reader.torn_blocks == 1
+    assert reader.block_intact()  # Only reported once
+
+    # The writer announces an overwrite before storing it
+    ring._overwrite_position = ring.write_position + 10
+    assert ring.oldest_position == ring.write_position + 10 - ring.capacity
+
+
+def main():
+    """Run all tests"""
+    print("\n" + "=" * 70)
+    print("🧪 AUDIO RING BUFFER TEST SUITE")
+    print("=" * 70)
+
+    tests = [
+        ("Independent readers", test_independent_readers),
+        ("Wraparound and pre-roll", test_wraparound_and_pre_roll),
+        ("Overrun handling", test_overrun_skips_to_recent_audio),
+        ("Blocking read", test_blocking_read),
+        ("Backlog drop oldest", test_backlog_drop_oldest),
+        ("Backlog coalesce", test_backlog_coalesce),
+        ("Zero-copy reads", test_zero_copy_reads),
+        ("Lagging reader views", test_lagging_reader_views),
+    ]
+
+    passed = 0
+    for name, test in tests:
+        try:
+            test()
+            print(f"  ✅ PASS - {name}")
+            passed += 1
+        except AssertionError as e:
+            print(f"  ❌ FAIL - {name} {e}")
+
+    print(f"\n  Result: {passed}/{len(tests)} tests passed")
+    print("=" * 70)
+
+    return passed == len(tests)
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
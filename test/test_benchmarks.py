@@ -0,0 +1,126 @@
+"""
+Test Benchmarks
+
+Checks the benchmark baseline comparison and that the headless benchmarks
+run and report metrics in the expected shape.
+"""
+
+import sys
+import os
+import argparse
+import contextlib
+import io
+import tempfile
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.run_benchmarks import (bench_resample, compare, load_results, main as run_suite, metric,
+                                       run_benchmarks, save_results)
+from benchmarks.fixtures import synthetic_audio
+from src import config
+
+# Set UTF-8 encoding for Windows console
+if sys.platform == 'win32':
+    try:
+        sys.stdout.reconfigure(encoding='utf-8')
+    except:
+        pass
+
+
+def test_compare_flags_regressions():
+    """Only changes in the worse direction beyond the threshold fail"""
+    baseline = {
+        'a.seconds': metric(1.0, 's'),
+        'b.seconds': metric(1.0, 's'),
+        'c.calls': metric(100.0, 'calls/s', lower_is_better=False),
+        'd.calls': metric(100.0, 'calls/s', lower_is_better=False),
+    }
+    results = {
+        'a.seconds': metric(1.2, 's'),     # 20% slower, within threshold
+        'b.seconds': metric(1.5, 's'),     # 50% slower
+        'c.calls': metric(60.0, 'calls/s', lower_is_better=False),   # 40% less throughput
+        'd.calls': metric(300.0, 'calls/s', lower_is_better=False),  # Faster
+        'e.new': metric(1.0, 's'),         # Not in the baseline
+    }
+
+    regressed = {entry['metric'] for entry in compare(results, baseline, threshold=0.25) if entry['regressed']}
+    assert regressed == {'b.seconds', 'c.calls'}
+    assert len(compare(results, baseline, threshold=0.25)) == 4
+
+
+def test_results_round_trip():
+    """Saved results load back as the same metrics"""
+    results = {'x.seconds': metric(0.5, 's')}
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'nested', 'baseline.json')
+        assert load_results(path) is None
+        save_results(path, results, 'synthetic 1s')
+        assert load_results(path) == results
+
+
+def test_resample_benchmark_runs():
+    """The resampling benchmark reports a positive cost for each rate"""
+    audio = synthetic_audio(2.0, config.SAMPLE_RATE)
+    results = run_benchmarks(audio, argparse.Namespace(), ['resample'])
+
+    assert 'resample.48000_stream_ms_per_audio_second' in results
+    assert all(value['value'] > 0 for value in results.values())
+    assert bench_resample(audio, None).keys() == {key.split('.', 1)[1] for key in results}
+
+
+def _exit_code(*args) -> int:
+    """Run the benchmark suite's command line quietly and return its exit code"""
+    argv = sys.argv
+    sys.argv = ['run_benchmarks', '--only', 'resample', '--duration', '2', *args]
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            return run_suite()
+    finally:
+        sys.argv = argv
+
+
+def test_check_requires_baseline():
+    """--check fails without a baseline instead of passing by comparing nothing"""
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'baseline.json')
+        assert _exit_code('--baseline', path) == 0
+        assert _exit_code('--baseline', path, '--check') == 1
+
+        save_results(path, {'unrelated.seconds': metric(1.0, 's')}, 'synthetic 1s')
+        assert _exit_code('--baseline', path, '--check') == 1
+
+        assert _exit_code('--baseline', path, '--save-baseline') == 0
+        assert _exit_code('--baseline', path, '--check', '--threshold', '100') == 0
+
+
+def main():
+    """Run all tests"""
+    print("\n" + "=" * 70)
+    print("🧪 BENCHMARK SUITE TEST")
+    print("=" * 70)
+
+    tests = [
+        ("Regression detection", test_compare_flags_regressions),
+        ("Results round trip", test_results_round_trip),
+        ("Resample benchmark", test_resample_benchmark_runs),
+        ("Check requires a baseline", test_check_requires_baseline),
+    ]
+
+    passed = 0
+    for name, test in tests:
+        try:
+            test()
+            print(f"  ✅ PASS - {name}")
+            passed += 1
+        except AssertionError as e:
+            print(f"  ❌ FAIL - {name} {e}")
+
+    print(f"\n  Result: {passed}/{len(tests)} tests passed")
+    print("=" * 70)
+
+    return passed == len(tests)
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
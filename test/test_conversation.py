@@ -0,0 +1,158 @@
+"""
+Test Conversation Context
+
+Checks token-budget trimming of the chat history, the rolling summary of
+evicted exchanges and the budget OllamaClient derives from the model.
+"""
+
+import sys
+import os
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.conversation import SUMMARY_PREFIX, ConversationContext, estimate_tokens
+from src.fake_ollama import FakeOllamaServer
+from src.ollama_client import OllamaClient
+from src import config
+
+# Set UTF-8 encoding for Windows console
+if sys.platform == 'win32':
+    try:
+        sys.stdout.reconfigure(encoding='utf-8')
+    except:
+        pass
+
+
+def _exchange(context: ConversationContext, question: str, answer: str):
+    context.add("user", question)
+    context.add("assistant", answer)
+
+
+def test_trim_to_budget():
+    """The oldest whole exchanges are dropped until the context fits"""
+    context = ConversationContext()
+    _exchange(context, "first question", "short answer")
+    _exchange(context, "second question", "a much longer answer " * 20)
+    _exchange(context, "third question", "ok")
+    context.add("user", "fourth question")
+
+    total = sum(estimate_tokens(message["content"]) for message in context)
+    assert context.tokens == total
+
+    budget = total - 1  # Only the first exchange has to go
+    assert context.trim(budget) == 2
+    assert context[0]["content"] == "second question"
+    assert context.tokens == total - estimate_tokens("first question") - estimate_tokens("short answer")
+
+    # The long answer pushes out its exchange as a whole, never leaving an answer first
+    assert context.trim(30) == 2
+    assert [message["content"] for message in context] == ["third question", "ok", "fourth question"]
+
+    # The newest message is kept even if it alone is over budget
+    context.trim(0)
+    assert len(context) == 1 and context[-1]["content"] == "fourth question"
+    assert context.evicted_messages == 6
+
+
+def test_rolling_summary():
+    """Evicted exchanges are summarized in the background and sent first"""
+    calls = []
+
+    def summarizer(summary, messages):
+        calls.append(summary)
+        return f"{summary} {len(messages)} messages".strip()
+
+    filler = " and so on" * 40
+    context = ConversationContext()
+    _exchange(context, "q1" + filler, "a1" + filler)
+    _exchange(context, "q2" + filler, "a2" + filler)
+    context.add("user", "q3")
+    context.trim(100, summarizer)
+    assert context.wait_for_summary(2.0)
+
+    messages = context.messages()
+    assert messages[0] == {"role": "system", "content": SUMMARY_PREFIX + "4 messages"}
+    assert messages[1:] == [{"role": "user", "content": "q3"}]
+    assert context.tokens == estimate_tokens("q3") + estimate_tokens(SUMMARY_PREFIX + "4 messages")
+
+    # The next eviction builds on the previous summary
+    _exchange(context, "q3 answer" + filler, "q4" + filler)
+    context.trim(120, summarizer)
+    assert context.wait_for_summary(2.0)
+    assert calls == ["", "4 messages"]
+    assert context.summary == "4 messages 2 messages"
+
+    context.clear()
+    assert context.messages() == [] and context.tokens == 0
+
+
+def test_block_eviction():
+    """Once over budget, a large block is evicted so later turns only append"""
+    context = ConversationContext()
+    for turn in range(8):
+        _exchange(context, f"question {turn}", "answer " * 10)
+    budget = context.tokens
+
+    context.add("user", "one more")
+    assert context.trim(budget, target=budget // 2) > 2
+    assert context.tokens <= budget // 2
+    assert context[0]["role"] == "user"
+
+    # Room for a few more exchanges before the next eviction
+    first = context[0]
+    for turn in range(3):
+        _exchange(context, f"later {turn}", "answer " * 10)
+        assert context.trim(budget, target=budget // 2) == 0
+    assert context[0] is first
+
+
+def test_client_budget():
+    """A long conversation stays within the model's context window"""
+    with FakeOllamaServer(context_length=1024, reply="word " * 150) as server:
+        client = OllamaClient(base_url=server.base_url, model='gemma3')
+        assert client.get_context_length() == 1024
+        budget = client.context_budget()
+        assert budget == min(config.OLLAMA_NUM_CTX, 1024) - config.CONTEXT_RESPONSE_RESERVE
+
+        for turn in range(10):
+            client.chat(f"question {turn}")
+            assert client.conversation_history.tokens <= budget + estimate_tokens("word " * 150)
+        client.close()
+
+    history = client.conversation_history
+    assert history.evicted_messages > 0
+    assert history[-2]["content"] == "question 9"
+    assert history[0]["role"] == "user"
+
+
+def main():
+    """Run all tests"""
+    print("\n" + "=" * 70)
+    print("🧪 CONVERSATION CONTEXT TEST SUITE")
+    print("=" * 70)
+
+    tests = [
+        ("Trim to budget", test_trim_to_budget),
+        ("Rolling summary", test_rolling_summary),
+        ("Block eviction", test_block_eviction),
+        ("Client budget", test_client_budget),
+    ]
+
+    passed = 0
+    for name, test in tests:
+        try:
+            test()
+            print(f"  ✅ PASS - {name}")
+            passed += 1
+        except AssertionError as e:
+            print(f"  ❌ FAIL - {name} {e}")
+
+    print(f"\n  Result: {passed}/{len(tests)} tests passed")
+    print("=" * 70)
+
+    return passed == len(tests)
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
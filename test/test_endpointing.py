@@ -0,0 +1,148 @@
+"""
+Test Endpointing
+
+Drives the endpointers with scripted recognition results, without audio.
+"""
+
+import sys
+import os
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.endpointing import Endpointer, SmartEndpointer, SilenceEndpointer
+
+# Set UTF-8 encoding for Windows console
+if sys.platform == 'win32':
+    try:
+        sys.stdout.reconfigure(encoding='utf-8')
+    except:
+        pass
+
+CHUNK = 0.1
+
+
+def run(endpointer, script):
+    """Feed (is_speech, partial, final) tuples until the endpointer fires"""
+    endpointer.reset()
+    for step, (is_speech, partial, final) in enumerate(script):
+        if endpointer.update(CHUNK, is_speech, partial, final):
+            return step
+    return None
+
+
+def speech_then_silence(silent_chunks):
+    script = [(False, "", "")] * 3
+    script += [(True, "what", ""), (True, "what time", ""), (True, "what time is it", "")]
+    script += [(False, "what time is it", "")] * silent_chunks
+    return script
+
+
+def test_nothing_heard_never_ends():
+    """Silence alone does not end the turn (the caller's timeout does)"""
+    endpointer = SmartEndpointer("command")
+    assert run(endpointer, [(False, "", "")] * 50) is None
+
+
+def test_stable_partial_ends_command_quickly():
+    """A settled partial plus a quiet chunk ends a command well before 2 seconds"""
+    endpointer = SmartEndpointer("command", trailing_silence=0.7, stable_partials=3)
+    step = run(endpointer, speech_then_silence(20))
+
+    assert endpointer.reason == "stable partial"
+    assert step == 8
+    assert abs(endpointer.endpoint_delay - 0.3) < 1e-6
+
+
+def test_early_partial_waits_for_request():
+    """A stray partial right at the start (wake word tail) doesn't end the turn before the request"""
+    endpointer = SmartEndpointer("command", trailing_silence=0.7, stable_partials=3)
+    script = [(False, "lamma", "")] * 4 + [(True, "lamma what", ""), (True, "lamma what time", "")]
+    script += [(False, "lamma what time", "")] * 20
+
+    step = run(endpointer, script)
+    assert step == 8 and endpointer.reason == "stable partial"
+
+
+def test_explicit_zero_overrides():
+    """An explicit 0 is an override, not 'use the mode's value'"""
+    endpointer = SmartEndpointer("command", trailing_silence=0.0)
+    assert endpointer.trailing_silence == 0.0
+    assert SmartEndpointer("command").trailing_silence > 0
+
+
+def test_final_result_ends_command():
+    """A Vosk final result ends a command after a short quiet period"""
+    endpointer = SmartEndpointer("command", stable_partials=50, final_silence=0.2)
+    script = [(True, "turn on", ""), (True, "turn on the lights", ""), (False, "", "turn on the lights")]
+    script += [(False, "", "")] * 5
+
+    run(endpointer, script)
+    assert endpointer.reason == "final result"
+
+
+def test_dictation_waits_through_pauses():
+    """Dictation ignores final results and uses a longer silence"""
+    endpointer = SmartEndpointer("dictation", trailing_silence=1.5, stable_partials=50, final_silence=None)
+    script = [(True, "dear team", ""), (False, "", "dear team")] + [(False, "", "")] * 8
+    script += [(True, "see you", "")] + [(False, "see you", "")] * 20
+
+    step = run(endpointer, script)
+    assert endpointer.reason == "trailing silence"
+    assert step > 10
+
+
+def test_legacy_silence_timeout():
+    """SilenceEndpointer keeps the original fixed timeout behaviour"""
+    endpointer = SilenceEndpointer(silence_threshold=2.0)
+    script = [(True, "hello", ""), (False, "", "hello")] + [(False, "", "")] * 30
+
+    step = run(endpointer, script)
+    assert endpointer.reason == "silence"
+    assert abs(endpointer.endpoint_delay - 2.0) < 1e-6
+    assert step == 21
+
+
+def test_check_is_abstract():
+    """An endpointer has to implement _check()"""
+    try:
+        Endpointer()
+        assert False, "base endpointer instantiated"
+    except TypeError:
+        pass
+
+
+def main():
+    """Run all tests"""
+    print("\n" + "=" * 70)
+    print("🧪 ENDPOINTING TEST SUITE")
+    print("=" * 70)
+
+    tests = [
+        ("Nothing heard", test_nothing_heard_never_ends),
+        ("Stable partial (command)", test_stable_partial_ends_command_quickly),
+        ("Early partial waits for the request", test_early_partial_waits_for_request),
+        ("Explicit zero overrides", test_explicit_zero_overrides),
+        ("Final result (command)", test_final_result_ends_command),
+        ("Dictation pauses", test_dictation_waits_through_pauses),
+        ("Legacy silence timeout", test_legacy_silence_timeout),
+        ("Abstract _check", test_check_is_abstract),
+    ]
+
+    passed = 0
+    for name, test in tests:
+        try:
+            test()
+            print(f"  ✅ PASS - {name}")
+            passed += 1
+        except AssertionError as e:
+            print(f"  ❌ FAIL - {name} {e}")
+
+    print(f"\n  Result: {passed}/{len(tests)} tests passed")
+    print("=" * 70)
+
+    return passed == len(tests)
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
@@ -0,0 +1,139 @@
+"""
+Test Fake Ollama
+
+Checks the fake Ollama server against the real OllamaClient: streaming and
+non-streaming chat, pacing, model loading with keep_alive and error injection.
+"""
+
+import sys
+import os
+import time
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.fake_ollama import FakeOllamaServer, parse_keep_alive
+from src.ollama_client import OllamaClient
+
+# Set UTF-8 encoding for Windows console
+if sys.platform == 'win32':
+    try:
+        sys.stdout.reconfigure(encoding='utf-8')
+    except:
+        pass
+
+
+def test_chat_and_stream():
+    """Both request styles return the canned replies in turn, with Ollama's stats"""
+    with FakeOllamaServer(replies=["First answer.", "Second answer here."]) as server:
+        client = OllamaClient(base_url=server.base_url, model='gemma3')
+        assert client.test_connection()
+
+        assert client.chat("hello") == "First answer."
+        tokens = list(client.chat_stream("again"))
+        client.close()
+
+    assert tokens == ["Second ", "answer ", "here."]
+    assert client.last_stats['eval_count'] == 3
+    assert client.conversation_history[-1] == {"role": "assistant", "content": "Second answer here."}
+
+
+def test_pacing():
+    """Time to first token and tokens per second are honored"""
+    with FakeOllamaServer(first_token=0.2, tokens_per_second=20, echo=True) as server:
+        client = OllamaClient(base_url=server.base_url, model='gemma3')
+        start = time.perf_counter()
+        first = None
+        for _ in client.chat_stream("one two three four five", maintain_context=False):
+            first = first or time.perf_counter() - start
+        total = time.perf_counter() - start
+        client.close()
+
+    assert 0.2 <= first < 0.4
+    assert 0.4 <= total < 0.7  # 0.2s + 4 intervals of 0.05s
+
+
+def test_load_and_keep_alive():
+    """A model is loaded once, and again after keep_alive expires"""
+    with FakeOllamaServer(load_delay=0.2) as server:
+        client = OllamaClient(base_url=server.base_url, model='gemma3')
+        client.keep_alive = "0.3s"
+
+        assert client.warm_up()
+        client.chat("hi", maintain_context=False)
+        assert client.last_stats['load_duration'] == 0
+        time.sleep(0.4)
+        client.chat("hi", maintain_context=False)
+        client.close()
+
+        assert client.last_stats['load_duration'] >= 0.15e9
+        assert server.fake.get_stats()['loads'] == 2
+
+    assert parse_keep_alive("30m") == 1800
+    assert parse_keep_alive(-1) is None
+
+
+def test_error_injection():
+    """Injected failures are repeatable with a seed and surface as client errors"""
+    answers = []
+    for _ in range(2):
+        with FakeOllamaServer(error_rate=0.5, seed=7, reply="Fine.") as server:
+            client = OllamaClient(base_url=server.base_url, model='gemma3')
+            answers.append([client.chat("hi", maintain_context=False) for _ in range(10)])
+            client.close()
+
+    assert answers[0] == answers[1]
+    assert "Fine." in answers[0]
+    assert any(answer != "Fine." for answer in answers[0])
+
+
+def test_prefix_cache():
+    """Only the new end of a growing conversation is evaluated"""
+    with FakeOllamaServer(reply="Sure.") as server:
+        client = OllamaClient(base_url=server.base_url, model='gemma3')
+        client.chat("a long first question " * 10)
+        first = client.last_stats['prompt_eval_count']
+        client.chat("and a follow-up")
+        follow_up = client.last_stats['prompt_eval_count']
+        client.chat("unrelated", maintain_context=False)
+        unrelated = client.last_stats['prompt_eval_count']
+        client.close()
+        stats = server.fake.get_stats()
+
+    assert first > 50
+    assert follow_up <= 10  # The first exchange came from the cache
+    assert unrelated >= 4  # A different prompt only shares the template start
+    assert stats['prompt_tokens_reused'] >= first
+
+
+def main():
+    """Run all tests"""
+    print("\n" + "=" * 70)
+    print("🧪 FAKE OLLAMA TEST SUITE")
+    print("=" * 70)
+
+    tests = [
+        ("Chat and stream", test_chat_and_stream),
+        ("Pacing", test_pacing),
+        ("Load and keep_alive", test_load_and_keep_alive),
+        ("Error injection", test_error_injection),
+        ("Prefix cache", test_prefix_cache),
+    ]
+
+    passed = 0
+    for name, test in tests:
+        try:
+            test()
+            print(f"  ✅ PASS - {name}")
+            passed += 1
+        except AssertionError as e:
+            print(f"  ❌ FAIL - {name} {e}")
+
+    print(f"\n  Result: {passed}/{len(tests)} tests passed")
+    print("=" * 70)
+
+    return passed == len(tests)
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
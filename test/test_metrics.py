@@ -0,0 +1,117 @@
+"""
+Test Metrics
+
+Checks per-thread counters, histogram buckets, scrape-time gauges and the
+Prometheus text output.
+"""
+
+import sys
+import os
+import threading
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.metrics import MetricsRegistry
+
+# Set UTF-8 encoding for Windows console
+if sys.platform == 'win32':
+    try:
+        sys.stdout.reconfigure(encoding='utf-8')
+    except:
+        pass
+
+
+def test_counter_across_threads():
+    """Counts recorded on many threads add up, including threads that have exited"""
+    registry = MetricsRegistry()
+    counter = registry.counter('test_requests_total', 'Requests', ('route',))
+
+    def work():
+        for _ in range(1000):
+            counter.inc(route='/a')
+
+    threads = [threading.Thread(target=work) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    counter.inc(2, route='/b')
+
+    output = registry.render()
+    assert 'test_requests_total{route="/a"} 8000' in output
+    assert 'test_requests_total{route="/b"} 2' in output
+    assert len(counter._shards) == 1  # Shards of finished threads were folded together
+    assert 'test_requests_total{route="/a"} 8000' in registry.render()
+
+
+def test_histogram_buckets():
+    """Buckets are cumulative and the count matches the +Inf bucket"""
+    registry = MetricsRegistry()
+    histogram = registry.histogram('test_seconds', 'Latency', buckets=(0.1, 1.0))
+    for value in (0.05, 0.1, 0.5, 3.0):
+        histogram.observe(value)
+
+    output = registry.render()
+    assert '# TYPE test_seconds histogram' in output
+    assert 'test_seconds_bucket{le="0.1"} 2' in output
+    assert 'test_seconds_bucket{le="1"} 3' in output
+    assert 'test_seconds_bucket{le="+Inf"} 4' in output
+    assert 'test_seconds_sum 3.65' in output
+    assert 'test_seconds_count 4' in output
+
+
+def test_function_metrics():
+    """Gauges and counters backed by a function are read when scraped"""
+    registry = MetricsRegistry()
+    depth = [3]
+    registry.gauge('test_queue_depth', 'Queue depth', function=lambda: depth[0])
+    registry.counter('test_lookups_total', 'Lookups', ('result',),
+                     function=lambda: {('hit',): 5, ('miss',): 1})
+    depth[0] = 7
+
+    output = registry.render()
+    assert 'test_queue_depth 7' in output
+    assert 'test_lookups_total{result="hit"} 5' in output
+
+
+def test_registry_reuses_metrics():
+    """Asking for a metric twice returns the same one; label values are escaped"""
+    registry = MetricsRegistry()
+    first = registry.counter('test_total', 'Count', ('path',))
+    assert registry.counter('test_total', 'Count', ('path',)) is first
+
+    first.inc(path='say "hi"\\')
+    assert 'test_total{path="say \\"hi\\"\\\\"} 1' in registry.render()
+
+
+def main():
+    """Run all tests"""
+    print("\n" + "=" * 70)
+    print("🧪 METRICS TEST SUITE")
+    print("=" * 70)
+
+    tests = [
+        ("Counter across threads", test_counter_across_threads),
+        ("Histogram buckets", test_histogram_buckets),
+        ("Function metrics", test_function_metrics),
+        ("Registry reuse and escaping", test_registry_reuses_metrics),
+    ]
+
+    passed = 0
+    for name, test in tests:
+        try:
+            test()
+            print(f"  ✅ PASS - {name}")
+            passed += 1
+        except AssertionError as e:
+            print(f"  ❌ FAIL - {name} {e}")
+
+    print(f"\n  Result: {passed}/{len(tests)} tests passed")
+    print("=" * 70)
+
+    return passed == len(tests)
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
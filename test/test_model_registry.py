@@ -0,0 +1,125 @@
+"""
+Test Model Registry
+
+Checks that Vosk models are shared and released by reference count.
+vosk.Model is replaced by a mock, so no model needs to be downloaded.
+"""
+
+import sys
+import os
+import tempfile
+from unittest import mock
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src import model_registry
+from src.model_registry import ModelRegistry
+
+# Set UTF-8 encoding for Windows console
+if sys.platform == 'win32':
+    try:
+        sys.stdout.reconfigure(encoding='utf-8')
+    except:
+        pass
+
+
+def test_model_is_shared():
+    """Components asking for the same model get one instance, loaded once"""
+    registry = ModelRegistry()
+    with mock.patch.object(model_registry, 'Model') as model_class:
+        first = registry.acquire('model')
+        second = registry.acquire('model')
+
+    assert first is second
+    model_class.assert_called_once_with('model')
+    assert registry.get_stats()[0]['refcount'] == 2
+
+
+def test_paths_keyed_by_absolute_path():
+    """Relative and absolute spellings of a path name the same model"""
+    registry = ModelRegistry()
+    with tempfile.TemporaryDirectory() as directory, mock.patch.object(model_registry, 'Model') as model_class:
+        model_class.side_effect = lambda path: object()
+        model_path = os.path.join(os.path.realpath(directory), 'model')
+        os.makedirs(model_path)
+        previous = os.getcwd()
+        os.chdir(directory)
+        try:
+            relative = registry.acquire('model')
+            absolute = registry.acquire(model_path)
+            other = registry.acquire('other-model')
+        finally:
+            os.chdir(previous)
+
+        stats = {entry['path']: entry for entry in registry.get_stats()}
+
+    assert relative is absolute
+    assert other is not relative
+    assert model_class.call_count == 2
+    assert stats[model_path]['refcount'] == 2
+
+
+def test_unloaded_at_zero():
+    """The model is dropped with the last reference and loaded again on next use"""
+    registry = ModelRegistry()
+    with mock.patch.object(model_registry, 'Model') as model_class:
+        model_class.side_effect = lambda path: object()
+        first = registry.acquire('model')
+        registry.acquire('model')
+
+        registry.release('model')
+        assert registry.get_stats()[0]['refcount'] == 1
+        registry.release('model')
+        assert registry.get_stats() == []
+
+        # Releasing again is harmless
+        registry.release('model')
+
+        reloaded = registry.acquire('model')
+
+    assert reloaded is not first
+    assert model_class.call_count == 2
+
+
+def test_stats_exclude_model():
+    """Stats report load time and memory, not the model object"""
+    registry = ModelRegistry()
+    with mock.patch.object(model_registry, 'Model'):
+        registry.acquire('model')
+
+    entry = registry.get_stats()[0]
+    assert set(entry) == {'path', 'refcount', 'load_time', 'memory_bytes'}
+    assert entry['load_time'] >= 0 and entry['memory_bytes'] >= 0
+
+
+def main():
+    """Run all tests"""
+    print("\n" + "=" * 70)
+    print("🧪 MODEL REGISTRY TEST SUITE")
+    print("=" * 70)
+
+    tests = [
+        ("Model is shared", test_model_is_shared),
+        ("Keyed by absolute path", test_paths_keyed_by_absolute_path),
+        ("Unloaded at zero", test_unloaded_at_zero),
+        ("Stats exclude the model", test_stats_exclude_model),
+    ]
+
+    passed = 0
+    for name, test in tests:
+        try:
+            test()
+            print(f"  ✅ PASS - {name}")
+            passed += 1
+        except AssertionError as e:
+            print(f"  ❌ FAIL - {name} {e}")
+
+    print(f"\n  Result: {passed}/{len(tests)} tests passed")
+    print("=" * 70)
+
+    return passed == len(tests)
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
@@ -0,0 +1,132 @@
+"""
+Test Ollama Session
+
+Checks the keep-alive session the Ollama client talks through: pooled
+adapter, connect-only retries and split connect/read timeouts, against the
+fake Ollama server. Connection failures are injected by patching urllib3.
+"""
+
+import sys
+import os
+from unittest import mock
+import requests
+from urllib3.connection import HTTPConnection
+from urllib3.exceptions import NewConnectionError
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src import ollama_client
+from src.ollama_client import OllamaClient, create_session
+from src.fake_ollama import FakeOllamaServer
+from src import config
+
+# Set UTF-8 encoding for Windows console
+if sys.platform == 'win32':
+    try:
+        sys.stdout.reconfigure(encoding='utf-8')
+    except:
+        pass
+
+
+def _chat_request(model: str = 'gemma3') -> dict:
+    """Body of a non-streaming chat request"""
+    return {'model': model, 'messages': [{'role': 'user', 'content': 'hi'}], 'stream': False}
+
+
+def test_session_configuration():
+    """Both schemes share one pooled adapter that only retries connecting"""
+    session = create_session(pool_size=3, max_retries=2, backoff=0.25)
+    adapter = session.get_adapter('http://localhost:11434')
+
+    assert adapter is session.get_adapter('https://localhost:11434')
+    assert adapter._pool_maxsize == 3
+    retry = adapter.max_retries
+    assert (retry.total, retry.connect, retry.read, retry.status) == (2, 2, 0, 0)
+    assert retry.backoff_factor == 0.25
+
+
+def test_client_timeouts_and_shared_session():
+    """Clients use split (connect, read) timeouts; model listing reuses one module session"""
+    client = OllamaClient(base_url='http://127.0.0.1:1/', model='gemma3')
+    assert client.timeout == (config.OLLAMA_CONNECT_TIMEOUT, config.OLLAMA_READ_TIMEOUT)
+    assert client.base_url == 'http://127.0.0.1:1'
+
+    with mock.patch.object(ollama_client, '_shared_session', None):
+        session = ollama_client._get_shared_session()
+        assert ollama_client._get_shared_session() is session
+
+
+def test_connect_errors_retried():
+    """A connection that fails to open is tried again and the request goes through"""
+    real_new_conn = HTTPConnection._new_conn
+    attempts = []
+
+    def flaky_new_conn(connection):
+        attempts.append(connection.port)
+        if len(attempts) <= 2:
+            raise NewConnectionError(connection, "Connection refused (injected)")
+        return real_new_conn(connection)
+
+    with FakeOllamaServer() as server, mock.patch.object(HTTPConnection, '_new_conn', flaky_new_conn):
+        session = create_session(max_retries=2, backoff=0)
+        response = session.post(f"{server.base_url}/api/chat", json=_chat_request(), timeout=(2, 5))
+
+        assert response.status_code == 200
+        assert len(attempts) == 3
+        assert server.fake.get_stats()['requests'] == 1
+
+        # Out of retries: the error reaches the caller
+        del attempts[:]
+        session = create_session(max_retries=1, backoff=0)
+        try:
+            session.post(f"{server.base_url}/api/chat", json=_chat_request(), timeout=(2, 5))
+            assert False, "request succeeded without a connection"
+        except requests.ConnectionError:
+            pass
+        assert len(attempts) == 2
+
+
+def test_read_timeout_not_retried():
+    """A request that reached the server is never sent twice, even if the answer is late"""
+    with FakeOllamaServer(load_delay=0.5) as server:
+        session = create_session(max_retries=3, backoff=0)
+        try:
+            session.post(f"{server.base_url}/api/chat", json=_chat_request(), timeout=(2, 0.1))
+            assert False, "slow response didn't time out"
+        except requests.ReadTimeout:
+            pass
+
+        assert server.fake.get_stats()['requests'] == 1
+
+
+def main():
+    """Run all tests"""
+    print("\n" + "=" * 70)
+    print("🧪 OLLAMA SESSION TEST SUITE")
+    print("=" * 70)
+
+    tests = [
+        ("Session configuration", test_session_configuration),
+        ("Client timeouts and shared session", test_client_timeouts_and_shared_session),
+        ("Connect errors retried", test_connect_errors_retried),
+        ("Read timeout not retried", test_read_timeout_not_retried),
+    ]
+
+    passed = 0
+    for name, test in tests:
+        try:
+            test()
+            print(f"  ✅ PASS - {name}")
+            passed += 1
+        except AssertionError as e:
+            print(f"  ❌ FAIL - {name} {e}")
+
+    print(f"\n  Result: {passed}/{len(tests)} tests passed")
+    print("=" * 70)
+
+    return passed == len(tests)
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
@@ -0,0 +1,150 @@
+"""
+Test Render to WAV
+
+Checks that render_to_wav returns what the engine wrote and leaves no file
+behind, on every kind of render target: memfd, a /dev/shm temp file and a
+plain temp file. The engine is a mock, so no speech engine is needed.
+"""
+
+import sys
+import os
+import glob
+import tempfile
+from unittest import mock
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src import text_to_speech
+from src.text_to_speech import render_to_wav
+
+# Set UTF-8 encoding for Windows console
+if sys.platform == 'win32':
+    try:
+        sys.stdout.reconfigure(encoding='utf-8')
+    except:
+        pass
+
+AUDIO = b'RIFF\x24\x00\x00\x00WAVEfmt fake audio'
+
+
+def _mock_engine(fail: bool = False) -> mock.Mock:
+    """Engine mock that writes AUDIO to the path it is given on runAndWait()"""
+    engine = mock.Mock()
+
+    def run_and_wait():
+        if fail:
+            raise RuntimeError("engine failed")
+        text, path = engine.save_to_file.call_args.args
+        with open(path, 'wb') as f:
+            f.write(AUDIO)
+
+    engine.runAndWait.side_effect = run_and_wait
+    return engine
+
+
+def _render(engine) -> tuple:
+    """Render through render_to_wav, noting the fd it used; returns (audio or error, path, fd)"""
+    opened = []
+    real_open_target = text_to_speech._open_render_target
+
+    def open_target():
+        opened.append(real_open_target())
+        return opened[-1]
+
+    with mock.patch.object(text_to_speech, '_open_render_target', open_target):
+        try:
+            result = render_to_wav(engine, "hello")
+        except RuntimeError as e:
+            result = e
+    fd, path = opened[0]
+    return result, path, fd
+
+
+def _fd_closed(fd: int) -> bool:
+    """True if the file descriptor is no longer open"""
+    try:
+        os.fstat(fd)
+        return False
+    except OSError:
+        return True
+
+
+def test_memfd_target():
+    """On Linux the audio never touches a file system"""
+    if not hasattr(os, 'memfd_create') or not os.path.isdir('/proc/self/fd'):
+        return  # No memfd on this platform
+
+    engine = _mock_engine()
+    audio, path, fd = _render(engine)
+
+    assert audio == AUDIO
+    assert path == f'/proc/self/fd/{fd}'
+    engine.save_to_file.assert_called_once_with("hello", path)
+    assert _fd_closed(fd)
+
+
+def test_dev_shm_fallback():
+    """Without memfd the audio goes through a /dev/shm temp file that is removed afterwards"""
+    if not os.path.isdir('/dev/shm'):
+        return  # No /dev/shm on this platform
+
+    leftovers = set(glob.glob('/dev/shm/tts_*.wav'))
+    with mock.patch.object(text_to_speech.os, 'memfd_create', side_effect=OSError("no memfd"), create=True):
+        audio, path, fd = _render(_mock_engine())
+        error, failed_path, failed_fd = _render(_mock_engine(fail=True))
+
+    assert audio == AUDIO
+    assert os.path.dirname(path) == '/dev/shm' and os.path.basename(path).startswith('tts_')
+    assert isinstance(error, RuntimeError)
+    # Removed whether or not the engine succeeded
+    for rendered_path, rendered_fd in ((path, fd), (failed_path, failed_fd)):
+        assert not os.path.exists(rendered_path)
+        assert _fd_closed(rendered_fd)
+    assert set(glob.glob('/dev/shm/tts_*.wav')) == leftovers
+
+
+def test_temp_dir_fallback():
+    """Without memfd or /dev/shm a regular temp file is used and removed"""
+    real_isdir = os.path.isdir
+    with tempfile.TemporaryDirectory() as directory, \
+            mock.patch.object(tempfile, 'tempdir', directory), \
+            mock.patch.object(text_to_speech.os, 'memfd_create', side_effect=OSError("no memfd"), create=True), \
+            mock.patch.object(text_to_speech.os.path, 'isdir', lambda p: p != '/dev/shm' and real_isdir(p)):
+        audio, path, fd = _render(_mock_engine())
+
+        assert audio == AUDIO
+        assert os.path.dirname(path) == directory
+        assert os.listdir(directory) == []
+    assert _fd_closed(fd)
+
+
+def main():
+    """Run all tests"""
+    print("\n" + "=" * 70)
+    print("🧪 RENDER TO WAV TEST SUITE")
+    print("=" * 70)
+
+    tests = [
+        ("memfd target", test_memfd_target),
+        ("/dev/shm fallback", test_dev_shm_fallback),
+        ("Temp dir fallback", test_temp_dir_fallback),
+    ]
+
+    passed = 0
+    for name, test in tests:
+        try:
+            test()
+            print(f"  ✅ PASS - {name}")
+            passed += 1
+        except AssertionError as e:
+            print(f"  ❌ FAIL - {name} {e}")
+
+    print(f"\n  Result: {passed}/{len(tests)} tests passed")
+    print("=" * 70)
+
+    return passed == len(tests)
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
@@ -0,0 +1,111 @@
+"""
+Test Resampler
+
+Checks the polyphase resampler against scipy, chunked streaming against
+whole-buffer resampling, and that filters are designed once per rate pair.
+"""
+
+import sys
+import os
+import numpy as np
+from scipy import signal
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.resampler import PolyphaseResampler, resample, filter_cache_info, to_int16
+
+# Set UTF-8 encoding for Windows console
+if sys.platform == 'win32':
+    try:
+        sys.stdout.reconfigure(encoding='utf-8')
+    except:
+        pass
+
+
+def make_audio(sample_rate: int, duration: float = 0.5) -> np.ndarray:
+    """Noise plus a tone, in int16 units"""
+    rng = np.random.default_rng(0)
+    t = np.arange(int(sample_rate * duration)) / sample_rate
+    return 8000 * np.sin(2 * np.pi * 440 * t) + 2000 * rng.standard_normal(len(t))
+
+
+def test_matches_resample_poly():
+    """Output matches scipy.signal.resample_poly for common microphone rates"""
+    for source_rate in (48000, 44100, 22050, 8000):
+        audio = make_audio(source_rate)
+        divisor = np.gcd(16000, source_rate)
+        expected = signal.resample_poly(audio, 16000 // divisor, source_rate // divisor)
+        result = resample(audio, source_rate, 16000)
+
+        assert result.dtype == np.float32
+        assert len(result) == len(expected), f"{source_rate}: {len(result)} != {len(expected)}"
+        assert np.max(np.abs(result - expected)) < 1e-3 * np.max(np.abs(expected)), source_rate
+
+
+def test_streaming_matches_whole_buffer():
+    """Feeding odd-sized chunks gives the same samples as one call"""
+    audio = make_audio(44100)
+    whole = resample(audio, 44100, 16000)
+
+    resampler = PolyphaseResampler(44100, 16000)
+    pieces = []
+    for start in range(0, len(audio), 997):
+        pieces.append(resampler.process(audio[start:start + 997]))
+    pieces.append(resampler.flush())
+    streamed = np.concatenate(pieces)
+
+    assert len(streamed) == len(whole)
+    assert np.allclose(streamed, whole, atol=1e-2)
+
+
+def test_filters_are_cached():
+    """Resamplers for the same rate pair share one filter design"""
+    PolyphaseResampler(32000, 16000)
+    before = filter_cache_info()
+    PolyphaseResampler(32000, 16000)
+    PolyphaseResampler(64000, 32000)  # Same reduced ratio
+    after = filter_cache_info()
+
+    assert after.hits == before.hits + 2
+    assert after.misses == before.misses
+    assert after.maxsize is not None and after.currsize <= after.maxsize  # Odd rates don't pile up
+
+
+def test_passthrough_and_int16():
+    """Equal rates pass samples through; to_int16 rounds and clips"""
+    audio = np.array([1, -2, 3], dtype=np.int16)
+    assert np.array_equal(resample(audio, 16000, 16000), audio.astype(np.float32))
+    assert np.array_equal(to_int16(np.array([40000.0, -40000.0, 1.6])), np.array([32767, -32768, 2], dtype=np.int16))
+
+
+def main():
+    """Run all tests"""
+    print("\n" + "=" * 70)
+    print("🧪 RESAMPLER TEST SUITE")
+    print("=" * 70)
+
+    tests = [
+        ("Matches resample_poly", test_matches_resample_poly),
+        ("Streaming matches whole buffer", test_streaming_matches_whole_buffer),
+        ("Filter cache", test_filters_are_cached),
+        ("Passthrough and int16", test_passthrough_and_int16),
+    ]
+
+    passed = 0
+    for name, test in tests:
+        try:
+            test()
+            print(f"  ✅ PASS - {name}")
+            passed += 1
+        except AssertionError as e:
+            print(f"  ❌ FAIL - {name} {e}")
+
+    print(f"\n  Result: {passed}/{len(tests)} tests passed")
+    print("=" * 70)
+
+    return passed == len(tests)
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
@@ -0,0 +1,89 @@
+"""
+Test Response Audio Store
+
+Checks that synthesized web responses can be fetched by id until they expire.
+"""
+
+import sys
+import os
+import time
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.response_audio_store import ResponseAudioStore
+
+# Set UTF-8 encoding for Windows console
+if sys.platform == 'win32':
+    try:
+        sys.stdout.reconfigure(encoding='utf-8')
+    except:
+        pass
+
+
+def test_fetch_by_id():
+    """Stored audio is returned unchanged for its id"""
+    store = ResponseAudioStore(ttl=60, max_entries=4)
+    first = store.put(b"RIFF-one")
+    second = store.put(b"RIFF-two")
+
+    assert first != second
+    assert store.get(first) == b"RIFF-one"
+    assert store.get(second) == b"RIFF-two"
+    assert store.get("unknown") is None
+    assert store.hits == 2 and store.misses == 1
+
+
+def test_entries_expire():
+    """Audio nobody fetched in time is dropped"""
+    store = ResponseAudioStore(ttl=0.05, max_entries=4)
+    response_id = store.put(b"RIFF")
+    time.sleep(0.1)
+
+    assert store.get(response_id) is None
+    assert len(store) == 0
+    assert store.expired == 1
+    assert store.evicted == 0
+
+
+def test_oldest_evicted_when_full():
+    """The store never holds more than max_entries responses"""
+    store = ResponseAudioStore(ttl=60, max_entries=2)
+    ids = [store.put(bytes([i])) for i in range(3)]
+
+    assert len(store) == 2
+    assert store.get(ids[0]) is None
+    assert store.get(ids[2]) == bytes([2])
+    stats = store.get_stats()
+    assert (stats['evicted'], stats['expired']) == (1, 0)
+
+
+def main():
+    """Run all tests"""
+    print("\n" + "=" * 70)
+    print("🧪 RESPONSE AUDIO STORE TEST SUITE")
+    print("=" * 70)
+
+    tests = [
+        ("Fetch by id", test_fetch_by_id),
+        ("Expiry", test_entries_expire),
+        ("Eviction", test_oldest_evicted_when_full),
+    ]
+
+    passed = 0
+    for name, test in tests:
+        try:
+            test()
+            print(f"  ✅ PASS - {name}")
+            passed += 1
+        except AssertionError as e:
+            print(f"  ❌ FAIL - {name} {e}")
+
+    print(f"\n  Result: {passed}/{len(tests)} tests passed")
+    print("=" * 70)
+
+    return passed == len(tests)
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
@@ -0,0 +1,112 @@
+"""
+Test Sentence Segmenter
+
+Checks how streamed LLM tokens are split into sentences for TTS.
+"""
+
+import sys
+import os
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.sentence_segmenter import SentenceSegmenter
+
+# Set UTF-8 encoding for Windows console
+if sys.platform == 'win32':
+    try:
+        sys.stdout.reconfigure(encoding='utf-8')
+    except:
+        pass
+
+
+def segment(tokens, min_length=12):
+    """Feed tokens one by one and return (sentences, step each was emitted at)"""
+    segmenter = SentenceSegmenter(min_length=min_length)
+    emitted = []
+    for step, token in enumerate(tokens):
+        emitted += [(sentence, step) for sentence in segmenter.feed(token)]
+    remaining = segmenter.flush()
+    if remaining:
+        emitted.append((remaining, len(tokens)))
+    return emitted
+
+
+def test_sentences_emitted_as_soon_as_complete():
+    """The first sentence is available before the rest is generated"""
+    tokens = ["The capital", " of France", " is Paris.", " It is", " known for", " the Eiffel Tower."]
+    emitted = segment(tokens)
+
+    assert [s for s, _ in emitted] == ["The capital of France is Paris.", "It is known for the Eiffel Tower."]
+    # Boundary is confirmed by the whitespace at the start of the next token
+    assert emitted[0][1] == 3
+
+
+def test_numbers_and_abbreviations_not_split():
+    """Decimal points and common abbreviations are not sentence ends"""
+    text = "Pi is about 3.14 and Dr. Smith agrees, e.g. in his book. Next sentence here."
+    emitted = segment(list(text))
+
+    assert [s for s, _ in emitted] == [
+        "Pi is about 3.14 and Dr. Smith agrees, e.g. in his book.",
+        "Next sentence here."
+    ]
+
+
+def test_no_is_only_abbreviated_before_numbers():
+    """'No.' before a number is an abbreviation; a sentence ending in 'no.' is split"""
+    text = "Try room No. 5 on the left. I think the answer is no. Ask again tomorrow."
+    emitted = segment(list(text))
+
+    assert [s for s, _ in emitted] == [
+        "Try room No. 5 on the left.",
+        "I think the answer is no.",
+        "Ask again tomorrow."
+    ]
+
+
+def test_short_fragments_merged():
+    """Very short sentences are merged into the following one"""
+    emitted = segment(["Sure! ", "Here is a quick answer for you. ", "Ok."])
+
+    assert [s for s, _ in emitted] == ["Sure! Here is a quick answer for you.", "Ok."]
+
+
+def test_line_breaks_end_sentences():
+    """List items separated by newlines are spoken separately"""
+    emitted = segment(["1. Eggs\n", "2. Milk\n", "3. Bread"])
+
+    assert [s for s, _ in emitted] == ["1. Eggs", "2. Milk", "3. Bread"]
+
+
+def main():
+    """Run all tests"""
+    print("\n" + "=" * 70)
+    print("🧪 SENTENCE SEGMENTER TEST SUITE")
+    print("=" * 70)
+
+    tests = [
+        ("Incremental sentences", test_sentences_emitted_as_soon_as_complete),
+        ("Numbers and abbreviations", test_numbers_and_abbreviations_not_split),
+        ("No. before numbers", test_no_is_only_abbreviated_before_numbers),
+        ("Short fragments", test_short_fragments_merged),
+        ("Line breaks", test_line_breaks_end_sentences),
+    ]
+
+    passed = 0
+    for name, test in tests:
+        try:
+            test()
+            print(f"  ✅ PASS - {name}")
+            passed += 1
+        except AssertionError as e:
+            print(f"  ❌ FAIL - {name} {e}")
+
+    print(f"\n  Result: {passed}/{len(tests)} tests passed")
+    print("=" * 70)
+
+    return passed == len(tests)
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
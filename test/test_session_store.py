@@ -0,0 +1,89 @@
+"""
+Test Session Store
+
+Checks per-client sessions in web mode: isolation, idle expiry and LRU eviction.
+"""
+
+import sys
+import os
+import time
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.session_store import SessionStore
+
+# Set UTF-8 encoding for Windows console
+if sys.platform == 'win32':
+    try:
+        sys.stdout.reconfigure(encoding='utf-8')
+    except:
+        pass
+
+
+def test_sessions_are_separate():
+    """Each client gets its own history, and the same id returns the same session"""
+    store = SessionStore(timeout=60, max_sessions=10)
+    alice = store.get_or_create(None)
+    bob = store.get_or_create(None)
+    alice.history.append({"role": "user", "content": "hi"})
+
+    assert alice.id != bob.id
+    assert store.get_or_create(alice.id) is alice
+    assert list(bob.history) == []
+
+
+def test_idle_sessions_expire():
+    """Sessions unused for longer than the timeout are dropped"""
+    store = SessionStore(timeout=0.05, max_sessions=10)
+    session = store.get_or_create(None)
+    time.sleep(0.1)
+
+    assert store.get(session.id) is None
+    assert store.get_or_create(session.id).id != session.id
+    assert store.expired == 1
+
+
+def test_least_recently_used_evicted():
+    """The number of sessions is capped, dropping the least recently used"""
+    store = SessionStore(timeout=60, max_sessions=2)
+    first = store.get_or_create(None)
+    second = store.get_or_create(None)
+    store.get(first.id)  # second is now least recently used
+    store.get_or_create(None)
+
+    assert len(store) == 2
+    assert store.get(first.id) is first
+    assert store.get(second.id) is None
+    assert store.evicted == 1
+
+
+def main():
+    """Run all tests"""
+    print("\n" + "=" * 70)
+    print("🧪 SESSION STORE TEST SUITE")
+    print("=" * 70)
+
+    tests = [
+        ("Separate sessions", test_sessions_are_separate),
+        ("Idle expiry", test_idle_sessions_expire),
+        ("LRU eviction", test_least_recently_used_evicted),
+    ]
+
+    passed = 0
+    for name, test in tests:
+        try:
+            test()
+            print(f"  ✅ PASS - {name}")
+            passed += 1
+        except AssertionError as e:
+            print(f"  ❌ FAIL - {name} {e}")
+
+    print(f"\n  Result: {passed}/{len(tests)} tests passed")
+    print("=" * 70)
+
+    return passed == len(tests)
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
@@ -0,0 +1,206 @@
+"""
+Test Stream Server
+
+Speaks the WebSocket protocol to a running StreamServer on a free port:
+start -> binary PCM frames -> stop -> transcript, tokens, sentence audio
+and done. Recognition is stubbed (no Vosk model needed) and the LLM is the
+fake Ollama server.
+"""
+
+import sys
+import os
+import json
+from concurrent.futures import Future
+import numpy as np
+from websockets.exceptions import InvalidStatus
+from websockets.sync.client import connect
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.stream_server import StreamServer, web_origins
+from src.session_store import SessionStore
+from src.ollama_client import OllamaClient
+from src.fake_ollama import FakeOllamaServer
+from src import config
+
+# Set UTF-8 encoding for Windows console
+if sys.platform == 'win32':
+    try:
+        sys.stdout.reconfigure(encoding='utf-8')
+    except:
+        pass
+
+
+class _Recognizer:
+    """Stands in for a KaldiRecognizer: hears a fixed phrase once given audio"""
+
+    def __init__(self, text: str):
+        self.text = text
+        self.samples = 0
+
+    def FinalResult(self) -> str:
+        return json.dumps({'text': self.text if self.samples else ''})
+
+
+class _SpeechToText:
+    """Stands in for SpeechToText without loading a Vosk model"""
+
+    sample_rate = config.SAMPLE_RATE
+
+    def __init__(self, text: str = "hello there"):
+        self.text = text
+        self.recognizers = []
+
+    def create_recognizer(self, grammar=None) -> _Recognizer:
+        recognizer = _Recognizer(self.text)
+        self.recognizers.append(recognizer)
+        return recognizer
+
+    def transcribe_stream(self, audio_chunk, recognizer: _Recognizer) -> tuple:
+        recognizer.samples += len(audio_chunk)
+        return "", ""
+
+
+def _synthesize(sentence: str) -> Future:
+    """Fake synthesis: the sentence's bytes instead of a WAV"""
+    future = Future()
+    future.set_result(sentence.encode('utf-8'))
+    return future
+
+
+class _Running:
+    """Fake Ollama and a stream server on free ports, for a with block"""
+
+    def __enter__(self):
+        self.ollama_server = FakeOllamaServer(replies=["Hello to you as well. How can I help today?"]).start()
+        self.stt = _SpeechToText()
+        ollama = OllamaClient(base_url=self.ollama_server.base_url, model='gemma3')
+        # As if the page came from a web server on 127.0.0.1:5000
+        self.server = StreamServer(self.stt, ollama, SessionStore(), _synthesize, host="127.0.0.1", port=0,
+                                   origins=web_origins("127.0.0.1", 5000, secure=False))
+        self.server.start()
+        self.url = f"ws://127.0.0.1:{self.server.port}/"
+        return self
+
+    def __exit__(self, *exc_info):
+        self.server.stop()
+        self.ollama_server.stop()
+
+
+def _receive_until_done(websocket) -> list:
+    """Collect (type, payload) messages up to 'done', binary frames as ('binary', bytes)"""
+    received = []
+    while True:
+        message = websocket.recv(timeout=10)
+        if isinstance(message, bytes):
+            received.append(('binary', message))
+            continue
+        message = json.loads(message)
+        received.append((message['type'], message))
+        if message['type'] == 'done':
+            return received
+
+
+def test_utterance_round_trip():
+    """Frames streamed between start and stop come back as a transcript and a spoken answer"""
+    with _Running() as running, connect(running.url) as websocket:
+        assert json.loads(websocket.recv(timeout=5))['type'] == 'ready'
+
+        websocket.send(json.dumps({'type': 'start', 'sample_rate': 48000}))
+        frame = np.zeros(4800, dtype='<i2').tobytes()  # 100 ms at 48 kHz
+        for _ in range(5):
+            websocket.send(frame)
+        websocket.send(json.dumps({'type': 'stop'}))
+
+        received = _receive_until_done(websocket)
+
+    types = [kind for kind, _ in received]
+    assert received[0] == ('transcript', {'type': 'transcript', 'text': 'hello there'})
+    assert 'token' in types
+    sentences = ["Hello to you as well.", "How can I help today?"]
+    assert [payload['text'] for kind, payload in received if kind == 'audio'] == sentences
+    assert [payload for kind, payload in received if kind == 'binary'] == [s.encode('utf-8') for s in sentences]
+    assert received[-1][1]['response_text'] == "Hello to you as well. How can I help today?"
+    # 0.5 s at 48 kHz arrives resampled to 16 kHz
+    assert abs(running.stt.recognizers[0].samples - 0.5 * config.SAMPLE_RATE) <= 0.05 * config.SAMPLE_RATE
+
+
+def test_bad_input_keeps_connection():
+    """Bad sample rates, odd-length frames and malformed commands get an error, not a hang-up"""
+    with _Running() as running, connect(running.url) as websocket:
+        assert json.loads(websocket.recv(timeout=5))['type'] == 'ready'
+
+        for sample_rate in ("fast", 191999 * 2, None):
+            websocket.send(json.dumps({'type': 'start', 'sample_rate': sample_rate}))
+            assert json.loads(websocket.recv(timeout=5))['type'] == 'error'
+
+        websocket.send("not json")
+        assert json.loads(websocket.recv(timeout=5))['type'] == 'error'
+
+        websocket.send(json.dumps({'type': 'start', 'sample_rate': 16000}))
+        websocket.send(b'\x00\x00\x00')
+        assert json.loads(websocket.recv(timeout=5)) == {'type': 'error', 'error': 'PCM data must be 16-bit samples'}
+
+        # Still usable afterwards
+        websocket.send(np.zeros(1600, dtype='<i2').tobytes())
+        websocket.send(json.dumps({'type': 'stop'}))
+        received = _receive_until_done(websocket)
+
+    assert received[0][1]['text'] == 'hello there'
+
+
+def test_foreign_origin_rejected():
+    """Only pages from the web server may connect; other sites get a 403 at the handshake"""
+    with _Running() as running:
+        with connect(running.url, origin="http://127.0.0.1:5000") as websocket:
+            assert json.loads(websocket.recv(timeout=5))['type'] == 'ready'
+
+        for origin in ("http://evil.example", "http://127.0.0.1:8080", "https://127.0.0.1:5000"):
+            try:
+                connect(running.url, origin=origin).close()
+                assert False, f"{origin} accepted"
+            except InvalidStatus as e:
+                assert e.response.status_code == 403
+
+
+def test_web_origins():
+    """Origins are listed the way browsers send them"""
+    assert web_origins("192.168.1.20", 5000, secure=True) == ["https://192.168.1.20:5000"]
+    assert web_origins("example.com", 443, secure=True) == ["https://example.com"]
+
+    origins = web_origins("0.0.0.0", 5000, secure=False, addresses=("10.0.0.7", "fe80::1", None))
+    for origin in ("http://localhost:5000", "http://[::1]:5000", "http://10.0.0.7:5000", "http://[fe80::1]:5000"):
+        assert origin in origins
+
+
+def main():
+    """Run all tests"""
+    print("\n" + "=" * 70)
+    print("🧪 STREAM SERVER TEST SUITE")
+    print("=" * 70)
+
+    tests = [
+        ("Utterance round trip", test_utterance_round_trip),
+        ("Bad input keeps the connection", test_bad_input_keeps_connection),
+        ("Foreign origin rejected", test_foreign_origin_rejected),
+        ("Web origins", test_web_origins),
+    ]
+
+    passed = 0
+    for name, test in tests:
+        try:
+            test()
+            print(f"  ✅ PASS - {name}")
+            passed += 1
+        except AssertionError as e:
+            print(f"  ❌ FAIL - {name} {e}")
+
+    print(f"\n  Result: {passed}/{len(tests)} tests passed")
+    print("=" * 70)
+
+    return passed == len(tests)
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
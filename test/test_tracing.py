@@ -0,0 +1,117 @@
+"""
+Test Tracing
+
+Checks per-turn latency marks, JSON line export, percentile aggregation
+and that a disabled tracer records nothing.
+"""
+
+import sys
+import os
+import json
+import tempfile
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.tracing import Tracer, Turn, NULL_TURN, trace_tokens
+
+# Set UTF-8 encoding for Windows console
+if sys.platform == 'win32':
+    try:
+        sys.stdout.reconfigure(encoding='utf-8')
+    except:
+        pass
+
+
+def make_turn(tracer: Tracer, marks: dict) -> Turn:
+    """Turn with fixed mark offsets (seconds since turn start)"""
+    turn = tracer.start_turn('test')
+    turn.marks.update(marks)
+    return turn
+
+
+def test_stage_durations():
+    """Each stage is timed from the latest earlier stage, even when streaming overlaps them"""
+    turn = make_turn(Tracer(enabled=True, export_path=''), {
+        'wake_word': 0.0, 'endpoint': 2.0, 'stt_final': 2.5,
+        'first_token': 3.0, 'tts_first_audio': 3.4, 'last_token': 4.0
+    })
+    durations = turn.stage_durations()
+
+    assert durations['stt_final'] == 0.5
+    assert abs(durations['tts_first_audio'] - 0.4) < 1e-9  # From first_token, not last_token
+    assert durations['last_token'] == 1.0
+    assert durations['total'] == 4.0
+
+
+def test_export_and_percentiles():
+    """Finished turns are written as JSON lines and aggregated per stage"""
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'traces.jsonl')
+        tracer = Tracer(enabled=True, export_path=path, window=100)
+        for i in range(100):
+            make_turn(tracer, {'endpoint': 1.0, 'stt_final': 1.0 + (i + 1) / 100}).finish()
+
+        with open(path, encoding='utf-8') as trace_file:
+            lines = [json.loads(line) for line in trace_file]
+
+    assert len(lines) == 100
+    assert lines[0]['marks']['stt_final'] == 1.01
+
+    summary = tracer.percentiles()
+    assert summary['stt_final']['count'] == 100
+    assert abs(summary['stt_final']['p50'] - 0.505) < 1e-3
+    assert abs(summary['stt_final']['p99'] - 0.99) < 1e-2
+
+
+def test_trace_tokens():
+    """The token wrapper marks the request, first token and last token"""
+    turn = Tracer(enabled=True, export_path='').start_turn('test')
+    assert list(trace_tokens(turn, iter(["a", "b"]))) == ["a", "b"]
+    assert list(turn.marks) == ['llm_request', 'first_token', 'last_token']
+
+
+def test_disabled_records_nothing():
+    """A disabled tracer hands out the shared no-op turn"""
+    tracer = Tracer(enabled=False)
+    turn = tracer.start_turn('test')
+    tokens = iter(["a"])
+
+    assert turn is NULL_TURN
+    turn.mark('endpoint')
+    turn.finish()
+    assert trace_tokens(turn, tokens) is tokens
+    assert tracer.turns == 0
+    assert tracer.percentiles() == {}
+
+
+def main():
+    """Run all tests"""
+    print("\n" + "=" * 70)
+    print("🧪 TRACING TEST SUITE")
+    print("=" * 70)
+
+    tests = [
+        ("Stage durations", test_stage_durations),
+        ("Export and percentiles", test_export_and_percentiles),
+        ("Token stream marks", test_trace_tokens),
+        ("Disabled tracer", test_disabled_records_nothing),
+    ]
+
+    passed = 0
+    for name, test in tests:
+        try:
+            test()
+            print(f"  ✅ PASS - {name}")
+            passed += 1
+        except AssertionError as e:
+            print(f"  ❌ FAIL - {name} {e}")
+
+    print(f"\n  Result: {passed}/{len(tests)} tests passed")
+    print("=" * 70)
+
+    return passed == len(tests)
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
@@ -0,0 +1,109 @@
+"""
+Test TTS Cache
+
+Checks cache keys, the memory budget and the on-disk spill directory.
+"""
+
+import sys
+import os
+import tempfile
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.tts_cache import TTSCache
+
+# Set UTF-8 encoding for Windows console
+if sys.platform == 'win32':
+    try:
+        sys.stdout.reconfigure(encoding='utf-8')
+    except:
+        pass
+
+
+def test_keys():
+    """Whitespace doesn't matter, voice settings do"""
+    key = TTSCache.make_key("Goodbye!", None, 150, 0.9)
+
+    assert key == TTSCache.make_key("  Goodbye!\n", None, 150, 0.9)
+    assert key != TTSCache.make_key("Goodbye!", None, 180, 0.9)
+    assert key != TTSCache.make_key("Goodbye!", "voice-2", 150, 0.9)
+    assert key != TTSCache.make_key("Goodbye!", None, 150, 0.5)
+
+
+def test_synthesizes_once():
+    """A repeated phrase is synthesized only the first time"""
+    cache = TTSCache(max_bytes=1024, spill_dir="")
+    calls = []
+
+    def synthesize():
+        calls.append(1)
+        return b"RIFF-audio"
+
+    key = TTSCache.make_key("Hello", None, 150, 0.9)
+    first = cache.get_or_synthesize(key, synthesize)
+    second = cache.get_or_synthesize(key, synthesize)
+
+    assert first == second == b"RIFF-audio"
+    assert len(calls) == 1
+    assert cache.hits == 1 and cache.misses == 1
+
+
+def test_memory_budget():
+    """Least recently used entries are evicted to stay within the budget"""
+    cache = TTSCache(max_bytes=250, spill_dir="")
+    cache.put("a", b"a" * 100)
+    cache.put("b", b"b" * 100)
+    cache.get("a")  # "b" is now least recently used
+    cache.put("c", b"c" * 100)
+
+    assert cache.size_bytes <= 250
+    assert cache.get("b") is None
+    assert cache.get("a") is not None and cache.get("c") is not None
+    assert cache.evictions == 1
+
+
+def test_spill_directory():
+    """Entries evicted from memory are reloaded from the spill directory"""
+    with tempfile.TemporaryDirectory() as spill_dir:
+        cache = TTSCache(max_bytes=150, spill_dir=spill_dir)
+        cache.put("a", b"a" * 100)
+        cache.put("b", b"b" * 100)
+
+        assert cache.get("a") == b"a" * 100
+        assert cache.disk_hits == 1
+
+        # A new cache (e.g. after a restart) finds spilled entries too
+        assert TTSCache(max_bytes=150, spill_dir=spill_dir).get("a") == b"a" * 100
+
+
+def main():
+    """Run all tests"""
+    print("\n" + "=" * 70)
+    print("🧪 TTS CACHE TEST SUITE")
+    print("=" * 70)
+
+    tests = [
+        ("Cache keys", test_keys),
+        ("Synthesize once", test_synthesizes_once),
+        ("Memory budget", test_memory_budget),
+        ("Spill directory", test_spill_directory),
+    ]
+
+    passed = 0
+    for name, test in tests:
+        try:
+            test()
+            print(f"  ✅ PASS - {name}")
+            passed += 1
+        except AssertionError as e:
+            print(f"  ❌ FAIL - {name} {e}")
+
+    print(f"\n  Result: {passed}/{len(tests)} tests passed")
+    print("=" * 70)
+
+    return passed == len(tests)
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
@@ -0,0 +1,166 @@
+"""
+Test TTS Service
+
+Runs the spawned worker pool with a stand-in engine instead of pyttsx3, so
+no speech engine is needed: each worker writes the text it was given into
+a small WAV file, through the real render_to_wav.
+"""
+
+import sys
+import os
+import io
+import time
+import wave
+from unittest import mock
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src import tts_service
+from src.tts_service import TTSService
+from src.metrics import REGISTRY
+
+# Set UTF-8 encoding for Windows console
+if sys.platform == 'win32':
+    try:
+        sys.stdout.reconfigure(encoding='utf-8')
+    except:
+        pass
+
+SYNTHESIS_DELAY = 0.05  # Seconds the stand-in engine takes per text
+
+
+class _Engine:
+    """Stands in for a pyttsx3 engine: "speaks" the text as 8-bit samples"""
+
+    def __init__(self):
+        self.pending = None
+
+    def save_to_file(self, text: str, path: str):
+        self.pending = (text, path)
+
+    def runAndWait(self):
+        text, path = self.pending
+        if text == "fail":
+            raise RuntimeError("synthesis failed")
+        time.sleep(SYNTHESIS_DELAY)
+        with wave.open(path, 'wb') as wav_file:
+            wav_file.setnchannels(1)
+            wav_file.setsampwidth(1)
+            wav_file.setframerate(8000)
+            wav_file.writeframes(text.encode('utf-8'))
+
+
+def _init_worker(rate: int, volume: float):
+    """Worker initializer giving the worker a stand-in engine (runs in the spawned process)"""
+    from src import tts_service as worker_module
+    worker_module._worker_engine = _Engine()
+
+
+def _spoken_text(audio: bytes) -> str:
+    """Text a stand-in engine wrote into a WAV"""
+    with wave.open(io.BytesIO(audio), 'rb') as wav_file:
+        return wav_file.readframes(wav_file.getnframes()).decode('utf-8')
+
+
+def _metric(name: str) -> float:
+    """Current value of an unlabelled sample in the default registry (0 if not recorded yet)"""
+    for line in REGISTRY.render().splitlines():
+        if line.startswith(name + ' '):
+            return float(line.split()[1])
+    return 0.0
+
+
+def test_jobs_synthesized_in_workers():
+    """Queued texts come back as audio, with queue wait and synthesis time recorded"""
+    synthesis_count = _metric('assistant_tts_synthesis_seconds_count')
+    queue_wait_count = _metric('assistant_tts_queue_wait_seconds_count')
+
+    with mock.patch.object(tts_service, '_init_worker', _init_worker):
+        service = TTSService(workers=1)
+    try:
+        texts = ["Hello there.", "How can I help?", "Goodbye."]
+        futures = [service.submit(text) for text in texts]
+        assert [_spoken_text(future.result(timeout=60)) for future in futures] == texts
+
+        stats = service.get_stats()
+        assert (stats['submitted'], stats['completed'], stats['failed'], stats['pending']) == (3, 3, 0, 0)
+        assert stats['avg_synthesis_time'] >= SYNTHESIS_DELAY
+        # One worker: the last job waited at least for the two before it
+        assert stats['max_queue_wait'] >= 2 * SYNTHESIS_DELAY
+        assert stats['avg_queue_wait'] <= stats['max_queue_wait']
+    finally:
+        service.shutdown()
+
+    assert _metric('assistant_tts_synthesis_seconds_count') == synthesis_count + 3
+    assert _metric('assistant_tts_queue_wait_seconds_count') == queue_wait_count + 3
+
+
+def test_failure_reported():
+    """An engine error reaches the caller's Future and is counted"""
+    failures = _metric('assistant_tts_failures_total')
+
+    with mock.patch.object(tts_service, '_init_worker', _init_worker):
+        service = TTSService(workers=1)
+    try:
+        try:
+            service.synthesize("fail", timeout=60)
+            assert False, "engine error swallowed"
+        except RuntimeError as e:
+            assert "synthesis failed" in str(e)
+
+        # The worker keeps serving afterwards
+        assert _spoken_text(service.synthesize("still here", timeout=60)) == "still here"
+        stats = service.get_stats()
+        assert (stats['completed'], stats['failed'], stats['pending']) == (1, 1, 0)
+    finally:
+        service.shutdown()
+
+    assert _metric('assistant_tts_failures_total') == failures + 1
+
+
+def test_shutdown_finishes_queued_jobs():
+    """Shutdown waits for queued jobs, then refuses new ones"""
+    with mock.patch.object(tts_service, '_init_worker', _init_worker):
+        service = TTSService(workers=2)
+    futures = [service.submit(f"sentence {i}") for i in range(4)]
+    service.shutdown()
+
+    assert all(future.done() for future in futures)
+    assert _spoken_text(futures[3].result()) == "sentence 3"
+    try:
+        service.submit("too late")
+        assert False, "job accepted after shutdown"
+    except RuntimeError:
+        pass
+
+
+def main():
+    """Run all tests"""
+    print("\n" + "=" * 70)
+    print("🧪 TTS SERVICE TEST SUITE")
+    print("=" * 70)
+
+    tests = [
+        ("Jobs synthesized in workers", test_jobs_synthesized_in_workers),
+        ("Failure reported", test_failure_reported),
+        ("Shutdown finishes queued jobs", test_shutdown_finishes_queued_jobs),
+    ]
+
+    passed = 0
+    for name, test in tests:
+        try:
+            test()
+            print(f"  ✅ PASS - {name}")
+            passed += 1
+        except AssertionError as e:
+            print(f"  ❌ FAIL - {name} {e}")
+
+    print(f"\n  Result: {passed}/{len(tests)} tests passed")
+    print("=" * 70)
+
+    return passed == len(tests)
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
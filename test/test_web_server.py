@@ -68,7 +68,7 @@ def test_web_server_initialization():
         assert hasattr(server, 'stt'), "Server should have 'stt' attribute"
         assert hasattr(server, 'tts'), "Server should have 'tts' attribute"
         assert hasattr(server, 'ollama'), "Server should have 'ollama' attribute"
-        assert hasattr(server, 'conversation_history'), "Server should have 'conversation_history' attribute"
+        assert hasattr(server, 'sessions'), "Server should have 'sessions' attribute"
         print("  ✅ All attributes present")
 
         # Check routes
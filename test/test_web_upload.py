@@ -0,0 +1,101 @@
+"""
+Test Web Audio Upload
+
+Posts raw PCM (application/octet-stream) to /api/process_audio through
+Flask's test client. Speech recognition, the LLM and TTS are replaced by
+mocks, so no Vosk model, Ollama server or TTS engine is needed.
+"""
+
+import sys
+import os
+from concurrent.futures import Future
+from unittest import mock
+import numpy as np
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src import web_server
+
+# Set UTF-8 encoding for Windows console
+if sys.platform == 'win32':
+    try:
+        sys.stdout.reconfigure(encoding='utf-8')
+    except:
+        pass
+
+
+def _create_client():
+    """Web server with mocked components, and a Flask test client for it"""
+    with mock.patch.object(web_server, 'SpeechToText'), mock.patch.object(web_server, 'TTSService'), \
+            mock.patch.object(web_server, 'OllamaClient'):
+        server = web_server.WebServer(host="127.0.0.1", port=0)
+
+    server.tts_cache = None
+    server.stt.transcribe_audio.return_value = "what time is it"
+    server.ollama.chat.return_value = "It is noon."
+    audio = Future()
+    audio.set_result(b"RIFF")
+    server.tts.submit.return_value = audio
+    return server, server.app.test_client()
+
+
+def _post(client, data: bytes, sample_rate="16000"):
+    headers = {'X-Sample-Rate': sample_rate} if sample_rate is not None else {}
+    return client.post('/api/process_audio', data=data, headers=headers,
+                       content_type='application/octet-stream')
+
+
+def test_valid_pcm():
+    """Even-length PCM is transcribed at the rate from the header"""
+    server, client = _create_client()
+    pcm = (np.arange(8000) % 200 - 100).astype('<i2')
+
+    response = _post(client, pcm.tobytes(), sample_rate="48000")
+
+    assert response.status_code == 200
+    assert response.get_json()['transcribed_text'] == "what time is it"
+    audio_array = server.stt.transcribe_audio.call_args.args[0]
+    assert np.array_equal(audio_array, pcm)
+    assert server.stt.transcribe_audio.call_args.kwargs['source_sample_rate'] == 48000
+
+
+def test_rejected_pcm():
+    """Odd-length and empty bodies and bad rate headers are client errors, not 500s"""
+    server, client = _create_client()
+
+    assert _post(client, b'\x00\x01\x02').status_code == 400
+    assert _post(client, b'').status_code == 400
+    assert _post(client, b'\x00\x00', sample_rate="fast").status_code == 400
+    assert _post(client, b'\x00\x00', sample_rate="191999999").status_code == 400
+    assert not server.stt.transcribe_audio.called
+
+
+def main():
+    """Run all tests"""
+    print("\n" + "=" * 70)
+    print("🧪 WEB UPLOAD TEST SUITE")
+    print("=" * 70)
+
+    tests = [
+        ("Valid PCM upload", test_valid_pcm),
+        ("Rejected PCM uploads", test_rejected_pcm),
+    ]
+
+    passed = 0
+    for name, test in tests:
+        try:
+            test()
+            print(f"  ✅ PASS - {name}")
+            passed += 1
+        except AssertionError as e:
+            print(f"  ❌ FAIL - {name} {e}")
+
+    print(f"\n  Result: {passed}/{len(tests)} tests passed")
+    print("=" * 70)
+
+    return passed == len(tests)
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)